@@ -0,0 +1,78 @@
+# benchmarks/corpus.py
+#
+# Synthetic, deterministic image corpora for benchmarks: smooth gradients
+# plus seeded noise, so PNG/JPEG sizes resemble real photos rather than
+# flat colour. PNGs are written with zlib alone; JPEG needs Pillow.
+
+import os
+import struct
+import zlib
+
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:                         # optional: only for JPEG corpora
+    Image = None
+
+FORMATS = ("png", "jpeg")
+
+def image_shape(long_px, aspect):
+    """(width, height) with the long side `long_px` and width/height `aspect`."""
+    if aspect >= 1.0:
+        return long_px, max(1, round(long_px / aspect))
+    return max(1, round(long_px * aspect)), long_px
+
+def synthetic_pixels(width, height, seed=0):
+    """(H, W, 3) uint8 gradient + noise, the same for the same arguments."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([
+        255 * x / max(width - 1, 1),
+        255 * y / max(height - 1, 1),
+        127.5 + 127.5 * np.sin((x + y) / max(width, height) * 6 * np.pi),
+    ], axis=-1)
+    noise = rng.normal(0, 12, size=(height, width, 3))
+    return np.clip(base + noise, 0, 255).astype(np.uint8)
+
+def _png_chunk(tag, payload):
+    body = tag + payload
+    return struct.pack(">I", len(payload)) + body + struct.pack(">I", zlib.crc32(body))
+
+def write_png(path, pixels):
+    h, w, _ = pixels.shape
+    raw = np.concatenate([np.zeros((h, 1), np.uint8), pixels.reshape(h, -1)], axis=1)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)))
+        f.write(_png_chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        f.write(_png_chunk(b"IEND", b""))
+
+def write_image(path, pixels, fmt="png", quality=90):
+    if fmt == "png":
+        write_png(path, pixels)
+    elif fmt == "jpeg":
+        if Image is None:
+            raise RuntimeError("JPEG corpora need Pillow (pip install Pillow)")
+        Image.fromarray(pixels).save(path, "JPEG", quality=quality)
+    else:
+        raise ValueError(f"Unknown corpus format {fmt!r}; choose from {FORMATS}")
+
+def make_corpus(dest, count, long_px=1024, aspects=(1.0,), fmt="png", seed=0):
+    """
+    Write `count` images into `dest`, cycling through `aspects`; an existing
+    corpus with the same parameters is reused. Returns the image paths.
+    """
+    os.makedirs(dest, exist_ok=True)
+    ext = ".jpg" if fmt == "jpeg" else ".png"
+    paths = []
+    for i in range(count):
+        aspect = aspects[i % len(aspects)]
+        w, h = image_shape(long_px, aspect)
+        path = os.path.join(dest, f"img_{i:05d}_{w}x{h}{ext}")
+        if not os.path.exists(path):
+            tmp = path + ".part"
+            write_image(tmp, synthetic_pixels(w, h, seed + i), fmt)
+            os.replace(tmp, path)
+        paths.append(path)
+    return paths
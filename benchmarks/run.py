@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark the image → model pipeline over a synthetic corpus.
+
+Every combination of primitive, backend, worker count and texture size
+runs `--repeat` times on a fresh output folder (no cache). Results are
+per-model latency percentiles, batch throughput and mean stage times,
+stored as JSON so runs can be compared against a saved baseline:
+
+    ./benchmarks/run.py --backends native stub --workers 1 4 --out bench.json
+    ./benchmarks/run.py --backends native stub --workers 1 4 --baseline bench.json
+
+Backends: "native" (NumPy), "stub" (the Blender code path with the stand-in
+bpy/bmesh from benchmarks/stubs/, no Blender needed) and "blender" (a real
+Blender from --blender or $BLENDER_PATH).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import main as pipeline
+from benchmarks.corpus import FORMATS, make_corpus
+from primitives.timing import percentile
+
+BACKENDS    = ("native", "stub", "blender")
+STUB_EXEC   = os.path.join(HERE, "stub_blender.py")
+SCHEMA      = 1
+# dimensions that need no prompt for either primitive
+BENCH_SPEC  = {"width_cm": 30.0, "height_cm": 20.0}
+
+@contextmanager
+def quiet(enabled=True):
+    """Silence stdout at the fd level (also Blender subprocesses and workers)."""
+    if not enabled:
+        yield
+        return
+    sys.stdout.flush()
+    saved = os.dup(1)
+    with open(os.devnull, "w") as null:
+        os.dup2(null.fileno(), 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+
+def config_id(cfg):
+    cid = (f"{cfg['primitive']}/{cfg['backend']}/j{cfg['workers']}/"
+           f"{cfg['format']}{cfg['texture_px']}")
+    return cid + (f"/max{cfg['max_texture']}" if cfg["max_texture"] else "")
+
+def run_once(images, out, cfg, blender_exec, tex_opts):
+    """One cold pipeline run; returns (wall seconds, records)."""
+    backend = "native" if cfg["backend"] == "native" else "blender"
+    args = (images, out, cfg["primitive"], blender_exec)
+    t0 = time.perf_counter()
+    if cfg["workers"] > 1:
+        records = pipeline.run_parallel(*args, cfg["workers"], BENCH_SPEC, None,
+                                        backend, None, None, tex_opts)
+    else:
+        records = pipeline.run_batch(*args, BENCH_SPEC, None, subprocess.DEVNULL,
+                                     backend, None, None, tex_opts)
+    return time.perf_counter() - t0, records
+
+def summarize(cfg, walls, records):
+    ok = [r for r in records if r["ok"]]
+    lat = sorted(r["seconds"]["total"] for r in ok)
+    stages = {}
+    for rec in ok:
+        for name, secs in rec["seconds"].items():
+            if name != "total":
+                stages.setdefault(name, []).append(secs)
+    wall = statistics.median(walls)
+    images = len(records) // len(walls)
+    return dict(cfg,
+        images=images,
+        repeats=len(walls),
+        failed=len(records) - len(ok),
+        wall_s=round(wall, 4),
+        throughput_per_s=round(images / wall, 3) if wall > 0 else None,
+        latency_ms={
+            "mean": round(1000 * statistics.fmean(lat), 3) if lat else None,
+            **{f"p{q}": round(1000 * percentile(lat, q), 3) if lat else None
+               for q in (50, 90, 99)},
+            "max":  round(1000 * lat[-1], 3) if lat else None,
+        },
+        stages_ms={k: round(1000 * statistics.fmean(v), 3)
+                   for k, v in sorted(stages.items())},
+    )
+
+def machine_info():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "created":  datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit":   commit or None,
+        "python":   platform.python_version(),
+        "platform": platform.platform(),
+        "cpus":     os.cpu_count(),
+    }
+
+def compare(results, baseline, tolerance):
+    """Print throughput/latency against `baseline`; return the regressed ids."""
+    old = baseline.get("results", {})
+    regressed = []
+    print(f"\n{'config':<32} {'models/s':>19} {'p50 ms':>19}")
+    for cid, new in results.items():
+        if cid not in old:
+            print(f"{cid:<32} {'(new)':>19}")
+            continue
+        a, b = old[cid]["throughput_per_s"], new["throughput_per_s"]
+        pa, pb = old[cid]["latency_ms"]["p50"], new["latency_ms"]["p50"]
+        change = (b - a) / a if a and b else 0.0
+        flag = ""
+        if change < -tolerance:
+            regressed.append(cid)
+            flag = "  REGRESSION"
+        print(f"{cid:<32} {a:8.2f} → {b:8.2f} {pa:8.1f} → {pb:8.1f}  "
+              f"{change:+.0%}{flag}")
+    return regressed
+
+def main():
+    p = argparse.ArgumentParser(description="Pipeline benchmarks on a synthetic corpus")
+    p.add_argument("--primitives", nargs="+", choices=["box", "cylinder"],
+                   default=["box", "cylinder"])
+    p.add_argument("--backends", nargs="+", choices=BACKENDS, default=["native", "stub"])
+    p.add_argument("--workers", nargs="+", type=int, default=[1],
+                   help="Worker counts to try (--jobs of main.py)")
+    p.add_argument("--sizes", nargs="+", type=int, default=[512, 2048],
+                   help="Texture sizes to try: long image side in pixels")
+    p.add_argument("--aspects", nargs="+", type=float, default=[1.0, 0.75, 1.5],
+                   help="Image width/height ratios, cycled through the corpus")
+    p.add_argument("--count", type=int, default=16, help="Images per run")
+    p.add_argument("--repeat", type=int, default=3, help="Runs per configuration")
+    p.add_argument("--format", choices=FORMATS, default="png", help="Corpus image format")
+    p.add_argument("--seed", type=int, default=0, help="Corpus random seed")
+    p.add_argument("--max-texture", type=int,
+                   help="Run the texture stage with this --max-texture as well")
+    p.add_argument("--blender", help="Real Blender executable for --backends blender")
+    p.add_argument("--workdir", help="Keep corpora and scratch here (default: temp dir)")
+    p.add_argument("--out", help="Write the results JSON here")
+    p.add_argument("--baseline", help="Compare against this earlier results JSON")
+    p.add_argument("--tolerance", type=float, default=0.15,
+                   help="Throughput drop counted as a regression (default 0.15)")
+    p.add_argument("--fail-on-regression", action="store_true",
+                   help="Exit 1 when any configuration regressed")
+    p.add_argument("--verbose", "-v", action="store_true", help="Show pipeline output")
+    args = p.parse_args()
+    if "blender" in args.backends and not (args.blender or os.environ.get("BLENDER_PATH")):
+        p.error("--backends blender needs --blender or $BLENDER_PATH")
+
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="bench_"))
+    pipeline.SCRATCH_ROOT = os.path.join(workdir, "output_tmp")
+    tex_opts = None
+    if args.max_texture:
+        tex_opts = {"max_px": args.max_texture, "pot": "none", "format": None,
+                    "quality": 90, "mipmaps": False}
+
+    results = {}
+    try:
+        for size in args.sizes:
+            images = make_corpus(
+                os.path.join(workdir, "corpus", f"{args.format}_{size}_s{args.seed}"),
+                args.count, size, args.aspects, args.format, args.seed,
+            )
+            for primitive in args.primitives:
+                for backend in args.backends:
+                    blender_exec = (STUB_EXEC if backend == "stub"
+                                    else pipeline.find_blender(args.blender))
+                    for workers in args.workers:
+                        cfg = {"primitive": primitive, "backend": backend,
+                               "workers": workers, "texture_px": size,
+                               "format": args.format,
+                               "max_texture": args.max_texture}
+                        walls, records = [], []
+                        for _ in range(args.repeat):
+                            out = os.path.join(workdir, "out")
+                            shutil.rmtree(out, ignore_errors=True)
+                            with quiet(not args.verbose):
+                                wall, recs = run_once(images, out, cfg,
+                                                      blender_exec, tex_opts)
+                            walls.append(wall)
+                            records.extend(recs)
+                        res = results[config_id(cfg)] = summarize(cfg, walls, records)
+                        print(f"{config_id(cfg):<32} {res['throughput_per_s']:8.2f} models/s  "
+                              f"p50 {res['latency_ms']['p50']:8.1f} ms  "
+                              f"p90 {res['latency_ms']['p90']:8.1f} ms"
+                              + (f"  ({res['failed']} failed)" if res["failed"] else ""))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "schema": SCHEMA,
+        "machine": machine_info(),
+        "corpus": {"count": args.count, "aspects": args.aspects,
+                   "format": args.format, "seed": args.seed},
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nResults written to {args.out}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressed = compare(results, json.load(f), args.tolerance)
+        if regressed and args.fail_on_regression:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
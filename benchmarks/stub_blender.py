@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Blender stand-in for benchmarks and CI: accepts the command line main.py
+uses (`--background --python SCRIPT -- ARGS`) and runs SCRIPT with the stub
+bpy/bmesh modules from benchmarks/stubs/ on the import path.
+
+    ./main.py --batch-dir images/ --output out/ --blender benchmarks/stub_blender.py
+"""
+import os
+import runpy
+import sys
+
+STUBS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs")
+
+def main(argv):
+    script = None
+    args = list(argv)
+    if "--" in args:
+        args = args[:args.index("--")]
+    for i, arg in enumerate(args):
+        if arg in ("--python", "-P") and i + 1 < len(args):
+            script = args[i + 1]
+    if script is None:
+        sys.exit("stub_blender: only '--background --python SCRIPT -- ...' is supported")
+
+    sys.path.insert(0, STUBS)
+    # scripts see Blender's argv: executable, Blender flags, '--', script args
+    sys.argv = [sys.argv[0]] + list(argv)
+    runpy.run_path(script, run_name="__main__")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
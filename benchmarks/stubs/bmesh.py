@@ -0,0 +1,76 @@
+# benchmarks/stubs/bmesh.py
+#
+# Minimal stand-in for Blender's bmesh, paired with stubs/bpy.py: faces,
+# loops and a UV layer that write straight through to the stub mesh.
+
+import numpy as np
+
+from bpy import Vector
+
+class _UVLayerAccess:
+    def __init__(self):
+        self.active = "UVMap"
+
+    def verify(self):
+        return self.active
+
+class _Layers:
+    def __init__(self):
+        self.uv = _UVLayerAccess()
+
+class _Loops:
+    def __init__(self):
+        self.layers = _Layers()
+
+class _LoopUV:
+    def __init__(self, mesh, face, corner):
+        self._mesh, self._face, self._corner = mesh, face, corner
+
+    @property
+    def uv(self):
+        return self._mesh.uvs[self._face][self._corner]
+
+    @uv.setter
+    def uv(self, value):
+        self._mesh.uvs[self._face][self._corner] = tuple(float(c) for c in value)
+
+class _Vert:
+    def __init__(self, co):
+        self.co = co
+
+class _Loop:
+    def __init__(self, mesh, face, corner):
+        self._uv  = _LoopUV(mesh, face, corner)
+        self.vert = _Vert(mesh.vertices[mesh.faces[face][corner]].co)
+
+    def __getitem__(self, layer):
+        return self._uv
+
+class _Face:
+    def __init__(self, mesh, index):
+        self._mesh  = mesh
+        self.index  = index
+        self.loops  = [_Loop(mesh, index, c) for c in range(len(mesh.faces[index]))]
+        p = np.array([tuple(mesh.vertices[i].co) for i in mesh.faces[index]])
+        # Newell normal, as for any planar polygon
+        n = np.cross(p, np.roll(p, -1, axis=0)).sum(axis=0)
+        self.normal = Vector(n / np.linalg.norm(n))
+
+    @property
+    def material_index(self):
+        return self._mesh.face_mat[self.index]
+
+    @material_index.setter
+    def material_index(self, value):
+        self._mesh.face_mat[self.index] = int(value)
+
+class BMesh:
+    def __init__(self, mesh):
+        self.faces = [_Face(mesh, i) for i in range(len(mesh.faces))]
+        self.loops = _Loops()
+
+def from_edit_mesh(mesh):
+    return BMesh(mesh)
+
+def update_edit_mesh(mesh, **kwargs):
+    pass
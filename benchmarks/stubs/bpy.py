@@ -0,0 +1,458 @@
+# benchmarks/stubs/bpy.py
+#
+# Minimal stand-in for Blender's bpy: just the API surface the wrappers in
+# primitives/box.py, primitives/cylinder.py, primitives/render.py and
+# primitives/session.py use. Meshes are plain Python lists and the exporters
+# go through the native COLLADA/glTF/OBJ writers, so the orchestration and
+# SDF paths can run (and be benchmarked) on machines without Blender. The
+# "renders" are flat images of the object's projected 2D box. Stage timings
+# measured against this stub say nothing about Blender's own cost.
+
+import math
+import os
+import sys
+
+import numpy as np
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from benchmarks.corpus import write_png
+from primitives.camera import bbox_2d, euler_matrix, intrinsics
+from primitives.geometry import MeshData
+from primitives.imageinfo import image_size
+from primitives.meshio import write_mesh
+
+class Vector:
+    def __init__(self, xyz=(0.0, 0.0, 0.0)):
+        self.x, self.y, self.z = (float(c) for c in xyz)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __repr__(self):
+        return f"Vector(({self.x:.4f}, {self.y:.4f}, {self.z:.4f}))"
+
+# --- datablocks ----------------------------------------------------------------
+
+class _ID:
+    def __init__(self, name):
+        self.name = name
+
+    def as_pointer(self):
+        return id(self)
+
+class _Collection:
+    """bpy.data.<collection>: ordered datablocks with new()/remove()."""
+
+    def __init__(self, factory=None):
+        self._items   = []
+        self._factory = factory
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def new(self, name, *args, **kwargs):
+        block = self._factory(name, *args, **kwargs)
+        self._items.append(block)
+        return block
+
+    def remove(self, block, do_unlink=True):
+        self._items.remove(block)
+
+    def load(self, filepath, check_existing=False):
+        # only bpy.data.images supports load()
+        block = _Image(filepath)
+        self._items.append(block)
+        return block
+
+    def clear(self):
+        self._items.clear()
+
+class _Image(_ID):
+    def __init__(self, filepath):
+        super().__init__(os.path.basename(filepath))
+        self.filepath = filepath
+        # header probe only: Blender loads pixels lazily as well
+        self.size = list(image_size(filepath))
+
+    @property
+    def filepath_raw(self):
+        return self.filepath
+
+    @filepath_raw.setter
+    def filepath_raw(self, path):
+        self.filepath = path
+
+class _Socket:
+    def __init__(self, name):
+        self.name = name
+        self.default_value = None
+
+class _Sockets(dict):
+    def __missing__(self, name):
+        sock = self[name] = _Socket(name)
+        return sock
+
+class _Settings:
+    """Attribute bag for settings structs (render, cycles, image format, ...)."""
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+class _Node:
+    def __init__(self, type):
+        self.type      = type
+        self.inputs    = _Sockets()
+        self.outputs   = _Sockets()
+        self.image     = None
+        self.extension = "REPEAT"
+        if type == "CompositorNodeOutputFile":
+            self.base_path  = ""
+            self.format     = _Settings(file_format="PNG")
+            self.file_slots = [_Settings(path="Image")]
+
+class _Nodes(list):
+    def new(self, type):
+        node = _Node(type)
+        self.append(node)
+        return node
+
+class _Links(list):
+    def new(self, from_socket, to_socket):
+        self.append((from_socket, to_socket))
+        return self[-1]
+
+class _NodeTree:
+    def __init__(self, nodes=("ShaderNodeBsdfPrincipled", "ShaderNodeOutputMaterial")):
+        self.nodes = _Nodes(_Node(t) for t in nodes)
+        self.links = _Links()
+
+class _Material(_ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.use_nodes = False
+        self.node_tree = _NodeTree()
+
+    def image(self):
+        for node in self.node_tree.nodes:
+            if node.image is not None:
+                return node.image
+        return None
+
+    def base_color(self):
+        for node in self.node_tree.nodes:
+            if node.type == "ShaderNodeBsdfPrincipled":
+                color = node.inputs["Base Color"].default_value
+                if color is not None:
+                    return tuple(color)
+        return (1.0, 1.0, 1.0, 1.0)
+
+class _UVLayers(list):
+    def new(self, name="UVMap"):
+        self.append(name)
+        return name
+
+class _MeshVertex:
+    def __init__(self, co):
+        self.co = co
+
+    @property
+    def co(self):
+        return self._co
+
+    @co.setter
+    def co(self, value):
+        self._co = Vector(value)
+
+class _Mesh(_ID):
+    """Polygon mesh; per-face material index and per-corner UVs."""
+
+    def __init__(self, name, verts=(), faces=()):
+        super().__init__(name)
+        self.vertices  = [_MeshVertex(v) for v in verts]
+        self.faces     = [list(f) for f in faces]
+        self.face_mat  = [0] * len(self.faces)
+        self.uvs       = [[(0.0, 0.0)] * len(f) for f in self.faces]
+        self.materials = []
+        self.uv_layers = _UVLayers(["UVMap"])
+
+    def update(self):
+        pass
+
+class _Camera(_ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.angle      = math.radians(39.6)
+        self.sensor_fit = "AUTO"
+        self.clip_start = 0.1
+        self.clip_end   = 100.0
+
+class _Light(_ID):
+    def __init__(self, name, type="POINT"):
+        super().__init__(name)
+        self.type   = type
+        self.energy = 10.0
+
+class _World(_ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.use_nodes = False
+        self.color     = (0.05, 0.05, 0.05)
+
+class _Object(_ID):
+    def __init__(self, name, data):
+        super().__init__(name)
+        self.data           = data
+        self.type           = {_Mesh: "MESH", _Camera: "CAMERA",
+                               _Light: "LIGHT"}.get(type(data), "EMPTY")
+        self.mode           = "OBJECT"
+        self.location       = (0.0, 0.0, 0.0)
+        self.scale          = (1.0, 1.0, 1.0)
+        self.rotation_euler = (0.0, 0.0, 0.0)
+        self.selected       = False
+
+    def select_set(self, state):
+        self.selected = bool(state)
+
+    @property
+    def dimensions(self):
+        pts = np.array([tuple(v.co) for v in self.data.vertices]) * self.scale
+        return Vector(pts.max(axis=0) - pts.min(axis=0))
+
+    @property
+    def matrix_world(self):
+        """4x4 transform from location, XYZ Euler rotation and scale."""
+        m = euler_matrix(self.location, self.rotation_euler)
+        m[:3, :3] = m[:3, :3] @ np.diag(self.scale)
+        return m
+
+class _Objects(_Collection):
+    def remove(self, block, do_unlink=True):
+        super().remove(block)
+        if block in context.scene.collection.objects:
+            context.scene.collection.objects.unlink(block)
+
+class _Data:
+    def __init__(self):
+        self.objects     = _Objects(_Object)
+        self.cameras     = _Collection(_Camera)
+        self.lights      = _Collection(_Light)
+        self.worlds      = _Collection(_World)
+        self.meshes      = _Collection(_Mesh)
+        self.materials   = _Collection(_Material)
+        self.node_groups = _Collection()
+        self.textures    = _Collection()
+        self.images      = _Collection()
+
+data = _Data()
+
+# --- context -------------------------------------------------------------------
+
+class _LayerObjects:
+    active = None
+
+class _ViewLayer:
+    def __init__(self):
+        self.objects    = _LayerObjects()
+        self.use_pass_z = False
+
+    def update(self):
+        pass
+
+class _SceneObjects(list):
+    def link(self, obj):
+        if obj in self:
+            raise RuntimeError(f"Object '{obj.name}' already in collection")
+        self.append(obj)
+
+    def unlink(self, obj):
+        self.remove(obj)
+
+class _Scene:
+    def __init__(self):
+        self.collection    = _Settings(objects=_SceneObjects())
+        self.render        = _Settings(
+            engine="BLENDER_EEVEE_NEXT", resolution_x=1920, resolution_y=1080,
+            resolution_percentage=100, film_transparent=False,
+            use_persistent_data=False, filepath="/tmp/",
+            image_settings=_Settings(file_format="PNG", color_mode="RGBA"),
+        )
+        self.cycles        = _Settings()
+        self.eevee         = _Settings()
+        self.camera        = None
+        self.world         = None
+        self.frame_current = 1
+        self.use_nodes     = False
+        self.node_tree     = _NodeTree(nodes=())
+
+    @property
+    def objects(self):
+        return list(self.collection.objects)
+
+class _Context:
+    def __init__(self):
+        self.view_layer = _ViewLayer()
+        self.scene      = _Scene()
+
+    @property
+    def active_object(self):
+        return self.view_layer.objects.active
+
+    @property
+    def object(self):
+        return self.view_layer.objects.active
+
+context = _Context()
+
+def _link(name, mesh):
+    data.meshes._items.append(mesh)
+    obj = _Object(name, mesh)
+    data.objects._items.append(obj)
+    context.scene.collection.objects.link(obj)
+    context.view_layer.objects.active = obj
+    return obj
+
+# --- operators -----------------------------------------------------------------
+
+class _Ops:
+    pass
+
+class _MeshOps:
+    @staticmethod
+    def primitive_cube_add(size=2.0, **kwargs):
+        h = size / 2.0
+        verts = [(x, y, z) for x in (-h, h) for y in (-h, h) for z in (-h, h)]
+        faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1),
+                 (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+        _link("Cube", _Mesh("Cube", verts, faces))
+        return {"FINISHED"}
+
+    @staticmethod
+    def primitive_cylinder_add(vertices=32, radius=1.0, depth=2.0, **kwargs):
+        n = vertices
+        ring = [(radius * math.cos(2 * math.pi * i / n),
+                 radius * math.sin(2 * math.pi * i / n)) for i in range(n)]
+        verts = ([(x, y, -depth / 2) for x, y in ring]
+                 + [(x, y, depth / 2) for x, y in ring])
+        faces = [(i, (i + 1) % n, (i + 1) % n + n, i + n) for i in range(n)]
+        faces += [tuple(range(n - 1, -1, -1)), tuple(range(n, 2 * n))]
+        _link("Cylinder", _Mesh("Cylinder", verts, faces))
+        return {"FINISHED"}
+
+class _ObjectOps:
+    @staticmethod
+    def transform_apply(location=False, rotation=False, scale=False, **kwargs):
+        obj = context.active_object
+        if scale and obj is not None:
+            for v in obj.data.vertices:
+                v.co = [c * s for c, s in zip(v.co, obj.scale)]
+            obj.scale = (1.0, 1.0, 1.0)
+        return {"FINISHED"}
+
+    @staticmethod
+    def select_all(action="TOGGLE", **kwargs):
+        for obj in data.objects:
+            obj.selected = action == "SELECT"
+        return {"FINISHED"}
+
+    @staticmethod
+    def mode_set(mode="OBJECT", **kwargs):
+        if context.active_object is not None:
+            context.active_object.mode = mode
+        return {"FINISHED"}
+
+def _export(filepath, selected):
+    """Write the last (selected) mesh object with the native writer for `filepath`."""
+    objs = [o for o in context.scene.objects if isinstance(o.data, _Mesh)
+            and (o.selected or not selected)]
+    if not objs:
+        raise RuntimeError(f"export {filepath}: nothing to export")
+    obj  = objs[-1]
+    mesh = obj.data
+    image = next((m.image() for m in mesh.materials if m.image()), None)
+    body  = next((m.base_color() for m in mesh.materials if not m.image()),
+                 (1.0, 1.0, 1.0, 1.0))
+    write_mesh(MeshData(
+        obj.name,
+        np.array([tuple(v.co) for v in mesh.vertices], dtype=float),
+        np.array([len(f) for f in mesh.faces]),
+        np.array([i for f in mesh.faces for i in f]),
+        np.array([uv for face in mesh.uvs for uv in face], dtype=float),
+        np.array(mesh.face_mat),
+        obj.matrix_world,
+        body,
+    ), filepath, image.filepath if image else None)
+    return {"FINISHED"}
+
+class _ExportSceneOps:
+    @staticmethod
+    def gltf(filepath, use_selection=False, **kwargs):
+        return _export(filepath, use_selection)
+
+class _WmOps:
+    @staticmethod
+    def read_factory_settings(use_empty=False, **kwargs):
+        for name in vars(data):
+            getattr(data, name).clear()
+        context.view_layer.objects.active = None
+        context.scene = _Scene()
+        return {"FINISHED"}
+
+    @staticmethod
+    def collada_export(filepath, selected=False, **kwargs):
+        return _export(filepath, selected)
+
+    @staticmethod
+    def obj_export(filepath, export_selected_objects=False, **kwargs):
+        return _export(filepath, export_selected_objects)
+
+class _RenderOps:
+    @staticmethod
+    def render(write_still=False, **kwargs):
+        """
+        "Render" the scene camera's view: the mesh objects' projected 2D box
+        as a grey RGB image and white mask; depth is a float32 .npy array
+        holding the camera distance of the box centre (no EXR writer here).
+        """
+        scene = context.scene
+        r = scene.render
+        w, h = r.resolution_x, r.resolution_y
+        cam = scene.camera
+        pts = np.concatenate([
+            np.array([tuple(v.co) for v in o.data.vertices]) @ o.matrix_world[:3, :3].T
+            + o.matrix_world[:3, 3] for o in scene.objects if o.type == "MESH"])
+        box = bbox_2d(pts, cam.matrix_world, intrinsics(cam.data.angle, w, h), w, h)
+        mask = np.zeros((h, w), dtype=np.uint8)
+        if box is not None:
+            x0, y0, x1, y1 = (int(round(c)) for c in box)
+            mask[y0:y1, x0:x1] = 255
+        if write_still:
+            write_png(r.filepath, np.dstack([mask // 2] * 3))
+        depth = np.where(mask > 0, np.linalg.norm(
+            np.subtract(cam.location, pts.mean(axis=0))), 0.0).astype(np.float32)
+        for node in scene.node_tree.nodes:
+            if node.type != "CompositorNodeOutputFile":
+                continue
+            stem = os.path.join(node.base_path,
+                                f"{node.file_slots[0].path}{scene.frame_current:04d}")
+            if node.format.file_format == "OPEN_EXR":
+                with open(stem + ".exr", "wb") as f:
+                    np.save(f, depth)
+            else:
+                write_png(stem + ".png", np.dstack([mask] * 3))
+        return {"FINISHED"}
+
+ops = _Ops()
+ops.mesh   = _MeshOps()
+ops.object = _ObjectOps()
+ops.wm     = _WmOps()
+ops.export_scene = _ExportSceneOps()
+ops.render = _RenderOps()
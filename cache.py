@@ -0,0 +1,166 @@
+"""
+Content-addressed cache of generated model folders.
+
+A key hashes everything that determines a model: the image bytes, the
+primitive, the resolved dimension spec, the backend, the model name, the
+SDF options, the configs/*.yaml templates and the pipeline sources (the
+tool version).
+Entries are hard links to the finished model files (copies across
+devices); hits are hard-linked into a fresh folder that replaces the
+model folder, so no files of earlier runs linger on either side. A hit on
+a model that references a shared mesh library counts only while the
+library still holds its meshes. Entry mtimes track last use for LRU
+eviction.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from primitives.fileops import place, replace_tree
+from primitives.meshlib import MeshLibrary
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+TOOL_VERSION = "1"
+
+# sources whose content changes the produced models
+_TOOL_SOURCES = ("main.py", "wrap_image_box.py", "generate_sdf_model.py", "texture.py",
+                 "variants.py", "rendering.py", "primitives", "configs")
+
+def _hash_file(path, h=None):
+    h = h or hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h
+
+def tool_fingerprint():
+    """Hash of the tool version, pipeline sources and SDF templates."""
+    h = hashlib.sha256(TOOL_VERSION.encode())
+    for src in _TOOL_SOURCES:
+        path = os.path.join(HERE, src)
+        files = [path] if os.path.isfile(path) else sorted(
+            os.path.join(dp, fn)
+            for dp, _, fns in os.walk(path) for fn in fns
+            if fn.endswith((".py", ".yaml"))
+        )
+        for fn in files:
+            h.update(os.path.relpath(fn, HERE).encode())
+            _hash_file(fn, h)
+    return h.hexdigest()
+
+def parse_size(text):
+    """'500M', '20G', '1048576' -> bytes."""
+    text = str(text).strip().upper()
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def _tree_size(path):
+    return sum(
+        os.path.getsize(os.path.join(dp, fn))
+        for dp, _, fns in os.walk(path) for fn in fns
+    )
+
+def _link_tree(src, dst):
+    """Hard-link every file of `src` into `dst`, copying across devices."""
+    for dp, _, fns in os.walk(src):
+        target = os.path.join(dst, os.path.relpath(dp, src))
+        os.makedirs(target, exist_ok=True)
+        for fn in fns:
+            place(os.path.join(dp, fn), os.path.join(target, fn), "link")
+
+def _library_intact(entry, library):
+    """True when every model://<library>/... file the entry's SDF uses exists."""
+    lib = MeshLibrary(library)
+    try:
+        with open(os.path.join(entry, "model.sdf")) as f:
+            sdf = f.read()
+    except OSError:
+        return False
+    uris = re.findall(rf"model://{re.escape(lib.name)}/([^<\s]+)", sdf)
+    return all(os.path.exists(os.path.join(lib.root, rel)) for rel in uris)
+
+class ResultCache:
+    def __init__(self, root, max_bytes=None, force=False):
+        self.root      = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.force     = force
+        self._tool     = tool_fingerprint()
+        os.makedirs(self.root, exist_ok=True)
+
+    def key(self, image_path, primitive, spec, backend, model_name, options=None):
+        h = _hash_file(image_path)
+        h.update(json.dumps({
+            "primitive": primitive,
+            "dims":      spec,
+            "backend":   backend,
+            "model":     model_name,
+            "options":   options or {},
+            "tool":      self._tool,
+        }, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def restore(self, key, model_dir, mesh_library=None):
+        """
+        Replace `model_dir` by a linked copy of a cached model; False on a
+        miss (or --force), and when `mesh_library` lost a mesh it uses.
+        """
+        entry = self._entry(key)
+        if self.force or not os.path.isdir(entry):
+            return False
+        if mesh_library and not _library_intact(entry, mesh_library):
+            return False
+        tmp = f"{os.path.abspath(model_dir)}.restore-{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        try:
+            _link_tree(entry, tmp)
+            replace_tree(tmp, model_dir)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        os.utime(entry)                      # mark as recently used
+        return True
+
+    def store(self, key, model_dir):
+        """Link a finished model folder into the cache (atomic rename)."""
+        entry = self._entry(key)
+        tmp = f"{entry}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        _link_tree(model_dir, tmp)
+        if os.path.isdir(entry):
+            shutil.rmtree(entry, ignore_errors=True)
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # another worker stored the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def evict(self):
+        """Drop least recently used entries until the size limit holds."""
+        if self.max_bytes is None:
+            return 0
+        entries = []
+        for shard in os.listdir(self.root):
+            sdir = os.path.join(self.root, shard)
+            if not os.path.isdir(sdir):
+                continue
+            for name in os.listdir(sdir):
+                path = os.path.join(sdir, name)
+                if ".tmp-" in name:
+                    continue
+                entries.append((os.path.getmtime(path), _tree_size(path), path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
-import os, sys, shutil, argparse
+import os, sys, csv, json, glob, time, argparse, struct
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 try:
     import trimesh
     from trimesh import repair
@@ -7,49 +9,237 @@ except ImportError:
     print("Please install trimesh: pip install trimesh", file=sys.stderr)
     sys.exit(1)
 
-def compute_props(mesh, density):
+DEFAULT_DENSITY = 1000.0
+
+COLLISION_STRATEGIES = ("hull", "decimate", "decompose")
+
+# binary STL: 80-byte header, uint32 count, then 50-byte triangle records
+STL_RECORD = np.dtype([("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+CHUNK = 1 << 18        # triangles per pass of the streaming code (~18 MB of float64)
+
+class HashCollision(Exception):
+    """Two different vertices share a weld key (astronomically rare)."""
+
+def map_binary_stl(path):
+    """The triangles of a binary STL as a read-only memmap, or None if not binary."""
+    with open(path, "rb") as f:
+        head = f.read(84)
+    if len(head) < 84:
+        return None
+    n = struct.unpack("<I", head[80:84])[0]
+    # ASCII files may start with "solid" too: the size is the reliable test
+    if n == 0 or 84 + STL_RECORD.itemsize * n != os.path.getsize(path):
+        return None
+    return np.memmap(path, dtype=STL_RECORD, mode="r", offset=84, shape=(n,))
+
+def _weld_keys(corners):
+    """64-bit hash of each corner's exact float32 bits (-0.0 counted as 0.0)."""
+    bits = corners.view(np.uint32).astype(np.uint64)
+    bits[bits == 0x80000000] = 0
+    h = bits[:, 0] * np.uint64(0x9E3779B97F4A7C15)
+    h = (h ^ bits[:, 1]) * np.uint64(0xC2B2AE3D27D4EB4F)
+    h = (h ^ bits[:, 2]) * np.uint64(0x165667B19E3779F9)
+    return h ^ (h >> np.uint64(29))
+
+def weld(tris, scale=1.0):
+    """
+    Shared vertices (float64, scaled) and int32 faces of memmapped STL
+    triangles. Corners are welded by hashing their exact coordinates: the
+    keys are sorted once and every corner finds its vertex by binary
+    search, chunk by chunk, so besides the int32 faces only the keys
+    (8 bytes per corner) and one sorted copy are ever held.
+    Raises HashCollision if two distinct corners got the same key.
+    """
+    corners = tris["vertices"].reshape(-1, 3)          # strided view, no copy
+    keys = np.empty(len(corners), dtype=np.uint64)
+    for i in range(0, len(corners), 3 * CHUNK):
+        keys[i:i + 3 * CHUNK] = _weld_keys(np.ascontiguousarray(corners[i:i + 3 * CHUNK]))
+    unique = np.unique(keys)
+    faces = np.empty(len(corners), dtype=np.int32)
+    for i in range(0, len(corners), 3 * CHUNK):
+        faces[i:i + 3 * CHUNK] = np.searchsorted(unique, keys[i:i + 3 * CHUNK])
+    del keys
+    # number the vertices by first use, i.e. in file order like trimesh's
+    # merge (hash order would scatter neighbours and slow the hull down)
+    count = len(unique)
+    first = np.full(count, len(corners), dtype=np.int64)
+    for i in range(0, len(corners), 3 * CHUNK):
+        idx = faces[i:i + 3 * CHUNK]
+        np.minimum.at(first, idx, np.arange(i, i + len(idx)))
+    rank = np.empty(count, dtype=np.int32)
+    rank[np.argsort(first)] = np.arange(count, dtype=np.int32)
+    del first, unique
+    for i in range(0, len(corners), 3 * CHUNK):
+        faces[i:i + 3 * CHUNK] = rank[faces[i:i + 3 * CHUNK]]
+    del rank
+    vertices = np.empty((count, 3), dtype=np.float32)
+    for i in range(0, len(corners), 3 * CHUNK):
+        vertices[faces[i:i + 3 * CHUNK]] = corners[i:i + 3 * CHUNK]
+    for i in range(0, len(corners), 3 * CHUNK):
+        # -0.0 == 0.0 here, as in the keys
+        if not np.array_equal(vertices[faces[i:i + 3 * CHUNK]], corners[i:i + 3 * CHUNK]):
+            raise HashCollision(f"weld key collision near corner {i}")
+    vertices = vertices.astype(np.float64)
+    if scale != 1.0:
+        vertices *= scale
+    return vertices, faces.reshape(-1, 3)
+
+def is_watertight(faces):
+    """True when every undirected edge is shared by exactly two faces."""
+    faces = np.asarray(faces)
+    n = int(faces.max()) + 1 if len(faces) else 0
+    edges = np.empty(3 * len(faces), dtype=np.int64)
+    for k, (a, b) in enumerate(((0, 1), (1, 2), (2, 0))):
+        lo = np.minimum(faces[:, a], faces[:, b]).astype(np.int64)
+        hi = np.maximum(faces[:, a], faces[:, b])
+        edges[k::3] = lo * n + hi
+    edges.sort()
+    # runs of exactly two: pairs match, and consecutive pairs differ
+    return (len(edges) % 2 == 0 and bool(np.all(edges[0::2] == edges[1::2]))
+            and bool(np.all(edges[2::2] != edges[1:-1:2])))
+
+def load_binary_stl(path, scale):
+    """
+    Binary STL fast path: memmap, weld, check and scale without trimesh's
+    loader (which holds several float64 copies of the triangle soup).
+    Returns None for files that are not binary STL.
+    """
+    tris = map_binary_stl(path)
+    if tris is None:
+        return None
+    vertices, faces = weld(tris, scale)
+    del tris
+    watertight = is_watertight(faces)
+    mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    if not watertight:
+        repair.fill_holes(mesh)
+    return mesh
+
+def load_mesh(path, scale):
+    """Load, repair once and scale in place (no working copy)."""
+    if path.lower().endswith(".stl"):
+        try:
+            mesh = load_binary_stl(path, scale)
+        except HashCollision:
+            mesh = None                 # exact but heavier trimesh path below
+        if mesh is not None:
+            return mesh
+    mesh = trimesh.load(path, force="mesh")
     if not mesh.is_watertight:
         repair.fill_holes(mesh)
-    mesh.density = density
-    mp = mesh.mass_properties
-    m = mp["mass"]
-    I = mp["inertia"]
-    return m, (I[0,0], I[1,1], I[2,2])
+    if scale != 1.0:
+        mesh.apply_scale(scale)
+    return mesh
 
-def main():
-    p = argparse.ArgumentParser(__doc__)
-    p.add_argument("--stl",   required=True, help="Input STL file")
-    p.add_argument("--output",required=True, help="Destination Gazebo model dir")
-    p.add_argument("--scale", type=float, default=1.0, help="Unit→meter scale")
-    p.add_argument("--density", type=float, help="Density kg/m³ (prompt if omitted)")
-    args = p.parse_args()
+def compute_props(mesh, density):
+    """
+    Mass and principal inertia diagonal; `mesh` is already repaired.
+    Integrates over the triangles in chunks (the polyhedral mass
+    properties trimesh uses) instead of building them all at once.
+    """
+    vertices, faces = mesh.vertices, mesh.faces
+    origin = vertices[0] if len(vertices) else np.zeros(3)
+    # volume, first moments x y z, second moments x² y² z² (xy yz zx unused)
+    total = np.zeros(7)
+    for i in range(0, len(faces), CHUNK):
+        t = vertices[faces[i:i + CHUNK]] - origin
+        v0, v1, v2 = t[:, 0], t[:, 1], t[:, 2]
+        d = np.cross(v1 - v0, v2 - v0)
+        f1 = v0 + v1 + v2
+        f2 = v0 * v0 + v1 * (v0 + v1) + v2 * f1
+        f3 = v0 * v0 * v0 + v1 * (v0 * v0 + v1 * (v0 + v1)) + v2 * f2
+        total[0] += np.sum(d[:, 0] * f1[:, 0])
+        total[1:4] += np.sum(d * f2, axis=0)
+        total[4:7] += np.sum(d * f3, axis=0)
+    volume = total[0] / 6
+    center = total[1:4] / 24 / volume
+    sq = total[4:7] / 60                    # ∫x², ∫y², ∫z² about the origin
+    c2 = center * center
+    m = density * volume
+    inertia = density * np.array([sq[1] + sq[2], sq[0] + sq[2], sq[0] + sq[1]]) \
+        - m * np.array([c2[1] + c2[2], c2[0] + c2[2], c2[0] + c2[1]])
+    return m, tuple(inertia)
 
-    # load & scale
-    raw = trimesh.load(args.stl, force="mesh")
-    if not raw.is_watertight:
-        repair.fill_holes(raw)
-    mesh = raw.copy()
-    mesh.apply_scale(args.scale)
+def write_binary_stl(path, vertices, faces):
+    """Binary STL of an indexed mesh, written CHUNK triangles at a time."""
+    with open(path, "wb") as f:
+        f.write(b"synthetic_blender_3Ddatagen".ljust(80, b" "))
+        f.write(struct.pack("<I", len(faces)))
+        for i in range(0, len(faces), CHUNK):
+            t = vertices[faces[i:i + CHUNK]]
+            n = np.cross(t[:, 1] - t[:, 0], t[:, 2] - t[:, 0])
+            length = np.linalg.norm(n, axis=1, keepdims=True)
+            rec = np.zeros(len(t), dtype=STL_RECORD)
+            rec["normal"] = np.divide(n, length, out=np.zeros_like(n), where=length > 0)
+            rec["vertices"] = t
+            rec.tofile(f)
 
-    # density
-    dens = args.density if args.density is not None else float(input("Density [1000]: ") or 1000.0)
-    mass, inertia = compute_props(mesh, dens)
-    print(f"Mass={mass:.4f} kg, inertia={inertia}")
+def collision_parts(mesh, strategy="hull", max_faces=None, hulls=8, hull_vertices=32):
+    """
+    Collision meshes for `mesh` within explicit budgets:
+      hull      - single convex hull, decimated to `max_faces` if given
+      decimate  - quadric decimation of the mesh itself to `max_faces`
+      decompose - approximate convex decomposition (V-HACD) into at most
+                  `hulls` hulls of at most `hull_vertices` vertices each
+    """
+    if strategy == "hull":
+        hull = mesh.convex_hull
+        if max_faces and len(hull.faces) > max_faces:
+            hull = hull.simplify_quadric_decimation(face_count=max_faces).convex_hull
+        return [hull]
+    if strategy == "decimate":
+        if not max_faces:
+            raise ValueError("The decimate strategy needs a face budget (--collision-faces)")
+        if len(mesh.faces) <= max_faces:
+            return [mesh]
+        return [mesh.simplify_quadric_decimation(face_count=max_faces)]
+    if strategy == "decompose":
+        parts = mesh.convex_decomposition(
+            maxConvexHulls=hulls, maxNumVerticesPerCH=hull_vertices
+        )
+        if isinstance(parts, trimesh.Trimesh):
+            parts = [parts]
+        return [p if isinstance(p, trimesh.Trimesh) else trimesh.Trimesh(**p)
+                for p in parts]
+    raise ValueError(f"Unknown collision strategy: {strategy!r}")
+
+COLLISION_XML = """
+      <collision name='{name}'>
+        <geometry>
+          <mesh><uri>model://{model}/meshes/{col}</uri><scale>1 1 1</scale></mesh>
+        </geometry>
+        <surface>
+          <friction><ode><mu>10</mu><mu2>10</mu2><slip1>5</slip1><slip2>5</slip2></ode></friction>
+          <bounce><restitution_coefficient>0</restitution_coefficient><threshold>1e6</threshold></bounce>
+          <contact>
+            <ode>
+              <kp>1e6</kp><kd>1e3</kd>
+              <soft_cfm>0.01</soft_cfm><soft_erp>0.95</soft_erp>
+            </ode>
+          </contact>
+        </surface>
+      </collision>
+"""
 
+def write_model(mesh, output, mass, inertia, parts):
     # prepare folders
-    model = os.path.basename(args.output.rstrip("/"))
-    odir  = os.path.abspath(args.output)
+    model = os.path.basename(output.rstrip("/"))
+    odir  = os.path.abspath(output)
     mdir  = os.path.join(odir, "meshes")
     os.makedirs(mdir, exist_ok=True)
 
-    # export visual STL
+    # export visual STL (streamed: no full triangle copy of a large scan)
     vis = f"{model}.stl"
-    mesh.export(os.path.join(mdir, vis))
+    write_binary_stl(os.path.join(mdir, vis), mesh.vertices, mesh.faces)
 
-    # export convex‐hull collision STL
-    hull = mesh.convex_hull
-    col  = f"{model}_col.stl"
-    hull.export(os.path.join(mdir, col))
+    # export collision STLs, one <collision> element each
+    cols, collisions = [], []
+    for i, part in enumerate(parts):
+        suffix = "" if len(parts) == 1 else f"_{i}"
+        col = f"{model}_col{suffix}.stl"
+        part.export(os.path.join(mdir, col))
+        cols.append(col)
+        collisions.append(COLLISION_XML.format(name=f"coll{suffix}", model=model, col=col))
 
     # write model.sdf with hard-coded anti-wiggle settings
     sdf = f"""<?xml version='1.0'?>
@@ -74,23 +264,7 @@ def main():
           <mesh><uri>model://{model}/meshes/{vis}</uri><scale>1 1 1</scale></mesh>
         </geometry>
       </visual>
-
-      <collision name='coll'>
-        <geometry>
-          <mesh><uri>model://{model}/meshes/{col}</uri><scale>1 1 1</scale></mesh>
-        </geometry>
-        <surface>
-          <friction><ode><mu>10</mu><mu2>10</mu2><slip1>5</slip1><slip2>5</slip2></ode></friction>
-          <bounce><restitution_coefficient>0</restitution_coefficient><threshold>1e6</threshold></bounce>
-          <contact>
-            <ode>
-              <kp>1e6</kp><kd>1e3</kd>
-              <soft_cfm>0.01</soft_cfm><soft_erp>0.95</soft_erp>
-            </ode>
-          </contact>
-        </surface>
-      </collision>
-    </link>
+{''.join(collisions)}    </link>
   </model>
 </sdf>
 """
@@ -103,17 +277,150 @@ def main():
   <version>1.0</version>
   <sdf version="1.7">model.sdf</sdf>
   <author><name>AutoGen</name><email>noreply@example.com</email></author>
-  <description>Convex‐hull + heavy damping to eliminate wiggle</description>
+  <description>Budgeted collision + heavy damping to eliminate wiggle</description>
 </model>
 """
     with open(os.path.join(odir, "model.config"), "w") as f: f.write(cfg)
+    return odir, vis, cols
+
+def convert(stl, output, scale=1.0, density=DEFAULT_DENSITY, collision=None):
+    """
+    Convert one STL into a Gazebo model folder; returns a report dict.
+    `collision` holds collision_parts() keyword arguments.
+    """
+    collision = collision or {}
+    t = {}
+    t0 = time.perf_counter()
+    mesh = load_mesh(stl, scale)
+    t["load"] = time.perf_counter() - t0
+
+    t1 = time.perf_counter()
+    mass, inertia = compute_props(mesh, density)
+    t["props"] = time.perf_counter() - t1
+
+    t2 = time.perf_counter()
+    parts = collision_parts(mesh, **collision)
+    t["collision"] = time.perf_counter() - t2
+
+    t3 = time.perf_counter()
+    odir, vis, cols = write_model(mesh, output, mass, inertia, parts)
+    t["export"] = time.perf_counter() - t3
+    t["total"] = time.perf_counter() - t0
+    return {
+        "stl": stl, "output": odir, "ok": True,
+        "mass": mass, "inertia": list(map(float, inertia)),
+        "faces": int(len(mesh.faces)), "visual": vis, "collision": cols,
+        "collision_strategy": collision.get("strategy", "hull"),
+        "collision_faces": int(sum(len(p.faces) for p in parts)),
+        "seconds": {k: round(v, 4) for k, v in t.items()},
+    }
+
+def _convert_safe(stl, output, scale, density, collision):
+    try:
+        return convert(stl, output, scale, density, collision)
+    except Exception as e:
+        return {"stl": stl, "output": os.path.abspath(output), "ok": False,
+                "error": f"{type(e).__name__}: {e}"}
+
+def load_manifest(path):
+    """CSV/JSONL rows {stl, density?, scale?} keyed by file name or stem."""
+    with open(path, newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+    out = {}
+    for row in rows:
+        name = os.path.basename(row["stl"])
+        out[name] = {k: float(row[k]) for k in ("density", "scale")
+                     if row.get(k) not in (None, "")}
+    return out
+
+def find_stls(stl_dir, pattern):
+    if stl_dir:
+        pattern = os.path.join(stl_dir, "*")
+    return sorted(p for p in glob.glob(pattern, recursive=True)
+                  if p.lower().endswith(".stl"))
+
+def run_batch(stls, output_root, scale, density, manifest, jobs, report_path,
+              collision=None):
+    """Convert many STLs over a process pool; write a JSONL report."""
+    tasks = []
+    for stl in stls:
+        base = os.path.basename(stl)
+        opts = manifest.get(base) or manifest.get(os.path.splitext(base)[0]) or {}
+        out  = os.path.join(output_root, os.path.splitext(base)[0])
+        tasks.append((stl, out, opts.get("scale", scale), opts.get("density", density),
+                      collision))
+
+    start = time.monotonic()
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_convert_safe, *t) for t in tasks]
+        for n, fut in enumerate(as_completed(futures), 1):
+            r = fut.result()
+            results.append(r)
+            status = f"ok ({r['seconds']['total']:.2f}s)" if r["ok"] else f"FAILED ({r['error']})"
+            print(f"[{n}/{len(tasks)}] {r['stl']}: {status}")
+    order = {t[0]: i for i, t in enumerate(tasks)}
+    results.sort(key=lambda r: order[r["stl"]])
+
+    if report_path:
+        with open(report_path, "w") as f:
+            for r in results:
+                f.write(json.dumps(r) + "\n")
+    failed = sum(not r["ok"] for r in results)
+    print(f"\n{len(results) - failed}/{len(results)} models converted "
+          f"in {time.monotonic() - start:.1f}s ({failed} failed)")
+    return failed
+
+def main():
+    p = argparse.ArgumentParser(__doc__)
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--stl",     help="Input STL file")
+    src.add_argument("--stl-dir", help="Directory of STL files (batch mode)")
+    src.add_argument("--glob",    help="Glob of STL files, e.g. 'scans/**/*.stl' (batch mode)")
+    p.add_argument("--output",required=True, help="Destination Gazebo model dir (parent dir in batch mode)")
+    p.add_argument("--scale", type=float, default=1.0, help="Unit→meter scale")
+    p.add_argument("--density", type=float, help="Density kg/m³ (prompt if omitted; 1000 in batch mode)")
+    p.add_argument("--manifest", help="CSV/JSONL of per-file density/scale (batch mode)")
+    p.add_argument("--jobs", "-j", type=int, default=os.cpu_count(), help="Worker processes (batch mode)")
+    p.add_argument("--report", help="Write a JSONL per-file report (batch mode)")
+    p.add_argument("--collision", choices=COLLISION_STRATEGIES, default="hull",
+                   help="Collision strategy: convex hull, decimated mesh or convex decomposition")
+    p.add_argument("--collision-faces", type=int,
+                   help="Face budget for the hull / decimated collision mesh")
+    p.add_argument("--hulls", type=int, default=8,
+                   help="Maximum hulls for --collision decompose")
+    p.add_argument("--hull-vertices", type=int, default=32,
+                   help="Vertex cap per hull for --collision decompose")
+    args = p.parse_args()
+    collision = {"strategy": args.collision, "max_faces": args.collision_faces,
+                 "hulls": args.hulls, "hull_vertices": args.hull_vertices}
+
+    if not args.stl:
+        stls = find_stls(args.stl_dir, args.glob)
+        if not stls:
+            print("No STL files found", file=sys.stderr)
+            sys.exit(1)
+        manifest = load_manifest(args.manifest) if args.manifest else {}
+        density  = args.density if args.density is not None else DEFAULT_DENSITY
+        failed = run_batch(stls, args.output, args.scale, density, manifest,
+                           args.jobs, args.report, collision)
+        sys.exit(1 if failed else 0)
+
+    # density
+    dens = args.density if args.density is not None else float(input("Density [1000]: ") or DEFAULT_DENSITY)
+    r = convert(args.stl, args.output, args.scale, dens, collision)
+    print(f"Mass={r['mass']:.4f} kg, inertia={tuple(r['inertia'])}")
 
-    print(f"\n✅ Model ready: {odir}")
+    print(f"\n✅ Model ready: {r['output']}")
     print("├ model.config")
     print("├ model.sdf")
     print("└ meshes/")
-    print(f"   ├ {vis}")
-    print(f"   └ {col}")
+    print(f"   ├ {r['visual']}")
+    for i, col in enumerate(r["collision"]):
+        print(f"   {'└' if i == len(r['collision']) - 1 else '├'} {col}")
 
 if __name__=="__main__":
     main()
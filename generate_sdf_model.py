@@ -1,11 +1,38 @@
 #!/usr/bin/env python3
 import os
-import shutil
+import re
+import sys
+import json
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from string import Formatter
+
+import numpy as np
 import yaml
 
+from primitives.fileops import PLACEMENTS, place
+from primitives.meshio import mesh_files
+from primitives.meshlib import MeshLibrary, write_meshes
+from primitives.timing import StageTimer, peak_rss_mb, profile_report
+
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), "configs")
 
+# identical model.config for all shapes
+MODEL_CONFIG = """<?xml version="1.0"?>
+<model>
+  <name>{model_name}</name>
+  <version>1.0</version>
+  <sdf version="1.7">model.sdf</sdf>
+  <author><name>Generated</name><email>noreply@example.com</email></author>
+  <description>Auto-generated model.</description>
+</model>
+"""
+
+def list_shapes():
+    return sorted(fn[:-5] for fn in os.listdir(CONFIG_DIR) if fn.endswith(".yaml"))
+
 def load_config(shape):
     path = os.path.join(CONFIG_DIR, f"{shape}.yaml")
     if not os.path.exists(path):
@@ -13,69 +40,452 @@ def load_config(shape):
     with open(path) as f:
         return yaml.safe_load(f)
 
+class SdfTemplate:
+    """
+    A str.format template parsed once into literal/field pieces, so
+    rendering is a single join instead of re-scanning the text per model.
+    """
+
+    def __init__(self, text):
+        self.text   = text
+        self.fields = set()
+        self._parts = []
+        for literal, field, spec, conv in Formatter().parse(text):
+            if literal:
+                self._parts.append((literal, None, None, None))
+            if field is not None:
+                if not field.isidentifier():
+                    raise ValueError(f"Unsupported template field {{{field}}}")
+                self.fields.add(field)
+                self._parts.append((None, field, spec, conv))
+
+    def render(self, ctx):
+        out = []
+        for literal, field, spec, conv in self._parts:
+            if field is None:
+                out.append(literal)
+                continue
+            val = ctx[field]
+            if conv == "r":
+                val = repr(val)
+            elif conv == "s":
+                val = str(val)
+            out.append(format(val, spec) if spec else str(val))
+        return "".join(out)
+
+# --- mass & inertia ----------------------------------------------------------
+
+# the wrappers export boxes rotated 90° about X (image face vertical)
+_BOX_ROTATION = np.array([[1, 0, 0], [0, 0, -1], [0, 1, 0]], dtype=float)
+
+# mass used when neither a mass nor a density is given
+DEFAULT_MASS = 1.0
+
+_MESH_NAME = re.compile(r"^(box|cylinder)_(\d+(?:p\d+)?(?:x\d+(?:p\d+)?)+)\.")
+
+def dims_from_mesh_name(path):
+    """Recover (primitive, dims) from 'box_<w>x<d>x<h>.dae'-style names."""
+    m = _MESH_NAME.match(os.path.basename(path))
+    if not m:
+        return None, None
+    vals = [float(v.replace("p", ".")) for v in m.group(2).split("x")]
+    keys = ("width", "depth", "height") if m.group(1) == "box" else ("radius", "length")
+    if len(vals) != len(keys):
+        return None, None
+    return m.group(1), dict(zip(keys, vals))
+
+def _per_model(val, n):
+    """Scalar/sequence with None entries → float array with NaN for 'unset'."""
+    if val is None or np.isscalar(val):
+        val = [val] * n
+    return np.array([np.nan if v is None else v for v in val], dtype=float)
+
+def inertials(primitives, dims, density=None, mass=None):
+    """
+    Closed-form mass and inertia tensors for a batch of boxes/cylinders.
+
+    `dims` are the wrapper dicts in meters ({width, depth, height} or
+    {radius, length}); `density` (kg/m³) and `mass` (kg) are scalars or
+    per-model sequences, an explicit mass winning over a density.
+    Returns (masses (N,), tensors (N, 3, 3)) about the centroid, in the
+    model frame.
+    """
+    kinds = np.asarray(primitives)
+    n = len(kinds)
+    is_box = kinds == "box"
+    if not np.all(is_box | (kinds == "cylinder")):
+        raise ValueError(f"Unknown primitive in {sorted(set(kinds))}")
+
+    # box: (w, d, h); cylinder: (r, r, L)
+    a = np.array([
+        (d["width"], d["depth"], d["height"]) if box
+        else (d["radius"], d["radius"], d["length"])
+        for box, d in zip(is_box, dims)
+    ], dtype=float).reshape(n, 3)
+
+    volume = np.where(is_box, a.prod(axis=1), np.pi * a[:, 0]**2 * a[:, 2])
+    m = _per_model(mass, n)
+    rho = _per_model(density, n)
+    m = np.where(np.isnan(m), np.where(np.isnan(rho), DEFAULT_MASS, rho * volume), m)
+
+    sq = a**2
+    box_diag = m[:, None] / 12.0 * (sq.sum(axis=1, keepdims=True) - sq)
+    cyl_xy = m / 12.0 * (3 * sq[:, 0] + sq[:, 2])
+    cyl_diag = np.stack([cyl_xy, cyl_xy, m * sq[:, 0] / 2.0], axis=1)
+    diag = np.where(is_box[:, None], box_diag, cyl_diag)
+
+    rot = np.where(is_box[:, None, None], _BOX_ROTATION, np.eye(3))
+    tensors = np.einsum("nij,nj,nkj->nik", rot, diag, rot)
+    return m, tensors
+
+def inertial_placeholders(m, tensor):
+    """Template placeholders (mass, ixx … izz) for one model."""
+    r = lambda v: float(f"{v:.6g}") + 0.0      # + 0.0 turns -0.0 into 0.0
+    return {
+        "mass": r(m),
+        "ixx": r(tensor[0, 0]), "ixy": r(tensor[0, 1]), "ixz": r(tensor[0, 2]),
+        "iyy": r(tensor[1, 1]), "iyz": r(tensor[1, 2]), "izz": r(tensor[2, 2]),
+    }
+
+def _model_dims(spec):
+    """(primitive, dims) for a spec, from explicit fields or the mesh name."""
+    if spec.get("dims") is not None:
+        return spec.get("primitive", "box"), spec["dims"]
+    if spec.get("dae"):
+        return dims_from_mesh_name(spec["dae"])
+    return None, None
+
+# --- templates -----------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def get_shape(shape):
+    """Load and compile a shape config once per process: (placeholders, template)."""
+    cfg = load_config(shape)
+    return dict(cfg.get("placeholders", {})), SdfTemplate(cfg["template"])
+
+_MODEL_CONFIG = SdfTemplate(MODEL_CONFIG)
+
+# --- collision geometry --------------------------------------------------------
+
+COLLISION_MODES = ("primitive", "mesh")
+
+_MESH_GEOMETRY = "<mesh><uri>{collision_uri}</uri><scale>{scale}</scale></mesh>"
+
+def collision_geometry(mode, primitive, dims, ctx):
+    """
+    SDF <geometry> content for the collision: a native <box>/<cylinder>
+    matching the wrapper dimensions, or the visual mesh.
+    """
+    if mode not in COLLISION_MODES:
+        raise ValueError(f"Unknown collision mode: {mode!r}")
+    if mode == "primitive" and dims is not None:
+        g = lambda v: f"{v:.6g}"
+        if primitive == "box":
+            size = np.abs(_BOX_ROTATION) @ [dims["width"], dims["depth"], dims["height"]]
+            return f"<box><size>{' '.join(map(g, size))}</size></box>"
+        return (f"<cylinder><radius>{g(dims['radius'])}</radius>"
+                f"<length>{g(dims['length'])}</length></cylinder>")
+    return _MESH_GEOMETRY.format(**ctx)
+
+# --- shared mesh library -------------------------------------------------------
+
+# the image faces as a second visual, textured per model; <script> is read
+# by Gazebo classic (OGRE), <pbr> by Gazebo Sim
+_IMAGE_VISUAL = """
+      <visual name='visual_image'>
+        <pose>0 0 0 0 -0 0</pose>
+        <geometry>
+          <mesh>
+            <uri>{image_uri}</uri>
+            <scale>{scale}</scale>
+          </mesh>
+        </geometry>
+        <material>
+          <script>
+            <uri>model://{model_name}/materials/scripts</uri>
+            <uri>model://{model_name}/materials/textures</uri>
+            <name>{model_name}/Image</name>
+          </script>
+          <pbr><metal><albedo_map>model://{model_name}/materials/textures/{texture_filename}</albedo_map></metal></pbr>
+        </material>
+      </visual>"""
+
+_MATERIAL_SCRIPT = """material {model_name}/Image
+{{
+  technique
+  {{
+    pass
+    {{
+      texture_unit
+      {{
+        texture {texture_filename}
+      }}
+    }}
+  }}
+}}
+"""
+
+def texture_subdir(mesh_library=None):
+    """Where a model's texture lives, relative to the model folder."""
+    return os.path.join("materials", "textures") if mesh_library else "meshes"
+
+# --- rendering -----------------------------------------------------------------
+
+def render_model(output, shape="box", dae=None, texture=None,
+                 radius=None, length=None, primitive=None, dims=None,
+                 density=None, mass=None, inertial=None, collision="primitive",
+                 mesh_library=None, uv_scale=None, uv_offset=None, body_color=None,
+                 lods=None, visual_lod=0, mesh_format=None, **placeholders):
+    """
+    Render one model without touching the disk.
+    Mass and inertia come from `dims` (or the mesh file name) plus
+    `density`/`mass`; `inertial` passes precomputed placeholders instead.
+    `collision` picks analytic ("primitive") or "mesh" collision geometry.
+    With `mesh_library` the geometry is referenced from the shared library
+    (built from the dims, the texture's `uv_scale`/`uv_offset` and the
+    variant `body_color`) instead of `dae`, in `mesh_format` (default:
+    the format of `dae`, else COLLADA).
+    `lods` are coarser meshes of `dae`, copied alongside it: the visual
+    uses level `visual_lod` (0 = `dae`) and mesh collision the coarsest
+    (SDF has no distance LOD; library meshes have no LODs).
+    Returns (outdir, {relative path: text}, [(src, dst)] mesh copies,
+    [(MeshData, path)] library meshes still to write).
+    """
+    defaults, template = get_shape(shape)
+    model_name = os.path.basename(os.path.normpath(output))
+    outdir     = os.path.abspath(output)
+    primitive, dims = _model_dims({"primitive": primitive, "dims": dims, "dae": dae})
+
+    # prep context from placeholders
+    ctx = dict(defaults, model_name=model_name)
+    if inertial is None:
+        if dims is not None:
+            m, tensors = inertials([primitive], [dims], density, mass)
+            inertial = inertial_placeholders(m[0], tensors[0])
+        elif mass is not None:
+            inertial = {"mass": mass}
+    ctx.update(inertial or {})
+    ctx.update(placeholders)
+    files, copies, shared = {}, [], []
+
+    # if using mesh, copy files & set dae_filename/mesh_uri
+    if template.fields & {"dae_filename", "mesh_uri"}:
+        if not texture or not (dae or mesh_library):
+            raise ValueError("Mesh shapes require --dae and --texture")
+        tex_fn = os.path.basename(texture)
+        copies.append((texture, os.path.join(outdir, texture_subdir(mesh_library), tex_fn)))
+        ctx["texture_filename"] = tex_fn
+        if mesh_library:
+            if "mesh_uri" not in template.fields:
+                raise ValueError(f"Shape {shape!r} has no {{mesh_uri}} for the mesh library")
+            if dims is None:
+                raise ValueError("The mesh library needs the model dimensions")
+            fmt = mesh_format or (os.path.splitext(dae)[1].lstrip(".").lower() if dae else "dae")
+            uris, shared = MeshLibrary(mesh_library).entry(
+                primitive, dims, uv_scale, uv_offset, body_color, fmt)
+            ctx["dae_filename"]  = os.path.basename(uris["full"])
+            ctx["mesh_filename"] = ctx["dae_filename"]
+            ctx["mesh_uri"]      = uris["body"]
+            ctx["collision_uri"] = uris["full"]
+            ctx["image_uri"]     = uris["image"]
+            ctx["extra_visuals"] = _IMAGE_VISUAL.format(**ctx)
+            files[f"materials/scripts/{model_name}.material"] = _MATERIAL_SCRIPT.format(**ctx)
+        else:
+            levels = [dae] + list(lods or [])
+            for src in (f for level in levels for f in mesh_files(level)):
+                copies.append((src, os.path.join(outdir, "meshes", os.path.basename(src))))
+            uri = lambda src: f"model://{model_name}/meshes/{os.path.basename(src)}"
+            ctx["dae_filename"]  = os.path.basename(dae)
+            ctx["mesh_filename"] = ctx["dae_filename"]
+            ctx["mesh_uri"]      = uri(levels[min(visual_lod, len(levels) - 1)])
+            ctx["collision_uri"] = uri(levels[-1])
+            ctx["extra_visuals"] = ""
+
+    # if using cylinder placeholders
+    if "radius" in template.fields:
+        if radius is None or length is None:
+            raise ValueError("Cylinder shapes require --radius and --length")
+        ctx["radius"] = radius
+        ctx["length"] = length
+
+    if "collision_geometry" in template.fields:
+        ctx["collision_geometry"] = collision_geometry(collision, primitive, dims, ctx)
+
+    files["model.sdf"]    = template.render(ctx)
+    files["model.config"] = _MODEL_CONFIG.render(ctx)
+    return outdir, files, copies, shared
+
+def write_model(outdir, files, copies, shared=(), placement="copy"):
+    """
+    Write a rendered model. Meshes already in place (written straight
+    into <outdir>/meshes) are left alone; others are placed with
+    `placement` (copy, reflink, link or move). Missing shared library
+    meshes are written first.
+    """
+    write_meshes(shared)
+    for _, dst in copies:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+    os.makedirs(outdir, exist_ok=True)
+    for src, dst in copies:
+        place(src, dst, placement)
+    for rel, text in files.items():
+        path = os.path.join(outdir, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.lexists(path):
+            os.remove(path)             # may be hard-linked to a cache entry
+        with open(path, "w") as f:
+            f.write(text)
+    return outdir
+
+def generate_model(output, placement="copy", **spec):
+    """Generate one Gazebo model folder in-process; returns its path."""
+    return write_model(*render_model(output, **spec), placement=placement)
+
+def generate_models(specs, workers=8, placement="copy", stats=None):
+    """
+    Bulk API: render every spec (dicts of generate_model arguments plus
+    `output`), then write the model folders from a thread pool.
+    Yields (spec, outdir or None, error or None) in input order.
+    Pass a list as `stats` to get one {stage: seconds} dict per spec
+    appended to it (inertia is the batch-wide call, amortized per model).
+    """
+    specs = list(specs)
+    timers = [StageTimer() for _ in specs]
+    if stats is not None:
+        stats.extend(t.seconds for t in timers)
+
+    # mass/inertia for the whole batch in one vectorized call
+    t0 = time.perf_counter()
+    idx, kinds, dims, dens, mass = [], [], [], [], []
+    for i, spec in enumerate(specs):
+        if spec.get("inertial") is not None:
+            continue
+        kind, d = _model_dims(spec)
+        if d is not None:
+            idx.append(i); kinds.append(kind); dims.append(d)
+            dens.append(spec.get("density")); mass.append(spec.get("mass"))
+    if idx:
+        m, tensors = inertials(kinds, dims, dens, mass)
+        for j, i in enumerate(idx):
+            specs[i] = dict(specs[i], inertial=inertial_placeholders(m[j], tensors[j]))
+    for timer in timers:
+        timer.add("inertia", (time.perf_counter() - t0) / len(specs))
+
+    rendered = []
+    for spec, timer in zip(specs, timers):
+        try:
+            with timer.stage("render"):
+                rendered.append((spec, render_model(**spec), None, timer))
+        except Exception as e:
+            rendered.append((spec, None, e, timer))
+
+    def _write(item):
+        spec, model, err, timer = item
+        if err is not None:
+            return spec, None, err
+        try:
+            with timer.stage("write"):
+                return spec, write_model(*model, placement=placement), None
+        except Exception as e:
+            return spec, None, e
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_write, rendered)
+
+def _read_specs(path):
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def run_bulk(path, workers, placement="copy", metrics=None, profile=False):
+    start = time.monotonic()
+    ok = failed = 0
+    stats, records = [], []
+    results = generate_models(_read_specs(path), workers, placement, stats)
+    for n, (spec, outdir, err) in enumerate(results):
+        if err is None:
+            ok += 1
+        else:
+            failed += 1
+            print(f"❌ {spec.get('output')}: {type(err).__name__}: {err}", file=sys.stderr)
+        records.append({"output": spec.get("output"), "ok": err is None,
+                        "seconds": {k: round(v, 6) for k, v in stats[n].items()}})
+    if metrics:
+        peak = peak_rss_mb()
+        with open(metrics, "w") as f:
+            for rec in records:
+                f.write(json.dumps(dict(rec, peak_rss_mb=peak)) + "\n")
+    if profile and records:
+        print(profile_report(records))
+    elapsed = time.monotonic() - start
+    rate = ok / elapsed if elapsed > 0 else float("inf")
+    print(f"✅ {ok} Gazebo models created ({failed} failed) in {elapsed:.2f}s "
+          f"— {rate:.0f} models/s")
+    return failed
+
 def main():
     p = argparse.ArgumentParser(
         description="Generate an SDF model from a shape config"
     )
     p.add_argument("--shape",
-        choices=[fn[:-5] for fn in os.listdir(CONFIG_DIR) if fn.endswith(".yaml")],
+        choices=list_shapes(),
         default="box",
         help="Which shape config to use"
     )
     # mesh‐based args
-    p.add_argument("--dae",     help="Path to .dae file (only for mesh shapes)")
+    p.add_argument("--dae", "--mesh", dest="dae",
+        help="Path to the .dae/.glb/.obj mesh (only for mesh shapes; an .obj "
+             "brings its .mtl along)")
     p.add_argument("--texture", help="Path to texture (only for mesh shapes)")
     # cylinder‐based args
     p.add_argument("--radius",  type=float, help="Cylinder radius")
     p.add_argument("--length",  type=float, help="Cylinder length")
-    p.add_argument("--output",  required=True, help="Output model folder")
+    p.add_argument("--output",  help="Output model folder")
+    # physical properties (dimensions come from the mesh file name)
+    p.add_argument("--density", type=float, help="Density in kg/m³ for mass/inertia")
+    p.add_argument("--mass",    type=float, help="Mass in kg (overrides --density)")
+    p.add_argument("--collision", choices=COLLISION_MODES, default="primitive",
+        help="Analytic box/cylinder collision (default) or the visual mesh")
+    p.add_argument("--lod", action="append", dest="lods", metavar="DAE",
+        help="Coarser mesh of --dae (repeat, finest first): copied alongside it, "
+             "the coarsest becomes the --collision mesh")
+    p.add_argument("--visual-lod", type=int, default=0,
+        help="Mesh level for the visual: 0 = --dae (default), 1 = first --lod, ...")
+    p.add_argument("--mesh-library",
+        help="Shared mesh library folder (a Gazebo model dir on the model path); "
+             "the geometry is referenced from it instead of copying --dae")
+    # bulk mode
+    p.add_argument("--bulk",
+        help="JSONL of model specs ({output, shape, dae, texture, ...}; '-' for stdin)")
+    p.add_argument("--workers", type=int, default=8,
+        help="Writer threads for --bulk")
+    p.add_argument("--metrics",
+        help="Write per-model stage timings as JSONL (--bulk)")
+    p.add_argument("--profile", action="store_true",
+        help="Print a per-stage timing breakdown with percentiles (--bulk)")
+    p.add_argument("--placement", choices=PLACEMENTS, default="copy",
+        help="How --dae/--texture get into <output>/meshes: copy (default), "
+             "reflink (copy-on-write clone), link (hard link) or move")
     args = p.parse_args()
 
-    cfg = load_config(args.shape)
-    model_name = os.path.basename(args.output)
-    outdir     = os.path.abspath(args.output)
-    os.makedirs(outdir, exist_ok=True)
-
-    # prep context from placeholders
-    ctx = dict(cfg.get("placeholders", {}), model_name=model_name)
-
-    # if using mesh, copy files & set dae_filename
-    if "{dae_filename}" in cfg["template"]:
-        if not args.dae or not args.texture:
-            raise ValueError("Mesh shapes require --dae and --texture")
-        mesh_dir = os.path.join(outdir, "meshes")
-        os.makedirs(mesh_dir, exist_ok=True)
-        dae_fn = os.path.basename(args.dae)
-        tex_fn = os.path.basename(args.texture)
-        shutil.copy(args.dae,     os.path.join(mesh_dir, dae_fn))
-        shutil.copy(args.texture, os.path.join(mesh_dir, tex_fn))
-        ctx["dae_filename"] = dae_fn
-
-    # if using cylinder placeholders
-    if "{radius}" in cfg["template"]:
-        if args.radius is None or args.length is None:
-            raise ValueError("Cylinder shapes require --radius and --length")
-        ctx["radius"] = args.radius
-        ctx["length"] = args.length
-
-    # render template
-    sdf_xml = cfg["template"].format(**ctx)
-    with open(os.path.join(outdir, "model.sdf"), "w") as f:
-        f.write(sdf_xml)
-
-    # identical model.config for all shapes
-    model_config = f"""<?xml version="1.0"?>
-<model>
-  <name>{model_name}</name>
-  <version>1.0</version>
-  <sdf version="1.7">model.sdf</sdf>
-  <author><name>Generated</name><email>noreply@example.com</email></author>
-  <description>Auto-generated model.</description>
-</model>
-"""
-    with open(os.path.join(outdir, "model.config"), "w") as f:
-        f.write(model_config)
+    if args.bulk:
+        sys.exit(1 if run_bulk(args.bulk, args.workers, args.placement,
+                               args.metrics, args.profile) else 0)
+    if not args.output:
+        p.error("--output is required unless --bulk is given")
 
+    outdir = generate_model(
+        args.output, shape=args.shape, dae=args.dae, texture=args.texture,
+        radius=args.radius, length=args.length,
+        density=args.density, mass=args.mass, collision=args.collision,
+        mesh_library=args.mesh_library, placement=args.placement,
+        lods=args.lods, visual_lod=args.visual_lod,
+    )
     print(f"✅ Gazebo model created in: {outdir}")
 
 if __name__=="__main__":
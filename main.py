@@ -1,46 +1,496 @@
 #!/usr/bin/env python3
 import argparse
+import functools
+import json
 import os
+import re
 import shutil
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import generate_sdf_model
+import rendering
+import shard
+import texture
+import variants
+import watch
+from cache import ResultCache, parse_size
+from primitives import BACKENDS, dimensions, get_wrapper
+from primitives.fileops import dedup, replace_tree
+from primitives.imageinfo import image_size
+from primitives.timing import StageTimer, peak_rss_mb, profile_report
+
+HERE         = os.path.dirname(os.path.abspath(__file__))
+SCRATCH_ROOT = os.path.abspath("output_tmp")
 
 def find_blender(path):
     return path or os.environ.get("BLENDER_PATH", "blender")
 
-def run_pipeline(image_path, output_dir, primitive, blender_exec):
-    """Wrap one image and generate its SDF model."""
-    scratch = os.path.abspath("output_tmp")
-    if os.path.exists(scratch):
-        shutil.rmtree(scratch)
-    os.makedirs(scratch)
+def make_scratch():
+    """Create a private scratch folder under output_tmp/ for one job/worker."""
+    os.makedirs(SCRATCH_ROOT, exist_ok=True)
+    return tempfile.mkdtemp(prefix="job_", dir=SCRATCH_ROOT)
 
-    # 1) Blender wrap step
-    subprocess.run([
-        blender_exec,
-        "--background", "--python", "wrap_image_box.py", "--",
-        "--primitive", primitive,
-        "--image",    os.path.abspath(image_path),
-        "--outdir",   scratch
-    ], check=True)
+def build_dir(model_dir):
+    """
+    Models are built in <parent>/.<name>.build/<name> (same folder name, so
+    the model:// URIs are right) and renamed into place once complete: a
+    failed build leaves the existing model untouched, and a rebuild leaves
+    no stale meshes or textures of earlier dimensions behind.
+    """
+    model_dir = os.path.abspath(model_dir)
+    name = os.path.basename(model_dir)
+    return os.path.join(os.path.dirname(model_dir), f".{name}.build", name)
+
+def staging_dir(model_dir):
+    """
+    Wrappers write into <build>/.wrap: on the model's filesystem, so the SDF
+    step moves (renames) the files into meshes/ instead of copying them.
+    """
+    return os.path.join(build_dir(model_dir), ".wrap")
+
+def drop_build(model_dir):
+    shutil.rmtree(os.path.dirname(build_dir(model_dir)), ignore_errors=True)
+
+def commit_build(model_dir):
+    """Swap the finished build in for `model_dir`."""
+    shutil.rmtree(staging_dir(model_dir), ignore_errors=True)
+    replace_tree(build_dir(model_dir), model_dir)
+    drop_build(model_dir)
+
+def finish_record(rec, timer):
+    """Attach stage timings (plus their total) and peak memory to a record."""
+    seconds = timer.as_dict()
+    seconds["total"] = round(sum(seconds.values()), 6)
+    rec["seconds"] = seconds
+    peaks = [peak_rss_mb(), peak_rss_mb(children=True), rec.get("peak_rss_mb")]
+    peaks = [p for p in peaks if p is not None]
+    rec["peak_rss_mb"] = max(peaks) if peaks else None
+    return rec
+
+def failed_records(img_path, output_root, primitive, error,
+                   cli_spec=None, manifest=None, var_opts=None):
+    """The records of every model (variants included) an image would give, failed."""
+    name = os.path.splitext(os.path.basename(img_path))[0]
+    prim, spec = dimensions.resolve(img_path, primitive, cli_spec, manifest)
+    records = []
+    for model, _, _, variant in variants.expand(
+            img_path, name, prim, spec, var_opts, cli_spec, manifest):
+        rec = {"image": os.path.abspath(img_path),
+               "model": os.path.join(output_root, model), "ok": False, "error": error}
+        if variant is not None:
+            rec["variant"] = variant
+        records.append(finish_record(rec, StageTimer()))
+    return records
+
+@contextmanager
+def profiled(folder, filename):
+    """cProfile the enclosed block into folder/filename (no-op without folder)."""
+    if not folder:
+        yield
+        return
+    import cProfile
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(os.path.join(folder, filename))
+
+def write_metrics(records, path, mode="w"):
+    with open(path, mode) as f:
+        for rec in records:
+            f.write(json.dumps(rec) + "\n")
 
-    # 2) Locate the generated .dae and texture_*
+_MESH_FILE = re.compile(r"\.(%s)$" % "|".join(dimensions.MESH_FORMATS))
+_LOD_FILE  = re.compile(r"_lod(\d+)\.\w+$")
+
+def find_outputs(scratch):
+    """
+    Locate the generated mesh, texture_* and LOD meshes in a wrap output
+    folder (no mesh when the shared mesh library supplies it).
+    """
     files = os.listdir(scratch)
-    dae_file = next(f for f in files if f.endswith(".dae"))
+    meshes = [f for f in files if _MESH_FILE.search(f)]
+    dae_file = next((f for f in meshes if not _LOD_FILE.search(f)), None)
     tex_file = next(f for f in files if f.startswith("texture_"))
-    dae_path = os.path.join(scratch, dae_file)
-    tex_path = os.path.join(scratch, tex_file)
-
-    # 3) SDF generation
-    subprocess.run([
-        sys.executable,
-        "generate_sdf_model.py",
-        "--dae",     dae_path,
-        "--texture", tex_path,
-        "--output",  os.path.abspath(output_dir)
-    ], check=True)
+    lods = sorted((f for f in meshes if _LOD_FILE.search(f)),
+                  key=lambda f: int(_LOD_FILE.search(f).group(1)))
+    return (dae_file and os.path.join(scratch, dae_file), os.path.join(scratch, tex_file),
+            [os.path.join(scratch, f) for f in lods])
+
+def cache_options(sdf_opts, tex_opts):
+    """Options besides image and dimensions that change a model (cache key)."""
+    opts = dict(sdf_opts or {})
+    if texture.is_active(tex_opts):
+        opts["texture"] = tex_opts
+    return opts
+
+def plan_model(primitive, spec, size):
+    """
+    Size the model before any wrapping: the size in meters follows from the
+    image's (width, height), read off its PNG/JPEG header without decoding,
+    and the spec. Missing sides are prompted for here, not inside Blender.
+    """
+    return dict(spec, size_m=list(dimensions.model_size(primitive, spec, lambda: size)))
+
+def prepare_texture(image_path, spec, tex_dir, tex_opts):
+    """
+    Texture stage: returns the image to wrap and the spec extended with the
+    source size and UV range when the texture was resized or padded.
+    """
+    tex = texture.process(image_path, tex_dir, tex_opts)
+    if tex["source_px"] is None:
+        return image_path, spec
+    return tex["path"], dict(spec, image_px=tex["source_px"], uv_scale=tex["uv_scale"])
+
+def finish_texture(model_dir, tex_path, tex_opts, texture_store=None, sdf_opts=None):
+    """
+    Write the mipmap chain next to the model's texture when asked for, and
+    hard-link identical textures to one file in `texture_store`.
+    """
+    subdir = generate_sdf_model.texture_subdir((sdf_opts or {}).get("mesh_library"))
+    tex = os.path.join(model_dir, subdir, os.path.basename(tex_path))
+    paths = [tex]
+    if tex_opts and tex_opts.get("mipmaps"):
+        paths += texture.write_mipmaps(tex)
+    if texture_store:
+        for path in paths:
+            dedup(path, texture_store)
+
+def generate_sdf(dae_path, tex_path, output_dir, sdf_opts=None, uv_scale=None,
+                 lods=None, **model):
+    """
+    SDF step, in-process: shape templates are compiled once per process.
+    The wrap outputs are moved into meshes/, not copied. `model` may carry
+    the wrapper's primitive and dims (else read off the mesh name).
+    """
+    generate_sdf_model.generate_model(
+        output_dir, placement="move", dae=dae_path, texture=tex_path,
+        uv_scale=uv_scale, lods=lods, **model, **(sdf_opts or {})
+    )
+
+def wrap_native(job):
+    """Run one wrap job in-process with the native backend."""
+    try:
+        out = get_wrapper(job["primitive"], backend="native").run(
+            job["image"], job["outdir"], job["dims"]
+        )
+        return dict(out, ok=True)
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+def wrap_blender(jobs, scratch, primitive, blender_exec, stdin=None, cprofile=None):
+    """
+    Run all wrap jobs in one Blender session; one result per job.
+    `cprofile` is a folder for a cProfile dump of the Blender-side run.
+    """
+    jobs_path = os.path.join(scratch, "manifest.jsonl")
+    results   = os.path.join(scratch, "results.jsonl")
+    with open(jobs_path, "w") as f:
+        for job in jobs:
+            f.write(json.dumps(job) + "\n")
+
+    proc = subprocess.run([
+        blender_exec,
+        "--background", "--python", os.path.join(HERE, "wrap_image_box.py"), "--",
+        "--primitive", primitive,
+        "--manifest",  jobs_path,
+        "--results",   results,
+        *(["--cprofile", os.path.join(cprofile, f"blender_{os.path.basename(scratch)}.prof")]
+          if cprofile else [])
+    ], stdin=stdin)
+
+    wrapped = []
+    if os.path.exists(results):
+        with open(results) as f:
+            wrapped = [json.loads(line) for line in f if line.strip()]
+    missing = {"ok": False,
+               "error": f"no result (Blender exited with code {proc.returncode})"}
+    return wrapped + [missing] * (len(jobs) - len(wrapped))
+
+def run_pipeline(image_path, output_dir, primitive, blender_exec,
+                 cli_spec=None, manifest=None, backend="blender", cache=None,
+                 sdf_opts=None, tex_opts=None, texture_store=None, cprofile=None):
+    """Wrap one image and generate its SDF model; returns its record."""
+    timer = StageTimer()
+    rec = {"image": os.path.abspath(image_path),
+           "model": os.path.abspath(output_dir), "ok": False}
+    primitive, spec = dimensions.resolve(image_path, primitive, cli_spec, manifest)
+    with timer.stage("probe"):
+        spec = plan_model(primitive, spec, image_size(image_path))
+    if cache:
+        name = os.path.basename(os.path.abspath(output_dir))
+        with timer.stage("cache_lookup"):
+            key = cache.key(image_path, primitive, spec, backend, name,
+                            cache_options(sdf_opts, tex_opts))
+            hit = cache.restore(key, output_dir, (sdf_opts or {}).get("mesh_library"))
+        if hit:
+            print(f"♻️  Cached: {output_dir}")
+            rec.update(ok=True, cached=True)
+            return finish_record(rec, timer)
+    scratch = make_scratch()
+    build   = build_dir(output_dir)
+    stage   = staging_dir(output_dir)
+    try:
+        # 1) texture and wrap steps, straight into the model folder
+        with timer.stage("texture"):
+            image_path, spec = prepare_texture(
+                image_path, spec, os.path.join(scratch, "source"), tex_opts
+            )
+        drop_build(output_dir)
+        if backend == "native":
+            with profiled(cprofile, "native_single.prof"):
+                out = get_wrapper(primitive, backend="native").run(image_path, stage, spec)
+            timer.update(out.get("seconds"), "wrap.")
+        else:
+            # one Blender process; its stages are only visible via --cprofile
+            with timer.stage("wrap.blender_process"):
+                subprocess.run([
+                    blender_exec,
+                    "--background", "--python", os.path.join(HERE, "wrap_image_box.py"), "--",
+                    "--primitive", primitive,
+                    "--image",    os.path.abspath(image_path),
+                    "--outdir",   stage,
+                    *dimensions.dims_to_argv(spec),
+                    *(["--cprofile", os.path.join(cprofile, "blender_single.prof")]
+                      if cprofile else [])
+                ], check=True)
+
+        # 2) Locate the generated mesh and texture_*
+        dae_path, tex_path, lods = find_outputs(stage)
+
+        # 3) SDF generation; library meshes need the exact dims (segments
+        #    included), which the mesh name does not carry
+        model = {}
+        if (sdf_opts or {}).get("mesh_library"):
+            model = {"primitive": primitive,
+                     "dims": dimensions.mesh_dims(primitive, spec["size_m"], spec),
+                     "mesh_format": spec.get("mesh_format")}
+        with timer.stage("sdf"):
+            generate_sdf(dae_path, tex_path, build, sdf_opts, spec.get("uv_scale"),
+                         lods, **model)
+        with timer.stage("finish_texture"):
+            finish_texture(build, tex_path, tex_opts, texture_store, sdf_opts)
+        commit_build(output_dir)
+        if cache:
+            with timer.stage("cache_store"):
+                cache.store(key, output_dir)
+    finally:
+        drop_build(output_dir)
+        shutil.rmtree(scratch, ignore_errors=True)
 
     print(f"✅ Model created: {output_dir}")
+    rec["ok"] = True
+    return finish_record(rec, timer)
+
+def run_batch(image_paths, output_root, primitive, blender_exec,
+              cli_spec=None, manifest=None, stdin=None, backend="blender",
+              cache=None, sdf_opts=None, tex_opts=None, texture_store=None,
+              cprofile=None, var_opts=None, render_opts=None):
+    """
+    Wrap every image (inside a single Blender session for the blender
+    backend), then generate the SDF model for each job that succeeded.
+    Each model is built in its build folder and renamed into place (see build_dir);
+    models found in `cache` are linked into place instead.
+    With `var_opts` every image yields that many variant models, built one
+    after the other so a Blender session reuses the image and the mesh.
+    With `render_opts` the session also renders every model it wraps.
+    Returns one {image, model, ok, error, seconds, peak_rss_mb, variant?,
+    render_dir?}
+    record per model; batch-wide costs (Blender start-up, inertia) are
+    amortized.
+    """
+    scratch = make_scratch()
+    key_opts = cache_options(sdf_opts, tex_opts)
+    library  = (sdf_opts or {}).get("mesh_library")
+    jobs, records, timers = [], [], []
+    try:
+        # 1) one manifest job per uncached model, staged in its model folder
+        for img_path in image_paths:
+            name = os.path.splitext(os.path.basename(img_path))[0]
+            prim, spec = dimensions.resolve(img_path, primitive, cli_spec, manifest)
+            tex = None      # texture stage result, shared by the image's variants
+            # header-only probe: bad inputs are rejected before any Blender start
+            t0 = time.perf_counter()
+            try:
+                size = image_size(img_path)
+            except (OSError, ValueError) as e:
+                size = f"unreadable image: {e}"
+            probe_s = time.perf_counter() - t0
+            for model, prim, spec, variant in variants.expand(
+                    img_path, name, prim, spec, var_opts, cli_spec, manifest):
+                rec = {"image": os.path.abspath(img_path),
+                       "model": os.path.join(output_root, model), "ok": False}
+                if variant is not None:
+                    rec["variant"] = variant
+                timer = StageTimer()
+                records.append(rec)
+                timers.append(timer)
+                if isinstance(size, str):
+                    rec["error"] = size
+                    continue
+                try:
+                    with timer.stage("probe"):
+                        spec = plan_model(prim, spec, size)
+                except ValueError as e:
+                    rec["error"] = f"dimensions: {e}"
+                    continue
+                timer.add("probe", probe_s)
+                probe_s = 0.0       # counted once per image
+                if cache:
+                    with timer.stage("cache_lookup"):
+                        key = cache.key(img_path, prim, spec, backend, model, key_opts)
+                        hit = cache.restore(key, rec["model"], library)
+                    if hit:
+                        rec.update(ok=True, cached=True)
+                        print(f"♻️  Cached: {rec['model']}")
+                        continue
+                else:
+                    key = None
+                if tex is None:
+                    try:
+                        with timer.stage("texture"):
+                            src, tex_spec = prepare_texture(
+                                rec["image"], {}, os.path.join(scratch, "source", name), tex_opts
+                            )
+                        tex = (src, tex_spec)
+                    except Exception as e:
+                        tex = f"texture stage failed: {type(e).__name__}: {e}"
+                if isinstance(tex, str):
+                    rec["error"] = tex
+                    continue
+                src, spec = tex[0], dict(spec, **tex[1])
+                drop_build(rec["model"])
+                jobs.append({
+                    "image":     src,
+                    "primitive": prim,
+                    "dims":      spec,
+                    "outdir":    os.path.abspath(staging_dir(rec["model"])),
+                    "model":     rec["model"],
+                    "key":       key,
+                    "record":    len(records) - 1,
+                })
+                if rendering.is_active(render_opts):
+                    jobs[-1]["render"] = rendering.job_opts(render_opts, model)
+
+        if jobs:
+            # 2) wrap step, once for the whole batch
+            t0 = time.perf_counter()
+            if backend == "native":
+                with profiled(cprofile, f"native_{os.path.basename(scratch)}.prof"):
+                    wrapped = [wrap_native(job) for job in jobs]
+            else:
+                wrapped = wrap_blender(jobs, scratch, primitive, blender_exec, stdin, cprofile)
+            wall = time.perf_counter() - t0
+            in_jobs = sum(sum((res.get("seconds") or {}).values()) for res in wrapped)
+            for job, res in zip(jobs, wrapped):
+                timer = timers[job["record"]]
+                timer.update(res.get("seconds"), "wrap.")
+                if backend != "native":
+                    # process start-up, Python/addon load, manifest I/O
+                    timer.add("wrap.blender_overhead", max(0.0, wall - in_jobs) / len(jobs))
+                if res.get("peak_rss_mb") is not None:
+                    records[job["record"]]["peak_rss_mb"] = res["peak_rss_mb"]
+                if res.get("render_dir"):
+                    records[job["record"]]["render_dir"] = res["render_dir"]
+
+            # 3) SDF generation for every successful wrap, as one bulk call
+            #    (mass/inertia of the whole batch computed in one go)
+            done, specs, stats = [], [], []
+            for job, res in zip(jobs, wrapped):
+                if not res["ok"]:
+                    records[job["record"]]["error"] = res["error"]
+                    continue
+                done.append((job, res["texture"]))
+                specs.append(dict(sdf_opts or {}, output=build_dir(job["model"]),
+                                  dae=res["mesh"], texture=res["texture"],
+                                  lods=res.get("lods"),
+                                  mesh_format=job["dims"].get("mesh_format"),
+                                  primitive=res.get("primitive"), dims=res.get("dims"),
+                                  uv_scale=dimensions.uv_scale(job["dims"]),
+                                  uv_offset=dimensions.uv_offset(job["dims"]),
+                                  body_color=dimensions.body_color(job["dims"])))
+            results = generate_sdf_model.generate_models(specs, placement="move", stats=stats)
+            for n, ((job, tex_path), (_, outdir, err)) in enumerate(zip(done, results)):
+                rec, timer = records[job["record"]], timers[job["record"]]
+                timer.update(stats[n], "sdf.")
+                if err is not None:
+                    rec["error"] = f"SDF generation failed: {type(err).__name__}: {err}"
+                    continue
+                try:
+                    with timer.stage("finish_texture"):
+                        finish_texture(outdir, tex_path, tex_opts, texture_store, sdf_opts)
+                except Exception as e:
+                    rec["error"] = f"texture finishing failed: {type(e).__name__}: {e}"
+                    continue
+                try:
+                    commit_build(job["model"])
+                except OSError as e:
+                    rec["error"] = f"placing the model failed: {e}"
+                    continue
+                if cache:
+                    with timer.stage("cache_store"):
+                        cache.store(job["key"], job["model"])
+                rec["ok"] = True
+                print(f"✅ Model created: {job['model']}")
+        return [finish_record(rec, timer) for rec, timer in zip(records, timers)]
+    finally:
+        for job in jobs:
+            drop_build(job["model"])
+        shutil.rmtree(scratch, ignore_errors=True)
+
+def run_parallel(image_paths, output_root, primitive, blender_exec, jobs,
+                 cli_spec=None, manifest=None, backend="blender", cache=None,
+                 sdf_opts=None, tex_opts=None, texture_store=None, cprofile=None,
+                 var_opts=None, render_opts=None):
+    """
+    Split the images over `jobs` worker processes, each running its own
+    wrap (one Blender session each) and SDF steps in a private scratch folder.
+    """
+    chunks = [image_paths[i::jobs] for i in range(jobs)]
+    chunks = [c for c in chunks if c]
+    records = []
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        # stdin cannot be shared between concurrent Blender sessions
+        futures = {
+            pool.submit(run_batch, chunk, output_root, primitive, blender_exec,
+                        cli_spec, manifest, subprocess.DEVNULL, backend,
+                        cache, sdf_opts, tex_opts, texture_store, cprofile,
+                        var_opts, render_opts): chunk
+            for chunk in chunks
+        }
+        for fut in as_completed(futures):
+            try:
+                records.extend(fut.result())
+            except Exception as e:
+                for img in futures[fut]:
+                    records.extend(failed_records(
+                        img, output_root, primitive,
+                        f"worker failed: {type(e).__name__}: {e}",
+                        cli_spec, manifest, var_opts))
+    order = {os.path.abspath(img): i for i, img in enumerate(image_paths)}
+    records.sort(key=lambda r: order[r["image"]])
+    return records
+
+def print_summary(records, elapsed):
+    failed = [r for r in records if not r["ok"]]
+    cached = sum(1 for r in records if r.get("cached"))
+    print(f"\n{len(records) - len(failed)}/{len(records)} models created "
+          f"in {elapsed:.1f}s ({cached} from cache, {len(failed)} failed)")
+    for r in failed:
+        print(f"❌ {r['image']}: {r['error']}")
+
+def evict_cache(cache):
+    if cache:
+        evicted = cache.evict()
+        if evicted:
+            print(f"Cache: evicted {evicted} least recently used entries")
 
 def main():
     p = argparse.ArgumentParser(
@@ -55,6 +505,10 @@ def main():
         "--batch-dir", "-b",
         help="Directory of images to process in batch"
     )
+    group.add_argument(
+        "--watch", "-w",
+        help="Directory to watch: process images as they land (until Ctrl-C)"
+    )
     p.add_argument(
         "--output", "-o",
         required=True,
@@ -70,28 +524,270 @@ def main():
         "--blender",
         help="Path to Blender executable (or set $BLENDER_PATH)"
     )
+    p.add_argument(
+        "--shard",
+        type=shard.parse_shard, metavar="i/N",
+        help="Batch mode: only the images whose name hashes to shard i of N "
+             "(0-based); writes <output>/shards/shard-<i>-of-<N>.json"
+    )
+    p.add_argument(
+        "--jobs", "-j",
+        type=int, default=1,
+        help="Parallel Blender workers for --batch-dir and --watch (default 1)"
+    )
+    p.add_argument(
+        "--backend",
+        choices=BACKENDS, default="blender",
+        help="Geometry backend: Blender (default) or Blender-free native NumPy"
+    )
+    p.add_argument(
+        "--dims-manifest", "-d",
+        help="CSV/YAML/JSONL of per-image (and default) dimensions"
+    )
+    p.add_argument(
+        "--cache",
+        help="Result cache folder; unchanged inputs reuse cached models"
+    )
+    p.add_argument(
+        "--cache-size",
+        help="Cache size limit, e.g. 500M or 20G (least recently used evicted)"
+    )
+    p.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate every model even on a cache hit (and refresh the cache)"
+    )
+    p.add_argument(
+        "--density",
+        type=float,
+        help="Density in kg/m³; mass and inertia follow from the dimensions"
+    )
+    p.add_argument(
+        "--mass",
+        type=float,
+        help="Mass in kg (overrides --density)"
+    )
+    p.add_argument(
+        "--collision",
+        choices=generate_sdf_model.COLLISION_MODES, default="primitive",
+        help="Collision geometry: analytic box/cylinder (default) or the visual mesh"
+    )
+    p.add_argument(
+        "--visual-lod",
+        type=int, default=0,
+        help="Cylinder mesh level for the visual with --lods: 0 = full (default), "
+             "1 = first LOD, ... (mesh collision always uses the coarsest)"
+    )
+    p.add_argument(
+        "--watch-batch",
+        type=int, default=8,
+        help="Watch mode: images per Blender session (default 8)"
+    )
+    p.add_argument(
+        "--watch-queue",
+        type=int, default=64,
+        help="Watch mode: settled images allowed to wait for a worker (default 64)"
+    )
+    p.add_argument(
+        "--settle",
+        type=float, default=1.0,
+        help="Watch mode: seconds a file must stay unchanged before it is processed"
+    )
+    p.add_argument(
+        "--poll",
+        type=float, default=1.0,
+        help="Watch mode: polling interval (also without inotify)"
+    )
+    p.add_argument(
+        "--finish",
+        choices=watch.FINISH_MODES, default="move",
+        help="Watch mode: move inputs to processed/ and failed/, or tag them "
+             "with .done/.failed sidecars"
+    )
+    p.add_argument(
+        "--no-inotify",
+        action="store_true",
+        help="Watch mode: always poll (e.g. on network filesystems)"
+    )
+    dimensions.add_dim_args(p)
+    texture.add_texture_args(p)
+    variants.add_variant_args(p)
+    rendering.add_render_args(p)
+    p.add_argument(
+        "--mesh-library",
+        help="Shared mesh library folder (on the Gazebo model path): each unique "
+             "geometry is stored once and models reference it via model://"
+    )
+    p.add_argument(
+        "--texture-store",
+        help="Hard-link identical textures to one file in this folder "
+             "(same filesystem as --output)"
+    )
+    p.add_argument(
+        "--metrics",
+        help="Write one JSON line per image (stage seconds, peak RSS) to this file"
+    )
+    p.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-stage timing percentiles at the end of the run"
+    )
+    p.add_argument(
+        "--cprofile",
+        help="Folder for cProfile dumps of the wrap step (Blender side included)"
+    )
     args = p.parse_args()
+    if args.jobs < 1:
+        p.error("--jobs must be >= 1")
 
     blender_exec = find_blender(args.blender)
+    cli_spec = dimensions.dims_from_args(args)
+    manifest = (dimensions.load_manifest(args.dims_manifest)
+                if args.dims_manifest else None)
+    for key, names in dimensions.cli_overrides(manifest, cli_spec).items():
+        shown = ", ".join(sorted(names)[:3]) + (", ..." if len(names) > 3 else "")
+        print(f"⚠️  --{key.replace('_', '-')} is overridden by the --dims-manifest "
+              f"row of {len(names)} image(s): {shown}")
+    sdf_opts = {k: v for k, v in (("density", args.density), ("mass", args.mass))
+                if v is not None}
+    sdf_opts["collision"] = args.collision
+    if args.visual_lod:
+        sdf_opts["visual_lod"] = args.visual_lod
+    if args.mesh_library:
+        sdf_opts["mesh_library"] = os.path.abspath(args.mesh_library)
+        # the library writes the meshes; the wrappers only place the texture
+        cli_spec["skip_mesh"] = True
+    tex_opts = texture.texture_opts_from_args(args)
+    var_opts = variants.variant_opts_from_args(args)
+    if args.variants < 0:
+        p.error("--variants must be >= 0")
+    if args.shard and not args.batch_dir:
+        p.error("--shard needs --batch-dir")
+    render_opts = rendering.render_opts_from_args(args, args.output)
+    if rendering.is_active(render_opts):
+        if args.backend == "native":
+            p.error("--render-views needs the Blender backend")
+        if args.cache:
+            p.error("--render-views cannot be combined with --cache "
+                    "(cached models would not be rendered)")
+        labels = rendering.labels_path(render_opts, args.shard)
+    cache = None
+    if args.cache:
+        cache = ResultCache(
+            args.cache,
+            max_bytes=parse_size(args.cache_size) if args.cache_size else None,
+            force=args.force,
+        )
+    cprofile = None
+    if args.cprofile:
+        cprofile = os.path.abspath(args.cprofile)
+        os.makedirs(cprofile, exist_ok=True)
 
-    if args.batch_dir:
-        # process every image in the folder
-        imgs = sorted(
-            f for f in os.listdir(args.batch_dir)
-            if f.lower().endswith((".png", ".jpg", ".jpeg"))
+    # variant parameters of every model built, for reproducing a dataset
+    variant_manifest = os.path.join(args.output, variants.MANIFEST)
+    if args.shard:
+        # shards may share the output root: one variant manifest each
+        variant_manifest = os.path.splitext(
+            shard.manifest_path(args.output, *args.shard))[0] + "." + variants.MANIFEST
+    if variants.is_active(var_opts):
+        os.makedirs(os.path.dirname(variant_manifest), exist_ok=True)
+
+    if args.watch:
+        # long-running: each batch of settled images goes through run_batch
+        process = functools.partial(
+            run_batch, output_root=args.output, primitive=args.primitive,
+            blender_exec=blender_exec, cli_spec=cli_spec, manifest=manifest,
+            stdin=subprocess.DEVNULL, backend=args.backend, cache=cache,
+            sdf_opts=sdf_opts, tex_opts=tex_opts, texture_store=args.texture_store,
+            cprofile=cprofile, var_opts=var_opts, render_opts=render_opts,
+        )
+        seen = []
+        def after_batch(records):
+            evict_cache(cache)
+            if args.metrics:
+                write_metrics(records, args.metrics, mode="a")
+            if variants.is_active(var_opts):
+                variants.write_manifest(records, variant_manifest, mode="a")
+            if rendering.is_active(render_opts):
+                rendering.write_labels(records, labels, mode="a")
+            if args.profile:
+                seen.extend(records)
+        watch.run_watch(
+            args.watch, process, jobs=args.jobs, batch=args.watch_batch,
+            max_queue=args.watch_queue, settle=args.settle, poll=args.poll,
+            finish=args.finish, inotify=not args.no_inotify,
+            after_batch=after_batch,
         )
-        if not imgs:
-            print(f"No images found in {args.batch_dir}")
+        if args.profile and seen:
+            print("\n" + profile_report(seen))
+    elif args.batch_dir or variants.is_active(var_opts) or rendering.is_active(render_opts):
+        # process every image in the folder; variants of a single image
+        # (--output is then their parent) and renders (made in the batch
+        # session) also go through the batch path
+        if args.batch_dir:
+            imgs = sorted(
+                f for f in os.listdir(args.batch_dir)
+                if f.lower().endswith((".png", ".jpg", ".jpeg"))
+            )
+            if not imgs:
+                print(f"No images found in {args.batch_dir}")
+                sys.exit(1)
+            img_paths = [os.path.join(args.batch_dir, img) for img in imgs]
+            if args.shard:
+                img_paths = shard.select(img_paths, *args.shard)
+                print(f"Shard {args.shard[0]}/{args.shard[1]}: "
+                      f"{len(img_paths)} of {len(imgs)} images")
+        else:
+            img_paths = [args.image]
+        start = time.monotonic()
+        if args.jobs > 1:
+            records = run_parallel(img_paths, args.output, args.primitive,
+                                   blender_exec, args.jobs, cli_spec, manifest,
+                                   args.backend, cache, sdf_opts, tex_opts,
+                                   args.texture_store, cprofile, var_opts,
+                                   render_opts)
+        else:
+            try:
+                records = run_batch(img_paths, args.output, args.primitive,
+                                    blender_exec, cli_spec, manifest,
+                                    backend=args.backend, cache=cache,
+                                    sdf_opts=sdf_opts, tex_opts=tex_opts,
+                                    texture_store=args.texture_store,
+                                    cprofile=cprofile, var_opts=var_opts,
+                                    render_opts=render_opts)
+            except Exception as e:
+                # as run_parallel does for a failed worker: the shard
+                # manifest and summary still list every model, failed
+                records = [rec for img in img_paths for rec in failed_records(
+                    img, args.output, args.primitive,
+                    f"batch failed: {type(e).__name__}: {e}",
+                    cli_spec, manifest, var_opts)]
+        print_summary(records, time.monotonic() - start)
+        evict_cache(cache)
+        if args.metrics:
+            write_metrics(records, args.metrics)
+        if variants.is_active(var_opts):
+            variants.write_manifest(records, variant_manifest)
+        if rendering.is_active(render_opts):
+            count = rendering.write_labels(records, labels)
+            print(f"Render labels: {count} views → {labels}")
+        if args.shard:
+            path = shard.write_manifest(records, args.output, *args.shard, img_paths)
+            print(f"Shard manifest: {path}")
+        if args.profile:
+            print("\n" + profile_report(records))
+        if not all(r["ok"] for r in records):
             sys.exit(1)
-        for img in imgs:
-            img_path = os.path.join(args.batch_dir, img)
-            name     = os.path.splitext(img)[0]
-            out_dir  = os.path.join(args.output, name)
-            print(f"\n--- Processing {img} → {out_dir} ---")
-            run_pipeline(img_path, out_dir, args.primitive, blender_exec)
     else:
         # single image mode
-        run_pipeline(args.image, args.output, args.primitive, blender_exec)
+        record = run_pipeline(args.image, args.output, args.primitive, blender_exec,
+                              cli_spec, manifest, args.backend, cache, sdf_opts,
+                              tex_opts, args.texture_store, cprofile)
+        evict_cache(cache)
+        if args.metrics:
+            write_metrics([record], args.metrics)
+        if args.profile:
+            print("\n" + profile_report([record]))
 
     print("\n🎉 All tasks complete.")
 
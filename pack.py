@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Pack a generated model set into one uncompressed tar plus a fixed-layout
+binary index, for copying to and loading on simulation nodes.
+
+    ./pack.py build ~/.gazebo/models/set -o set.tar     # set.tar + set.tar.idx
+    ./pack.py list set.tar
+    ./pack.py extract set.tar can_01 box_07 -C ~/.gazebo/models --verify
+    ./pack.py subset set.tar can_01 box_07 -o small.tar
+
+Every folder with a model.config (as generate_sdf_model.py and
+convert_stl_model.py write them) becomes a contiguous run of tar members
+<model>/...; the archive stays a plain tar that `tar -x` unpacks. The index
+(<archive>.idx) is memory-mapped with NumPy: a header, one fixed-size
+record per model (name, byte range in the tar, primitive, dimensions,
+mass, content hash) sorted by name, and an open-addressing hash table
+of record numbers for O(1) lookup. A model's byte range is read with a
+single seek, so any subset extracts without touching the rest.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import struct
+import sys
+import tarfile
+
+import numpy as np
+
+import generate_sdf_model
+
+MAGIC    = b"SBMPACK1"
+VERSION  = 1
+# magic, version, record count, hash slots, record size, archive size
+_HEADER  = struct.Struct("<8sIIIIQ")
+HEADER_SIZE = 64
+
+PRIMITIVES = ("", "box", "cylinder", "mesh")
+
+RECORD = np.dtype([
+    ("key",       "<u8"),       # first 8 bytes of sha256(name), big-endian
+    ("offset",    "<u8"),       # first tar header of the model
+    ("size",      "<u8"),       # bytes up to the end of its last member
+    ("name",      "S112"),
+    ("primitive", "u1"),        # index into PRIMITIVES
+    ("_pad",      "V3"),
+    ("files",     "<u4"),
+    ("dims",      "<f4", 3),    # box w,d,h / cylinder r,l,0 / mesh extents (m)
+    ("mass",      "<f4"),       # kg, NaN when the SDF has none
+    ("digest",    "u1", 32),    # sha256 of the model's files (raw bytes)
+])
+assert RECORD.itemsize == 192
+
+def name_key(name):
+    return int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], "big")
+
+def index_path(archive):
+    return archive + ".idx"
+
+# --- model metadata ------------------------------------------------------------
+
+_MASS     = re.compile(r"<mass>\s*([-\d.eE+]+)\s*</mass>")
+_BOX      = re.compile(r"<box>\s*<size>\s*([-\d.eE+ ]+?)\s*</size>")
+_CYLINDER = re.compile(r"<cylinder>\s*<radius>\s*([-\d.eE+]+)\s*</radius>\s*"
+                       r"<length>\s*([-\d.eE+]+)\s*</length>")
+
+def _stl_extents(path):
+    """Bounding box size of an STL (binary read as a memmap, ASCII parsed)."""
+    with open(path, "rb") as f:
+        head = f.read(84)
+    n = struct.unpack("<I", head[80:84])[0] if len(head) == 84 else 0
+    if 84 + 50 * n == os.path.getsize(path):
+        tris = np.memmap(path, dtype=np.dtype([("normal", "<f4", 3), ("v", "<f4", (3, 3)),
+                                               ("attr", "<u2")]), mode="r", offset=84, shape=(n,))
+        pts = tris["v"].reshape(-1, 3)
+    else:
+        with open(path) as f:
+            pts = np.array([line.split()[1:4] for line in f
+                            if line.lstrip().startswith("vertex")], dtype=float)
+    return pts.max(axis=0) - pts.min(axis=0) if len(pts) else np.zeros(3)
+
+def model_info(model_dir):
+    """(primitive, dims, mass) of a model folder, read off what was written."""
+    sdf = ""
+    if os.path.exists(os.path.join(model_dir, "model.sdf")):
+        with open(os.path.join(model_dir, "model.sdf")) as f:
+            sdf = f.read()
+    m = _MASS.search(sdf)
+    mass = float(m.group(1)) if m else float("nan")
+
+    meshes = os.path.join(model_dir, "meshes")
+    names = sorted(os.listdir(meshes)) if os.path.isdir(meshes) else []
+    for fn in names:
+        primitive, dims = generate_sdf_model.dims_from_mesh_name(fn)
+        if primitive == "box":
+            return primitive, (dims["width"], dims["depth"], dims["height"]), mass
+        if primitive == "cylinder":
+            return primitive, (dims["radius"], dims["length"], 0.0), mass
+    box, cyl = _BOX.search(sdf), _CYLINDER.search(sdf)
+    if box:
+        return "box", tuple(float(v) for v in box.group(1).split()), mass
+    if cyl:
+        return "cylinder", (float(cyl.group(1)), float(cyl.group(2)), 0.0), mass
+    stls = [fn for fn in names if fn.lower().endswith(".stl") and "_col" not in fn]
+    if stls:
+        return "mesh", tuple(_stl_extents(os.path.join(meshes, stls[0]))), mass
+    return "", (0.0, 0.0, 0.0), mass
+
+def find_models(root):
+    """Model folder names under `root`: those with a model.config."""
+    return sorted(d for d in os.listdir(root)
+                  if os.path.isfile(os.path.join(root, d, "model.config")))
+
+def _model_files(model_dir):
+    return sorted(
+        os.path.relpath(os.path.join(dp, fn), model_dir)
+        for dp, _, fns in os.walk(model_dir) for fn in fns
+    )
+
+# --- index ---------------------------------------------------------------------
+
+def write_index(path, records, archive_size):
+    """Write records (sorted by name) and their hash table."""
+    records = np.sort(np.asarray(records, dtype=RECORD), order="name")
+    slots = 1
+    while slots < 2 * max(len(records), 1):
+        slots *= 2
+    table = np.zeros(slots, dtype="<u4")
+    for i, key in enumerate(records["key"].tolist()):
+        s = key & (slots - 1)
+        while table[s]:
+            s = (s + 1) & (slots - 1)
+        table[s] = i + 1
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(records), slots,
+                             RECORD.itemsize, archive_size).ljust(HEADER_SIZE, b"\0"))
+        f.write(records.tobytes())
+        f.write(table.tobytes())
+
+class PackIndex:
+    """Memory-mapped index of a packed archive."""
+
+    def __init__(self, archive):
+        self.archive = archive
+        path = index_path(archive)
+        with open(path, "rb") as f:
+            magic, version, count, slots, size, self.archive_size = \
+                _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION or size != RECORD.itemsize:
+            raise ValueError(f"{path}: not a version {VERSION} pack index")
+        self.records = np.memmap(path, dtype=RECORD, mode="r",
+                                 offset=HEADER_SIZE, shape=(count,))
+        self.table = np.memmap(path, dtype="<u4", mode="r",
+                               offset=HEADER_SIZE + count * size, shape=(slots,))
+
+    def __len__(self):
+        return len(self.records)
+
+    def lookup(self, name):
+        """The record of model `name`, or None."""
+        key, mask, raw = name_key(name), len(self.table) - 1, name.encode()
+        s = key & mask
+        while self.table[s]:
+            rec = self.records[self.table[s] - 1]
+            if int(rec["key"]) == key and rec["name"] == raw:
+                return rec
+            s = (s + 1) & mask
+        return None
+
+    def read(self, rec):
+        """The tar members of one model, as bytes."""
+        with open(self.archive, "rb") as f:
+            f.seek(int(rec["offset"]))
+            return f.read(int(rec["size"]))
+
+    def records_for(self, names):
+        recs = []
+        for name in names:
+            rec = self.lookup(name)
+            if rec is None:
+                raise ValueError(f"{name}: not in {self.archive}")
+            recs.append(rec)
+        return recs
+
+def describe(rec):
+    """Plain dict of a record."""
+    return {
+        "name":      rec["name"].decode(),
+        "primitive": PRIMITIVES[rec["primitive"]],
+        "dims":      [round(float(v), 6) for v in rec["dims"]],
+        "mass":      None if np.isnan(rec["mass"]) else round(float(rec["mass"]), 6),
+        "files":     int(rec["files"]),
+        "offset":    int(rec["offset"]),
+        "size":      int(rec["size"]),
+        "sha256":    bytes(rec["digest"]).hex(),
+    }
+
+# --- build / extract -----------------------------------------------------------
+
+def build(root, archive, names=None):
+    """Pack the models under `root` (or just `names`); returns their count."""
+    names = names or find_models(root)
+    records = []
+    tmp = f"{archive}.tmp-{os.getpid()}"
+    with tarfile.open(tmp, "w", format=tarfile.PAX_FORMAT) as tar:
+        for name in names:
+            model_dir = os.path.join(root, name)
+            start, digest = tar.offset, hashlib.sha256()
+            files = _model_files(model_dir)
+            for rel in files:
+                path = os.path.join(model_dir, rel)
+                with open(path, "rb") as f:
+                    data = f.read()
+                digest.update(rel.encode() + b"\0" + len(data).to_bytes(8, "big") + data)
+                # a plain member even for hard links (dedup, cache restores):
+                # every model's byte range must carry its own data
+                st   = os.stat(path)
+                info = tarfile.TarInfo(f"{name}/{rel}")
+                info.size, info.mtime, info.mode = len(data), int(st.st_mtime), st.st_mode & 0o777
+                tar.addfile(info, io.BytesIO(data))
+            primitive, dims, mass = model_info(model_dir)
+            if len(name.encode()) > RECORD["name"].itemsize:
+                raise ValueError(f"{name}: model names are limited to "
+                                 f"{RECORD['name'].itemsize} bytes in the index")
+            records.append((name_key(name), start, tar.offset - start, name.encode(),
+                            PRIMITIVES.index(primitive), b"\0" * 3, len(files),
+                            dims, mass, np.frombuffer(digest.digest(), "u1")))
+    os.replace(tmp, archive)
+    write_index(index_path(archive), records, os.path.getsize(archive))
+    return len(records)
+
+def _members(index, rec):
+    # a model's members plus the end-of-archive blocks form a valid tar
+    return tarfile.open(fileobj=io.BytesIO(index.read(rec) + b"\0" * 1024))
+
+def extract(archive, names, dest, verify=False):
+    """Unpack the given models into `dest`; returns their folders."""
+    index, out = PackIndex(archive), []
+    for rec in index.records_for(names):
+        with _members(index, rec) as tar:
+            if verify:
+                digest = hashlib.sha256()
+                name = rec["name"].decode()
+                for member in sorted(tar.getmembers(), key=lambda m: m.name):
+                    data = tar.extractfile(member).read()
+                    rel = os.path.relpath(member.name, name)
+                    digest.update(rel.encode() + b"\0" + len(data).to_bytes(8, "big") + data)
+                if digest.digest() != bytes(rec["digest"]):
+                    raise ValueError(f"{name}: content hash mismatch")
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(dest, filter="data")
+            else:
+                tar.extractall(dest)
+        out.append(os.path.join(dest, rec["name"].decode()))
+    return out
+
+def subset(archive, names, out):
+    """Copy the given models' byte ranges into a new archive (+ index)."""
+    index, records = PackIndex(archive), []
+    tmp = f"{out}.tmp-{os.getpid()}"
+    with open(tmp, "wb") as f:
+        for rec in index.records_for(names):
+            new = np.array(rec, dtype=RECORD)
+            new["offset"] = f.tell()
+            f.write(index.read(rec))
+            records.append(new)
+        f.write(b"\0" * 1024)
+        pad = -f.tell() % tarfile.RECORDSIZE
+        f.write(b"\0" * pad)
+    os.replace(tmp, out)
+    write_index(index_path(out), records, os.path.getsize(out))
+    return len(records)
+
+def main():
+    p = argparse.ArgumentParser(description="Packed model-set archives with a binary index")
+    sub = p.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="Pack every model folder under ROOT")
+    b.add_argument("root")
+    b.add_argument("--output", "-o", required=True, help="Archive to write (.tar)")
+    b.add_argument("--models", nargs="+", help="Only these model folders")
+    ls = sub.add_parser("list", help="Print the index (JSON lines)")
+    ls.add_argument("archive")
+    ls.add_argument("names", nargs="*", help="Only these models (O(1) lookups)")
+    x = sub.add_parser("extract", help="Unpack some models without reading the rest")
+    x.add_argument("archive")
+    x.add_argument("names", nargs="+")
+    x.add_argument("-C", dest="dest", default=".", help="Destination folder")
+    x.add_argument("--verify", action="store_true", help="Check the content hashes")
+    s = sub.add_parser("subset", help="Write a smaller archive of some models")
+    s.add_argument("archive")
+    s.add_argument("names", nargs="+")
+    s.add_argument("--output", "-o", required=True)
+    args = p.parse_args()
+
+    try:
+        if args.command == "build":
+            n = build(args.root, args.output, args.models)
+            print(f"✅ Packed {n} models → {args.output} (+ {index_path(args.output)})")
+        elif args.command == "list":
+            index = PackIndex(args.archive)
+            recs = index.records_for(args.names) if args.names else index.records
+            for rec in recs:
+                print(json.dumps(describe(rec)))
+        elif args.command == "extract":
+            for path in extract(args.archive, args.names, args.dest, args.verify):
+                print(f"✅ {path}")
+        else:
+            n = subset(args.archive, args.names, args.output)
+            print(f"✅ {n} models → {args.output}")
+    except (ValueError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
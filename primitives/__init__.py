@@ -1,19 +1,41 @@
 # project-root/primitives/__init__.py
+#
+# Wrappers import bpy (or NumPy), so they are loaded lazily: plain-Python
+# helpers such as primitives.dimensions stay importable anywhere.
 
-from .box      import BoxWrapper
-from .cylinder import CylinderWrapper
+import importlib
+
+BACKENDS = ('blender', 'native')
 
 _FACTORIES = {
-    'box':      BoxWrapper,
-    'cylinder': CylinderWrapper,
+    'blender': {
+        'box':      ('.box',      'BoxWrapper'),
+        'cylinder': ('.cylinder', 'CylinderWrapper'),
+    },
+    'native': {
+        'box':      ('.native',   'NativeBoxWrapper'),
+        'cylinder': ('.native',   'NativeCylinderWrapper'),
+    },
 }
 
-def get_wrapper(name: str):
+def _load(backend, name):
+    module, cls = _FACTORIES[backend][name]
+    return getattr(importlib.import_module(module, __name__), cls)
+
+def __getattr__(attr):
+    for backend, factories in _FACTORIES.items():
+        for name, (_, cls) in factories.items():
+            if cls == attr:
+                return _load(backend, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
+
+def get_wrapper(name: str, session=None, backend: str = 'blender'):
     """
     Return an instance of the requested primitive wrapper.
-    Raises ValueError if unknown.
+    Raises ValueError if the primitive or backend is unknown.
     """
-    try:
-        return _FACTORIES[name]()
-    except KeyError:
-        raise ValueError(f"Unknown primitive: {name!r}")
+    if backend not in _FACTORIES:
+        raise ValueError(f"Unknown backend: {backend!r}")
+    if name not in _FACTORIES[backend]:
+        raise ValueError(f"Unknown primitive for {backend} backend: {name!r}")
+    return _load(backend, name)(session=session)
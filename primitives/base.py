@@ -1,20 +1,16 @@
 from abc import ABC, abstractmethod
 
 class PrimitiveWrapper(ABC):
-    @abstractmethod
-    def run(self, image_path: str, outdir: str):
-        """
-        Wrap `image_path` onto this primitive and export into `outdir`.
-        Must prompt for dimensions exactly as before.
-        """
-        pass
-from abc import ABC, abstractmethod
+    def __init__(self, session=None):
+        # when set, the wrapper runs inside a shared BlenderSession and must
+        # not reset factory settings itself
+        self.session = session
 
-class PrimitiveWrapper(ABC):
     @abstractmethod
-    def run(self, image_path: str, outdir: str):
+    def run(self, image_path: str, outdir: str, dims: dict = None) -> dict:
         """
         Wrap `image_path` onto this primitive and export into `outdir`.
-        Must prompt for dimensions exactly as before.
+        Dimensions missing from `dims` are prompted for exactly as before.
+        Returns a dict describing the exported texture/mesh.
         """
         pass
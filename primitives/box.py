@@ -1,55 +1,65 @@
 # project-root/primitives/box.py
 
 import os
-import shutil
 import math
 import bpy
 import bmesh
 from .base import PrimitiveWrapper
+from .fileops import place
+from .timing import StageTimer
+from .session import export_mesh, load_image, node_material, resize_shape, unit_shape
+from .dimensions import body_color, model_size, output_names, uv_offset, uv_scale
 
-def create_box(w, d, h):
-    """Create a box of size (w,d,h) in meters, centered at origin."""
-    bpy.ops.mesh.primitive_cube_add(size=1)
-    obj = bpy.context.active_object
-    obj.scale = (w/2, d/2, h/2)
-    bpy.ops.object.transform_apply(scale=True)
+def create_box(w, d, h, session=None):
+    """
+    Create a box of size (w,d,h) in meters, centered at origin
+    (in a session, variants of one image resize the same mesh).
+    """
+    # size=2: unit corners at ±1, so half-sizes give the full w×d×h box
+    obj, unit = unit_shape(session, "box",
+                           lambda: bpy.ops.mesh.primitive_cube_add(size=2))
+    resize_shape(obj, unit, (w/2, d/2, h/2))
     return obj
 
-def create_materials(obj, image_path):
+def create_materials(obj, image, dims=None, session=None):
     """Set up a default material + an image‐texture material on the box."""
+    dims = dims or {}
     # Default (uninfluenced) material
-    dm = bpy.data.materials.new("DefaultMat")
-    dm.use_nodes = True
+    dm = node_material(session, "DefaultMat")
     nodes = dm.node_tree.nodes
     links = dm.node_tree.links
-    for n in nodes: nodes.remove(n)
     bsdf = nodes.new("ShaderNodeBsdfPrincipled")
-    bsdf.inputs["Base Color"].default_value = (1,1,1,1)
+    bsdf.inputs["Base Color"].default_value = body_color(dims)
     out = nodes.new("ShaderNodeOutputMaterial")
     links.new(bsdf.outputs["BSDF"], out.inputs["Surface"])
 
     # Image material
-    im = bpy.data.materials.new("ImageMat")
-    im.use_nodes = True
+    im = node_material(session, "ImageMat")
     nodes = im.node_tree.nodes
     links = im.node_tree.links
-    for n in nodes: nodes.remove(n)
     tex = nodes.new("ShaderNodeTexImage")
-    tex.image = bpy.data.images.load(os.path.abspath(image_path))
+    tex.image = image
     bsdf2 = nodes.new("ShaderNodeBsdfPrincipled")
     out2 = nodes.new("ShaderNodeOutputMaterial")
     links.new(tex.outputs["Color"], bsdf2.inputs["Base Color"])
     links.new(bsdf2.outputs["BSDF"], out2.inputs["Surface"])
+    if dims.get("roughness") is not None:
+        for b in (bsdf, bsdf2):
+            b.inputs["Roughness"].default_value = dims["roughness"]
 
     obj.data.materials.clear()
     obj.data.materials.append(dm)
     obj.data.materials.append(im)
 
-def assign_face_materials_and_uv(obj):
+def assign_face_materials_and_uv(obj, uv_range=(1.0, 1.0), uv_shift=(0.0, 0.0)):
     """
     Assign the image material (index=1) to the face whose normal.z>0.9,
     unwrap that face to cover full image, leave others as default.
+    `uv_range` limits the unwrap to the image part of a padded texture,
+    `uv_shift` offsets it (variants).
     """
+    su, sv = uv_range
+    ou, ov = uv_shift
     # ensure UV map exists
     if not obj.data.uv_layers:
         obj.data.uv_layers.new(name="UVMap")
@@ -67,8 +77,8 @@ def assign_face_materials_and_uv(obj):
             for loop in face.loops:
                 # map vertex coords (x,y) to (u,v)
                 vert = loop.vert.co
-                u = (vert.x / obj.dimensions.x) + 0.5
-                v = (vert.y / obj.dimensions.y) + 0.5
+                u = ((vert.x / obj.dimensions.x) + 0.5) * su + ou
+                v = ((vert.y / obj.dimensions.y) + 0.5) * sv + ov
                 loop[uv_layer].uv = (u, v)
         else:
             face.material_index = 0
@@ -78,55 +88,65 @@ def assign_face_materials_and_uv(obj):
     bpy.ops.object.mode_set(mode="OBJECT")
 
 class BoxWrapper(PrimitiveWrapper):
-    def run(self, image_path: str, outdir: str):
+    def run(self, image_path: str, outdir: str, dims: dict = None):
+        dims = dims or {}
+        timer = StageTimer()
         # 1) ensure output folder exists
         os.makedirs(outdir, exist_ok=True)
 
-        # 2) load image to get aspect ratio
-        img = bpy.data.images.load(os.path.abspath(image_path))
-        width_px, height_px = img.size
-        aspect = height_px / width_px
-        print(f"Image size: {width_px} x {height_px} px → aspect Y/X = {aspect:.3f}")
-
-        # 3) prompt exactly as before
-        x_cm = float(input("Enter box width (X) in cm: ").strip())
-        z_cm = float(input("Enter box height (Z) in cm: ").strip())
-        y_cm = x_cm * aspect
-        print(f"\n→ Box dimensions:\n   Width (X): {x_cm:.2f} cm\n   Depth (Y): {y_cm:.2f} cm (auto)\n   Height(Z): {z_cm:.2f} cm")
-
-        # 4) convert to meters
-        w, d, h = x_cm/100.0, y_cm/100.0, z_cm/100.0
-
-        # 5) prepare filenames
-        def fmt(val): return str(round(val,4)).replace(".", "p")
-        dimstr = f"{fmt(w)}x{fmt(d)}x{fmt(h)}"
-        ext    = os.path.splitext(image_path)[1]
-        tex_name = f"texture_{dimstr}{ext}"
-        dae_name = f"box_{dimstr}.dae"
+        # 2) clear scene (a shared session resets between jobs), then load
+        #    the image once, as the texture
+        if self.session is None:
+            with timer.stage("read_factory_settings"):
+                bpy.ops.wm.read_factory_settings(use_empty=True)
+        with timer.stage("load_image"):
+            img = load_image(self.session, os.path.abspath(image_path))
+
+        # 3) size in meters: precomputed by main.py from the image header;
+        #    else from the image aspect and the job, prompting as before
+        #    (img.size decodes the image, so only then)
+        w, d, h = model_size("box", dims, lambda: img.size)
+        print(f"\n→ Box dimensions:\n   Width (X): {w*100:.2f} cm\n   Depth (Y): {d*100:.2f} cm\n   Height(Z): {h*100:.2f} cm")
+
+        # 4) prepare filenames
+        ext = os.path.splitext(image_path)[1]
+        tex_name, dae_name = output_names("box", (w, d, h), ext, dims.get("mesh_format"))
         tex_dest = os.path.join(outdir, tex_name)
         dae_dest = os.path.join(outdir, dae_name)
 
-        # 6) copy texture into outdir
-        shutil.copy(image_path, tex_dest)
+        # 5) place texture into outdir (copy-on-write clone where supported)
+        with timer.stage("place_texture"):
+            place(image_path, tex_dest, "reflink")
 
-        # 7) clear scene & create box
-        bpy.ops.wm.read_factory_settings(use_empty=True)
-        box = create_box(w, d, h)
+        # 6) create the box
+        with timer.stage("create_mesh"):
+            box = create_box(w, d, h, self.session)
 
-        # 8) assign materials and UV to the top face
-        create_materials(box, tex_dest)
-        assign_face_materials_and_uv(box)
+        # 7) assign materials and UV to the top face; the exported material
+        #    points at the placed texture (filepath_raw: no pixel reload)
+        img.filepath_raw = os.path.abspath(tex_dest)
+        with timer.stage("materials"):
+            create_materials(box, img, dims, self.session)
+        with timer.stage("uv"):
+            assign_face_materials_and_uv(box, uv_scale(dims), uv_offset(dims))
 
-        # 9) rotate so that the textured face is vertical
+        # 8) rotate so that the textured face is vertical
         box.rotation_euler = (math.radians(90), 0, 0)
         bpy.context.view_layer.update()
 
-        # 10) export Collada
-        bpy.ops.wm.collada_export(
-            filepath=os.path.abspath(dae_dest),
-            apply_modifiers=True,
-            export_mesh_type_selection="view",
-            selected=False
-        )
+        # 9) export the mesh (COLLADA unless --mesh-format says otherwise),
+        #    unless the shared mesh library supplies it
+        if dims.get("skip_mesh"):
+            dae_dest = None
+        else:
+            with timer.stage("mesh_export"):
+                export_mesh(os.path.abspath(dae_dest))
 
         print(f"\n✅ Exported box:\n   Texture: {tex_dest}\n   Model:   {dae_dest}")
+        return {
+            "primitive": "box",
+            "texture":   tex_dest,
+            "mesh":      dae_dest,
+            "dims":      {"width": w, "depth": d, "height": h},
+            "seconds":   timer.as_dict(),
+        }
@@ -0,0 +1,78 @@
+# primitives/camera.py
+#
+# Camera poses and pinhole projection for the render stage. No bpy imports:
+# the label records are computed from the same numbers Blender is given, and
+# the stub bpy reuses them.
+
+import math
+
+import numpy as np
+
+# elevations (degrees) the views cycle through, so N views see the top and
+# the sides of the object
+ELEVATIONS = (15.0, 35.0, 55.0)
+MARGIN     = 1.15     # bounding sphere fills 1/MARGIN of the narrower half-FOV
+LABELS     = "labels.jsonl"   # per-model view labels, concatenated by main.py
+
+def look_at_euler(location):
+    """XYZ Euler angles pointing a Blender camera (looks down -Z, +Y up) at the origin."""
+    x, y, z = location
+    return (math.atan2(math.hypot(x, y), z), 0.0, math.atan2(y, x) + math.pi / 2)
+
+def euler_matrix(location, euler):
+    """4x4 world-from-object matrix of an XYZ Euler rotation and a location."""
+    rx, ry, rz = euler
+    cx, sx, cy, sy, cz, sz = (math.cos(rx), math.sin(rx), math.cos(ry),
+                              math.sin(ry), math.cos(rz), math.sin(rz))
+    Rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    Ry = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    Rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    m = np.eye(4)
+    m[:3, :3] = Rz @ Ry @ Rx
+    m[:3, 3] = location
+    return m
+
+def view_poses(count, radius, fov, width, height, seed=0):
+    """
+    `count` (location, euler) poses on rings around the origin, far enough
+    that a sphere of `radius` fits the `fov` (radians, of the longer image
+    side); the azimuths are evenly spaced, offset by `seed`.
+    """
+    half = math.atan(math.tan(fov / 2) * min(width, height) / max(width, height))
+    dist = MARGIN * max(radius, 1e-6) / math.sin(half)
+    offset = (seed * 0.6180339887 % 1.0) * 2 * math.pi / max(count, 1)
+    poses = []
+    for k in range(count):
+        az = offset + 2 * math.pi * k / count
+        el = math.radians(ELEVATIONS[k % len(ELEVATIONS)])
+        loc = (dist * math.cos(el) * math.cos(az),
+               dist * math.cos(el) * math.sin(az),
+               dist * math.sin(el))
+        poses.append((loc, look_at_euler(loc)))
+    return poses
+
+def intrinsics(fov, width, height):
+    """3x3 pinhole K for Blender's AUTO sensor fit (`fov` spans the longer side)."""
+    f = max(width, height) / 2 / math.tan(fov / 2)
+    return np.array([[f, 0.0, width / 2], [0.0, f, height / 2], [0.0, 0.0, 1.0]])
+
+def project(points, world_from_camera, K):
+    """Pixel (u, v) of world `points` (N x 3), v down; None rows behind the camera."""
+    pts = np.asarray(points, dtype=float)
+    cam = (np.linalg.inv(world_from_camera) @ np.c_[pts, np.ones(len(pts))].T)[:3].T
+    depth = -cam[:, 2]                      # the camera looks down its -Z
+    front = depth > 1e-9
+    u = K[0, 2] + K[0, 0] * cam[front, 0] / depth[front]
+    v = K[1, 2] - K[1, 1] * cam[front, 1] / depth[front]
+    return np.c_[u, v]
+
+def bbox_2d(points, world_from_camera, K, width, height):
+    """[x0, y0, x1, y1] pixel box of the projected `points`, clipped; None if off-image."""
+    uv = project(points, world_from_camera, K)
+    if not len(uv):
+        return None
+    x0, y0 = np.clip(uv.min(axis=0), 0, (width, height))
+    x1, y1 = np.clip(uv.max(axis=0), 0, (width, height))
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return [round(float(c), 2) for c in (x0, y0, x1, y1)]
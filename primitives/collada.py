@@ -0,0 +1,123 @@
+# primitives/collada.py
+#
+# Minimal COLLADA 1.4.1 writer for MeshData, laid out like Blender's
+# exporter: DefaultMat (white, or a variant's body colour) and ImageMat (textured) materials bound to
+# one mesh node carrying the object transform.
+
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .geometry import DEFAULT_MAT, IMAGE_MAT
+
+def _floats(arr):
+    return " ".join(np.format_float_positional(v, precision=6, trim="-")
+                    for v in np.asarray(arr, dtype=float).ravel())
+
+def _ints(arr):
+    return " ".join(map(str, np.asarray(arr).ravel().tolist()))
+
+def _source(sid, arr, params):
+    arr = np.asarray(arr)
+    return (
+        f'<source id="{sid}"><float_array id="{sid}-array" count="{arr.size}">'
+        f'{_floats(arr)}</float_array><technique_common>'
+        f'<accessor source="#{sid}-array" count="{len(arr)}" stride="{len(params)}">'
+        + "".join(f'<param name="{p}" type="float"/>' for p in params)
+        + "</accessor></technique_common></source>"
+    )
+
+def _polylist(mesh, geo, mat_index, mat_name, normals_idx):
+    faces = np.flatnonzero(mesh.materials == mat_index)
+    if not len(faces):
+        return ""
+    starts = np.cumsum(mesh.face_sizes) - mesh.face_sizes
+    corners = np.concatenate([
+        np.arange(starts[f], starts[f] + mesh.face_sizes[f]) for f in faces
+    ])
+    # per corner: VERTEX, NORMAL, TEXCOORD
+    p = np.stack([mesh.loops[corners], normals_idx[corners], corners], axis=1)
+    return (
+        f'<polylist material="{mat_name}-material" count="{len(faces)}">'
+        f'<input semantic="VERTEX" source="#{geo}-vertices" offset="0"/>'
+        f'<input semantic="NORMAL" source="#{geo}-normals" offset="1"/>'
+        f'<input semantic="TEXCOORD" source="#{geo}-map-0" offset="2" set="0"/>'
+        f'<vcount>{_ints(mesh.face_sizes[faces])}</vcount>'
+        f'<p>{_ints(p)}</p></polylist>'
+    )
+
+def _color_effect(name, rgba):
+    return (
+        f'<effect id="{name}-effect"><profile_COMMON><technique sid="common">'
+        f'<lambert><diffuse><color sid="diffuse">{_floats(np.asarray(rgba))}</color>'
+        '</diffuse></lambert></technique></profile_COMMON></effect>'
+    )
+
+def write_dae(mesh, path, texture_filename=None):
+    """
+    Write `mesh` to `path`, texturing ImageMat faces with `texture_filename`
+    (white like DefaultMat without one: the texture is bound elsewhere).
+    """
+    geo = f"{mesh.name}-mesh"
+    normals_idx = np.repeat(np.arange(len(mesh.face_sizes)), mesh.face_sizes)
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+    effect_default = _color_effect("DefaultMat", mesh.body_color)
+    images = ""
+    if texture_filename is None:
+        effect_image = _color_effect("ImageMat", (1, 1, 1, 1))
+    else:
+        img = os.path.basename(texture_filename).replace(".", "_")
+        effect_image = (
+            f'<effect id="ImageMat-effect"><profile_COMMON>'
+            f'<newparam sid="{img}-surface"><surface type="2D">'
+            f'<init_from>{img}</init_from></surface></newparam>'
+            f'<newparam sid="{img}-sampler"><sampler2D>'
+            f'<source>{img}-surface</source></sampler2D></newparam>'
+            f'<technique sid="common"><lambert><diffuse>'
+            f'<texture texture="{img}-sampler" texcoord="UVMap"/>'
+            f'</diffuse></lambert></technique></profile_COMMON></effect>'
+        )
+        images = (
+            f'<library_images><image id="{img}" name="{img}">'
+            f'<init_from>{os.path.basename(texture_filename)}</init_from></image></library_images>'
+        )
+    bind = "".join(
+        f'<instance_material symbol="{m}-material" target="#{m}-material">'
+        f'<bind_vertex_input semantic="UVMap" input_semantic="TEXCOORD" input_set="0"/>'
+        f'</instance_material>'
+        for m in ("DefaultMat", "ImageMat")
+    )
+    xml = (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<COLLADA xmlns="http://www.collada.org/2005/11/COLLADASchema" version="1.4.1">'
+        f'<asset><contributor><authoring_tool>synthetic_blender_3Ddatagen native'
+        f'</authoring_tool></contributor><created>{now}</created>'
+        f'<modified>{now}</modified><unit name="meter" meter="1"/>'
+        f'<up_axis>Z_UP</up_axis></asset>'
+        f'<library_effects>{effect_default}{effect_image}</library_effects>'
+        f'{images}'
+        '<library_materials>'
+        '<material id="DefaultMat-material" name="DefaultMat"><instance_effect url="#DefaultMat-effect"/></material>'
+        '<material id="ImageMat-material" name="ImageMat"><instance_effect url="#ImageMat-effect"/></material>'
+        '</library_materials>'
+        f'<library_geometries><geometry id="{geo}" name="{mesh.name}"><mesh>'
+        + _source(f"{geo}-positions", mesh.positions, "XYZ")
+        + _source(f"{geo}-normals", mesh.normals, "XYZ")
+        + _source(f"{geo}-map-0", mesh.uvs, "ST")
+        + f'<vertices id="{geo}-vertices"><input semantic="POSITION" source="#{geo}-positions"/></vertices>'
+        + _polylist(mesh, geo, DEFAULT_MAT, "DefaultMat", normals_idx)
+        + _polylist(mesh, geo, IMAGE_MAT, "ImageMat", normals_idx)
+        + '</mesh></geometry></library_geometries>'
+        f'<library_visual_scenes><visual_scene id="Scene" name="Scene">'
+        f'<node id="{mesh.name}" name="{mesh.name}" type="NODE">'
+        f'<matrix sid="transform">{_floats(mesh.matrix)}</matrix>'
+        f'<instance_geometry url="#{geo}" name="{mesh.name}"><bind_material>'
+        f'<technique_common>{bind}</technique_common></bind_material>'
+        f'</instance_geometry></node></visual_scene></library_visual_scenes>'
+        '<scene><instance_visual_scene url="#Scene"/></scene>'
+        '</COLLADA>\n'
+    )
+    with open(path, "w") as f:
+        f.write(xml)
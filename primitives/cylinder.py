@@ -1,100 +1,145 @@
 # primitives/cylinder.py
 
-import os, math, shutil, bpy, bmesh
+import os, math, bpy, bmesh
 from .base import PrimitiveWrapper
+from .fileops import place
+from .timing import StageTimer
+from .session import export_mesh, load_image, node_material, resize_shape, unit_shape
+from .dimensions import (body_color, cylinder_segments, lod_name, mesh_dims,
+                         model_size, output_names, uv_offset, uv_scale)
+
+def unwrap_side(obj, H, scale, offset):
+    """ImageMat + cylindrical UVs on the side faces, DefaultMat on the caps."""
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode="EDIT")
+    bm = bmesh.from_edit_mesh(obj.data)
+    uv_layer = bm.loops.layers.uv.verify()
+    su, sv = scale      # image part of a padded texture
+    ou, ov = offset     # variant texture offset
+
+    # Side faces: normals roughly horizontal
+    for face in bm.faces:
+        if abs(face.normal.z) < 0.9:
+            face.material_index = 1
+            for loop in face.loops:
+                co = loop.vert.co
+                # U = normalized angle around Z
+                angle = math.atan2(co.y, co.x)
+                u = (angle / (2*math.pi)) + 0.5
+                # V = normalized height
+                v = (co.z / H) + 0.5
+                loop[uv_layer].uv = (u * su + ou, v * sv + ov)
+        else:
+            face.material_index = 0
+
+    bmesh.update_edit_mesh(obj.data)
+    bpy.ops.object.mode_set(mode="OBJECT")
 
 class CylinderWrapper(PrimitiveWrapper):
-    def run(self, image_path: str, outdir: str):
+    def run(self, image_path: str, outdir: str, dims: dict = None):
+        dims = dims or {}
+        timer = StageTimer()
         # 1) Setup output dir
         os.makedirs(outdir, exist_ok=True)
 
-        # 2) Load image & get aspect ratio W/H
-        img = bpy.data.images.load(os.path.abspath(image_path))
-        w_px, h_px = img.size
-        ratio = w_px / h_px
-        print(f"Image size: {w_px}×{h_px}px → aspect W/H = {ratio:.3f}")
+        # 2) Clear scene (a shared session resets between jobs), then load the
+        #    image once, as the texture
+        if self.session is None:
+            with timer.stage("read_factory_settings"):
+                bpy.ops.wm.read_factory_settings(use_empty=True)
+        with timer.stage("load_image"):
+            img = load_image(self.session, os.path.abspath(image_path))
 
-        # 3) Prompt for height (cm), then compute circumference → radius
-        H_cm = float(input("Enter cylinder height (H) in cm: ").strip())
-        C_cm = H_cm * ratio
-        R_cm = C_cm / (2 * math.pi)
-        print(f"→ Height: {H_cm:.2f}cm, Circumference: {C_cm:.2f}cm → Radius: {R_cm:.2f}cm")
+        # 3) Radius/height in meters: precomputed by main.py from the image
+        #    header; else height from the job or a prompt, circumference from
+        #    the aspect W/H (img.size decodes the image, so only then)
+        R, H = model_size("cylinder", dims, lambda: img.size)
+        print(f"→ Height: {H*100:.2f}cm, Circumference: {2*math.pi*R*100:.2f}cm → Radius: {R*100:.2f}cm")
 
-        # 4) Convert to meters
-        H = H_cm / 100.0
-        R = R_cm / 100.0
-
-        # 5) Filenames
-        def fmt(x): return str(round(x,4)).replace('.', 'p')
-        dim = f"{fmt(R)}x{fmt(H)}"
+        # 4) Filenames
         ext = os.path.splitext(image_path)[1]
-        tex_fn = f"texture_{dim}{ext}"
-        dae_fn = f"cylinder_{dim}.dae"
+        tex_fn, dae_fn = output_names("cylinder", (R, H), ext, dims.get("mesh_format"))
         tex_dst = os.path.join(outdir, tex_fn)
         dae_dst = os.path.join(outdir, dae_fn)
-        shutil.copy(image_path, tex_dst)
+        with timer.stage("place_texture"):
+            place(image_path, tex_dst, "reflink")
 
-        # 6) Clear scene & create cylinder
-        bpy.ops.wm.read_factory_settings(use_empty=True)
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=R, depth=H, vertices=64, enter_editmode=False
-        )
-        obj = bpy.context.active_object
+        # 5) Create the cylinder (in a session, variants of one image resize
+        #    the same mesh); side segments from the chordal tolerance, if any
+        segments, lod_segments = cylinder_segments(R, dims)
+        with timer.stage("create_mesh"):
+            obj, unit = unit_shape(self.session, f"cylinder{segments}", lambda: bpy.ops.mesh.primitive_cylinder_add(
+                radius=1, depth=1, vertices=segments, enter_editmode=False
+            ))
+            resize_shape(obj, unit, (R, R, H))
 
-        # 7) Create Default + Image materials
+        # 6) Create Default + Image materials; the exported image points at
+        #    the placed texture (filepath_raw: no pixel reload)
+        img.filepath_raw = os.path.abspath(tex_dst)
         def make_mat(name, use_tex=False):
-            m = bpy.data.materials.new(name)
-            m.use_nodes = True
+            m = node_material(self.session, name)
             nodes = m.node_tree.nodes; links = m.node_tree.links
-            for n in nodes: nodes.remove(n)
             bsdf = nodes.new("ShaderNodeBsdfPrincipled")
             out = nodes.new("ShaderNodeOutputMaterial")
             if use_tex:
                 tex = nodes.new("ShaderNodeTexImage")
-                tex.image = bpy.data.images.load(tex_dst)
+                tex.image = img
                 tex.extension = 'CLIP'
                 links.new(tex.outputs["Color"], bsdf.inputs["Base Color"])
             else:
-                bsdf.inputs["Base Color"].default_value = (1,1,1,1)
+                bsdf.inputs["Base Color"].default_value = body_color(dims)
+            if dims.get("roughness") is not None:
+                bsdf.inputs["Roughness"].default_value = dims["roughness"]
             links.new(bsdf.outputs["BSDF"], out.inputs["Surface"])
             return m
 
-        m_def = make_mat("DefaultMat", use_tex=False)
-        m_img = make_mat("ImageMat",   use_tex=True)
-        obj.data.materials.clear()
-        obj.data.materials.append(m_def)
-        obj.data.materials.append(m_img)
-
-        # 8) Manual UV unwrap of side faces
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.mode_set(mode="EDIT")
-        bm = bmesh.from_edit_mesh(obj.data)
-        uv_layer = bm.loops.layers.uv.verify()
+        with timer.stage("materials"):
+            m_def = make_mat("DefaultMat", use_tex=False)
+            m_img = make_mat("ImageMat",   use_tex=True)
+            obj.data.materials.clear()
+            obj.data.materials.append(m_def)
+            obj.data.materials.append(m_img)
 
-        # Side faces: normals roughly horizontal
-        for face in bm.faces:
-            if abs(face.normal.z) < 0.9:
-                face.material_index = 1
-                for loop in face.loops:
-                    co = loop.vert.co
-                    # U = normalized angle around Z
-                    angle = math.atan2(co.y, co.x)
-                    u = (angle / (2*math.pi)) + 0.5
-                    # V = normalized height
-                    v = (co.z / H) + 0.5
-                    loop[uv_layer].uv = (u, v)
-            else:
-                face.material_index = 0
+        # 7) Manual UV unwrap of side faces
+        with timer.stage("uv"):
+            unwrap_side(obj, H, uv_scale(dims), uv_offset(dims))
 
-        bmesh.update_edit_mesh(obj.data)
-        bpy.ops.object.mode_set(mode="OBJECT")
+        # 8) Export the mesh (COLLADA unless --mesh-format says otherwise),
+        #    unless the shared mesh library supplies it (no LODs then either)
+        if dims.get("skip_mesh"):
+            dae_dst, lod_segments = None, []
+        else:
+            with timer.stage("mesh_export"):
+                export_mesh(os.path.abspath(dae_dst))
 
-        # 9) Export as COLLADA
-        bpy.ops.wm.collada_export(
-            filepath=os.path.abspath(dae_dst),
-            apply_modifiers=True,
-            export_mesh_type_selection="view",
-            selected=False
-        )
+        # 9) Coarser LODs: a throwaway cylinder each, exported on its own
+        lods = []
+        for level, n in enumerate(lod_segments, start=1):
+            with timer.stage("lods"):
+                bpy.ops.mesh.primitive_cylinder_add(
+                    radius=R, depth=H, vertices=n, enter_editmode=False
+                )
+                lod = bpy.context.active_object
+                lod.data.materials.append(m_def)
+                lod.data.materials.append(m_img)
+                unwrap_side(lod, H, uv_scale(dims), uv_offset(dims))
+                bpy.ops.object.select_all(action="DESELECT")
+                lod.select_set(True)
+                path = lod_name(dae_dst, level)
+                export_mesh(os.path.abspath(path), selected=True)
+                mesh = lod.data
+                bpy.data.objects.remove(lod, do_unlink=True)
+                bpy.data.meshes.remove(mesh)
+                lods.append(path)
 
         print(f"\n✅ Exported cylinder:\n   Texture: {tex_dst}\n   Model:   {dae_dst}")
+        for path in lods:
+            print(f"   LOD:     {path}")
+        return {
+            "primitive": "cylinder",
+            "texture":   tex_dst,
+            "mesh":      dae_dst,
+            "lods":      lods,
+            "dims":      mesh_dims("cylinder", (R, H), dims),
+            "seconds":   timer.as_dict(),
+        }
@@ -0,0 +1,351 @@
+# primitives/dimensions.py
+#
+# Plain-Python dimension handling shared by main.py (outside Blender) and
+# the wrappers (inside Blender). No bpy imports here.
+
+import argparse
+import csv
+import json
+import math
+import os
+
+# keys a dimension spec may carry; lengths are in cm
+DIM_KEYS = ("width_cm", "depth_cm", "height_cm", "radius_cm")
+
+# "image": derive the free side from the image aspect ratio (default)
+# "free":  use the given sizes as-is and stretch the texture
+# any number: derive the free side from that fixed aspect ratio instead
+ASPECT_RULES = ("image", "free")
+
+# set by the texture stage in main.py when it resizes/pads the image: the
+# original pixel size (for the aspect ratio) and the UV range the image
+# content occupies in the texture
+TEXTURE_KEYS = ("image_px", "uv_scale")
+
+# set per variant by main.py --variants: size factors on the resolved
+# dimensions, the colour/roughness of the non-image faces and a texture
+# scale/offset on top of uv_scale
+VARIANT_KEYS = ("jitter", "body_color", "roughness", "uv_tile", "uv_offset")
+
+# mesh output: file format, cylinder side segments from a chordal
+# tolerance in mm (64 without one), the number of coarser LOD meshes, and
+# skip_mesh (set by main.py with --mesh-library, which supplies the mesh)
+MESH_KEYS = ("mesh_format", "chord_tol_mm", "lods", "skip_mesh")
+MESH_FORMATS = ("dae", "glb", "obj")
+DEFAULT_SEGMENTS = 64
+MIN_SEGMENTS     = 8
+MAX_SEGMENTS     = 512
+
+# set by main.py before any wrapping: the model size in meters, box
+# [width, depth, height] or cylinder [radius, length], from the image header
+PLAN_KEYS = ("size_m",)
+
+def ask(spec, key, label):
+    """Return spec[key] as float, prompting as before when it is missing."""
+    val = spec.get(key)
+    if val is None:
+        try:
+            val = input(f"Enter {label} in cm: ").strip()
+        except EOFError:
+            raise ValueError(f"No {key} given and no interactive input available")
+    return float(val)
+
+def _ratio(rule, image_ratio):
+    return image_ratio if rule == "image" else float(rule)
+
+def box_dims(aspect_yx, spec):
+    """
+    Resolve box (X, Y, Z) in cm from `spec`.
+    `aspect_yx` is the image height/width ratio used for the auto depth.
+    """
+    rule = spec.get("aspect", "image")
+    if rule == "free":
+        x = ask(spec, "width_cm",  "box width (X)")
+        y = ask(spec, "depth_cm",  "box depth (Y)")
+    else:
+        ratio = _ratio(rule, aspect_yx)
+        if spec.get("width_cm") is None and spec.get("depth_cm") is not None:
+            x = float(spec["depth_cm"]) / ratio
+        else:
+            x = ask(spec, "width_cm", "box width (X)")
+        y = x * ratio
+    fx, fy, fz = spec.get("jitter") or (1.0, 1.0, 1.0)
+    z = ask(spec, "height_cm", "box height (Z)") * fz
+    # a derived depth follows the jittered width, keeping the image undistorted
+    return x * fx, y * (fy if rule == "free" else fx), z
+
+def cylinder_dims(ratio_wh, spec):
+    """
+    Resolve cylinder (height, radius) in cm from `spec`.
+    `ratio_wh` is the image width/height ratio; the image wraps the full
+    circumference.
+    """
+    rule = spec.get("aspect", "image")
+    fr, _, fh = spec.get("jitter") or (1.0, 1.0, 1.0)
+    if rule == "free":
+        H = ask(spec, "height_cm", "cylinder height (H)")
+        R = ask(spec, "radius_cm", "cylinder radius (R)")
+        return H * fh, R * fr
+    ratio = _ratio(rule, ratio_wh)
+    if spec.get("height_cm") is None and spec.get("radius_cm") is not None:
+        H = 2 * math.pi * float(spec["radius_cm"]) / ratio
+    else:
+        H = ask(spec, "height_cm", "cylinder height (H)")
+    H *= fh
+    return H, H * ratio / (2 * math.pi)
+
+def model_size(primitive, spec, probe):
+    """
+    Model size in meters: box (width, depth, height), cylinder (radius,
+    length). Uses spec["size_m"] when main.py precomputed it, else the
+    image size from `probe()` and the spec (prompting for missing sides).
+    """
+    if spec.get("size_m"):
+        size = tuple(float(v) for v in spec["size_m"])
+        if len(size) != {"box": 3, "cylinder": 2}.get(primitive, len(size)):
+            raise ValueError(f"size_m {list(size)} does not fit a {primitive}")
+        return size
+    w_px, h_px = source_size(spec, probe())
+    print(f"Image size: {w_px} x {h_px} px")
+    if primitive == "box":
+        return tuple(v / 100.0 for v in box_dims(h_px / w_px, spec))
+    if primitive == "cylinder":
+        H, R = cylinder_dims(w_px / h_px, spec)
+        return R / 100.0, H / 100.0
+    raise ValueError(f"Unknown primitive: {primitive!r}")
+
+def output_names(primitive, size_m, ext, mesh_format=None):
+    """(texture, mesh) file names of a model; `ext` is the image's."""
+    token = dim_string(*size_m)
+    return f"texture_{token}{ext}", f"{primitive}_{token}.{mesh_format or 'dae'}"
+
+def lod_name(mesh_path, level):
+    """'cylinder_<R>x<H>.<fmt>' -> 'cylinder_<R>x<H>_lod<level>.<fmt>'."""
+    stem, ext = os.path.splitext(mesh_path)
+    return f"{stem}_lod{level}{ext}"
+
+def chord_segments(radius, tolerance):
+    """
+    Fewest side segments keeping the chord within `tolerance` of a circle
+    of `radius` (same unit): the sagitta R·(1 − cos(π/n)) ≤ tolerance.
+    """
+    if tolerance <= 0:
+        raise ValueError(f"chord_tol_mm must be > 0, got {tolerance}")
+    if tolerance >= radius:
+        return MIN_SEGMENTS
+    n = math.ceil(math.pi / math.acos(1.0 - tolerance / radius))
+    return max(MIN_SEGMENTS, min(MAX_SEGMENTS, n))
+
+def cylinder_segments(radius_m, spec):
+    """
+    (segments, [LOD segments]) for a cylinder of `radius_m`: from the
+    spec's chord_tol_mm (DEFAULT_SEGMENTS without one), then `lods` coarser
+    levels, each halving the segments down to MIN_SEGMENTS.
+    """
+    tol = spec.get("chord_tol_mm")
+    n = DEFAULT_SEGMENTS if tol is None else chord_segments(radius_m * 1000.0, float(tol))
+    levels, m = [], n
+    for _ in range(int(spec.get("lods") or 0)):
+        m = max(MIN_SEGMENTS, m // 2)
+        if m == (levels[-1] if levels else n):
+            break
+        levels.append(m)
+    return n, levels
+
+def mesh_dims(primitive, size_m, spec=None):
+    """Wrapper result dims in meters: {width, depth, height} or {radius, length, segments}."""
+    if primitive == "box":
+        return dict(zip(("width", "depth", "height"), size_m))
+    R, H = size_m
+    return {"radius": R, "length": H, "segments": cylinder_segments(R, spec or {})[0]}
+
+def source_size(spec, size):
+    """(width_px, height_px) of the source image, preferring spec["image_px"]."""
+    return tuple(spec.get("image_px") or size)
+
+def uv_scale(spec):
+    """UV range of the image: a padded texture's content, times any variant tiling."""
+    su, sv = spec.get("uv_scale") or (1.0, 1.0)
+    tu, tv = spec.get("uv_tile") or (1.0, 1.0)
+    return (su * tu, sv * tv)
+
+def uv_offset(spec):
+    return tuple(spec.get("uv_offset") or (0.0, 0.0))
+
+def body_color(spec):
+    """RGBA of the faces without the image (white unless a variant sets it)."""
+    return tuple(spec.get("body_color") or (1.0, 1.0, 1.0, 1.0))
+
+def fmt(val):
+    """Format a size in meters for file names: 0.105 -> '0p105'."""
+    return str(round(val, 4)).replace(".", "p")
+
+def dim_string(*vals):
+    """'<a>x<b>x...' naming token shared by every backend."""
+    return "x".join(fmt(v) for v in vals)
+
+# --- manifests -------------------------------------------------------------
+
+def _clean(entry):
+    """Drop empty cells and convert numeric fields."""
+    out = {}
+    for k, v in entry.items():
+        if v is None or v == "":
+            continue
+        if k in DIM_KEYS or k == "chord_tol_mm":
+            v = float(v)
+        elif k == "lods":
+            v = int(v)
+        elif k == "mesh_format" and v not in MESH_FORMATS:
+            raise ValueError(f"mesh_format must be one of {', '.join(MESH_FORMATS)}: {v!r}")
+        elif k == "aspect" and v not in ASPECT_RULES:
+            v = float(v)
+        out[k] = v
+    return out
+
+def load_manifest(path):
+    """
+    Load a dimension manifest (.csv, .yaml/.yml, .jsonl or .json).
+
+    Rows are keyed by `image` (file name or stem). An `image` of "*"
+    gives defaults, optionally restricted by a `primitive` column. YAML
+    files may instead use {defaults: {<primitive>|"*": {...}}, images:
+    {<name>: {...}}}.
+    Returns {"defaults": {primitive|"*": spec}, "images": {name: spec}}.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, newline="") as f:
+        if ext == ".csv":
+            rows = list(csv.DictReader(f))
+        elif ext in (".yaml", ".yml"):
+            import yaml
+            data = yaml.safe_load(f) or {}
+            if isinstance(data, dict) and ("images" in data or "defaults" in data):
+                rows = [dict(spec or {}, image="*", primitive=prim)
+                        for prim, spec in (data.get("defaults") or {}).items()]
+                rows += [dict(spec or {}, image=name)
+                         for name, spec in (data.get("images") or {}).items()]
+            else:
+                rows = data
+        elif ext == ".json":
+            rows = json.load(f)
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    manifest = {"defaults": {}, "images": {}}
+    for row in rows:
+        row = _clean(row)
+        name = row.pop("image", None)
+        if name is None:
+            raise ValueError(f"{path}: manifest entry without 'image': {row}")
+        if name == "*":
+            manifest["defaults"][row.pop("primitive", "*")] = row
+        else:
+            manifest["images"][name] = row
+    return manifest
+
+def lookup(manifest, image_path):
+    """Return the per-image manifest entry for `image_path` (or {})."""
+    if not manifest:
+        return {}
+    base = os.path.basename(image_path)
+    images = manifest["images"]
+    return images.get(base) or images.get(os.path.splitext(base)[0]) or {}
+
+def resolve(image_path, primitive, cli_spec=None, manifest=None):
+    """
+    Merge dimension sources for one image, lowest to highest priority:
+    manifest "*" defaults, manifest per-primitive defaults, CLI flags,
+    manifest per-image entry.
+    Returns (primitive, spec); the entry may override the primitive.
+    """
+    entry = lookup(manifest, image_path)
+    primitive = entry.get("primitive", primitive)
+    spec = {}
+    if manifest:
+        spec.update(manifest["defaults"].get("*", {}))
+        spec.update(manifest["defaults"].get(primitive, {}))
+    spec.update({k: v for k, v in (cli_spec or {}).items() if v is not None})
+    spec.update({k: v for k, v in entry.items() if k != "primitive"})
+    return primitive, spec
+
+def cli_overrides(manifest, cli_spec):
+    """
+    {key: [image names]} of the CLI values that per-image manifest rows
+    replace (the rows take priority; main.py warns about these).
+    """
+    out = {}
+    for name, entry in (manifest or {}).get("images", {}).items():
+        for key, val in entry.items():
+            if key in (cli_spec or {}) and val != cli_spec[key]:
+                out.setdefault(key, []).append(name)
+    return out
+
+# --- CLI -------------------------------------------------------------------
+
+def positive_float(text):
+    """A float > 0 (an argparse type)."""
+    try:
+        val = float(text)
+    except ValueError:
+        val = None
+    if val is None or not val > 0:
+        raise argparse.ArgumentTypeError(f"wants a number > 0, got {text!r}")
+    return val
+
+def add_dim_args(p, texture_hints=False):
+    """
+    Add the shared dimension flags to an argparse parser; `texture_hints`
+    adds the flags main.py passes on after its texture stage.
+    """
+    p.add_argument("--width-cm",  type=float, help="Box width (X) in cm")
+    p.add_argument("--depth-cm",  type=float, help="Box depth (Y) in cm (with --aspect free)")
+    p.add_argument("--height-cm", type=float, help="Box/cylinder height in cm")
+    p.add_argument("--radius-cm", type=float, help="Cylinder radius in cm")
+    p.add_argument("--aspect",
+        help="Aspect rule: 'image' (derive from image, default), "
+             "'free' (use sizes as given) or a fixed ratio")
+    p.add_argument("--mesh-format", choices=MESH_FORMATS,
+        help="Mesh file format: dae (COLLADA, default), glb (binary glTF, "
+             "texture embedded) or obj (+ .mtl)")
+    p.add_argument("--chord-tol-mm", type=positive_float,
+        help="Cylinder segments from this chordal error in mm "
+             f"(default: {DEFAULT_SEGMENTS} segments at any radius)")
+    p.add_argument("--lods", type=int,
+        help="Also export this many coarser cylinder meshes (halving the segments)")
+    if not texture_hints:
+        return
+    p.add_argument("--image-px", type=int, nargs=2, metavar=("W", "H"),
+        help="Source image size when the texture was resized (set by main.py)")
+    p.add_argument("--uv-scale", type=float, nargs=2, metavar=("U", "V"),
+        help="UV range of the image inside a padded texture (set by main.py)")
+    p.add_argument("--size-m", type=float, nargs="+", metavar="M",
+        help="Precomputed model size in meters: box W D H, cylinder R L "
+             "(set by main.py)")
+    p.add_argument("--skip-mesh", action="store_true", default=None,
+        help="Place the texture but export no mesh; the shared mesh library "
+             "supplies it (set by main.py)")
+
+def dims_from_args(args):
+    spec = {k: getattr(args, k, None)
+            for k in DIM_KEYS + MESH_KEYS + TEXTURE_KEYS + PLAN_KEYS}
+    if args.aspect is not None:
+        spec["aspect"] = _clean({"aspect": args.aspect})["aspect"]
+    return {k: v for k, v in spec.items() if v is not None}
+
+# spec keys wrap_image_box.py has flags for; other manifest columns
+# (notes, variant parameters) stay on this side
+ARGV_KEYS = DIM_KEYS + ("aspect",) + MESH_KEYS + TEXTURE_KEYS + PLAN_KEYS
+
+def dims_to_argv(spec):
+    """Turn a spec back into CLI flags (for passing on to wrap_image_box.py)."""
+    argv = []
+    for k, v in spec.items():
+        if k not in ARGV_KEYS or v is False:
+            continue
+        if v is True:
+            argv.append("--" + k.replace("_", "-"))
+            continue
+        vals = v if isinstance(v, (list, tuple)) else [v]
+        argv += ["--" + k.replace("_", "-")] + [str(x) for x in vals]
+    return argv
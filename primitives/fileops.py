@@ -0,0 +1,95 @@
+# primitives/fileops.py
+#
+# Copy-free file placement shared by the wrappers, the SDF generator and
+# the result cache: reflink/hardlink/move with a plain copy as fallback,
+# and content-addressed texture dedup. No bpy imports here.
+
+import hashlib
+import os
+import shutil
+
+PLACEMENTS = ("copy", "reflink", "link", "move")
+
+# linux/fs.h: clone a whole file (btrfs, XFS, bcachefs, overlay on those)
+_FICLONE = 0x40049409
+
+def reflink(src, dst):
+    """Copy-on-write clone of `src`; falls back to a copy where unsupported."""
+    try:
+        import fcntl
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        shutil.copymode(src, dst)
+    except (ImportError, OSError):
+        shutil.copy(src, dst)
+
+def link_or_copy(src, dst):
+    """Hard-link `src` to `dst`, copying across devices."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def place(src, dst, mode="copy"):
+    """
+    Put `src` at `dst` with the given placement mode. A file already at
+    `dst` is unlinked first (never overwritten in place, so a hard-linked
+    copy elsewhere stays intact); `src == dst` is a no-op.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return dst
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if mode == "move":
+        shutil.move(src, dst)
+    elif mode == "link":
+        link_or_copy(src, dst)
+    elif mode == "reflink":
+        reflink(src, dst)
+    elif mode == "copy":
+        shutil.copy(src, dst)
+    else:
+        raise ValueError(f"Unknown placement mode: {mode!r}")
+    return dst
+
+def replace_tree(src, dst):
+    """Rename folder `src` to `dst`, replacing whatever `dst` held."""
+    old = f"{dst}.old-{os.getpid()}"
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.lexists(dst):
+        os.rename(dst, old)
+    os.rename(src, dst)
+    shutil.rmtree(old, ignore_errors=True)
+    return dst
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def dedup(path, store):
+    """
+    Replace `path` by a hard link to the single stored copy of its content
+    in `store` (the first file with that content becomes the stored copy).
+    Returns True when `path` now shares storage; False across devices.
+    """
+    os.makedirs(store, exist_ok=True)
+    ext    = os.path.splitext(path)[1].lower()
+    stored = os.path.join(store, file_digest(path) + ext)
+    try:
+        if not os.path.exists(stored):
+            try:
+                os.link(path, stored)
+                return True
+            except FileExistsError:
+                pass                    # stored concurrently by another worker
+        if os.path.samefile(path, stored):
+            return True
+        tmp = f"{path}.dedup-{os.getpid()}"
+        os.link(stored, tmp)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,150 @@
+# primitives/geometry.py
+#
+# Analytic box/cylinder meshes built with NumPy, matching what the Blender
+# wrappers produce (same vertices, UVs and DefaultMat/ImageMat face split).
+
+import hashlib
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+# material slots, as in the Blender wrappers
+DEFAULT_MAT = 0
+IMAGE_MAT   = 1
+
+@dataclass
+class MeshData:
+    """Polygon mesh with per-loop UVs and per-face material/normal."""
+    name:       str
+    positions:  np.ndarray      # (V, 3) float
+    face_sizes: np.ndarray      # (F,)   int, corners per face
+    loops:      np.ndarray      # (sum(face_sizes),) vertex index per corner
+    uvs:        np.ndarray      # (sum(face_sizes), 2) float, per corner
+    materials:  np.ndarray      # (F,)   int, DEFAULT_MAT / IMAGE_MAT
+    matrix:     np.ndarray      # (4, 4) object transform
+    body_color: tuple = (1.0, 1.0, 1.0, 1.0)   # DefaultMat RGBA
+
+    @property
+    def normals(self):
+        """Flat per-face normals (Newell's method)."""
+        p = self.positions[self.loops]
+        face = np.repeat(np.arange(len(self.face_sizes)), self.face_sizes)
+        starts = np.cumsum(self.face_sizes) - self.face_sizes
+        nxt = np.arange(len(self.loops)) + 1
+        last = starts + self.face_sizes - 1
+        nxt[last] = starts
+        q = p[nxt]
+        cross = np.stack([
+            (p[:, 1] - q[:, 1]) * (p[:, 2] + q[:, 2]),
+            (p[:, 2] - q[:, 2]) * (p[:, 0] + q[:, 0]),
+            (p[:, 0] - q[:, 0]) * (p[:, 1] + q[:, 1]),
+        ], axis=1)
+        n = np.zeros((len(self.face_sizes), 3))
+        np.add.at(n, face, cross)
+        return n / np.linalg.norm(n, axis=1, keepdims=True)
+
+    def subset(self, material):
+        """The faces using `material` only, with unused vertices dropped."""
+        keep   = self.materials == material
+        corner = np.repeat(keep, self.face_sizes)
+        used   = np.unique(self.loops[corner])
+        remap  = np.full(len(self.positions), -1)
+        remap[used] = np.arange(len(used))
+        return MeshData(self.name, self.positions[used], self.face_sizes[keep],
+                        remap[self.loops[corner]], self.uvs[corner],
+                        self.materials[keep], self.matrix, self.body_color)
+
+    def digest(self):
+        """Hash of the geometry, UVs and material split (names excluded)."""
+        h = hashlib.sha256()
+        for arr in (self.positions, self.uvs, self.matrix):
+            # round away float noise; + 0.0 folds -0.0 into 0.0
+            h.update(np.ascontiguousarray(np.round(arr, 9) + 0.0).tobytes())
+        for arr in (self.face_sizes, self.loops, self.materials):
+            h.update(np.ascontiguousarray(arr, dtype=np.int64).tobytes())
+        if tuple(self.body_color) != (1.0, 1.0, 1.0, 1.0):
+            # only when set, so default meshes keep their library names
+            h.update(repr(tuple(round(c, 6) for c in self.body_color)).encode())
+        return h.hexdigest()
+
+def rotation_x(angle):
+    c, s = math.cos(angle), math.sin(angle)
+    return np.array([[1, 0, 0, 0],
+                     [0, c, -s, 0],
+                     [0, s, c, 0],
+                     [0, 0, 0, 1]], dtype=float)
+
+# box corners indexed 4*ix + 2*iy + iz, faces wound counter-clockwise
+# seen from outside
+_BOX_FACES = np.array([
+    [0, 1, 3, 2],   # -X
+    [4, 6, 7, 5],   # +X
+    [0, 4, 5, 1],   # -Y
+    [2, 3, 7, 6],   # +Y
+    [0, 2, 6, 4],   # -Z
+    [1, 5, 7, 3],   # +Z  (image face)
+])
+_QUAD_UV = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=float)
+
+def box_mesh(w, d, h, uv_scale=(1.0, 1.0), uv_offset=(0.0, 0.0)):
+    """
+    Box of size (w, d, h) in meters centered at the origin, the +Z face
+    carrying the image (u along X, v along Y), rotated 90° about X so the
+    image face is vertical — as create_box/assign_face_materials_and_uv.
+    `uv_scale` is the UV range of the image within a padded texture,
+    `uv_offset` shifts it (variants).
+    """
+    corners = np.array(np.meshgrid([-1, 1], [-1, 1], [-1, 1], indexing="ij"))
+    positions = corners.reshape(3, -1).T * (np.array([w, d, h]) / 2.0)
+    loops = _BOX_FACES.ravel()
+    uvs = np.tile(_QUAD_UV, (6, 1))
+    top = positions[_BOX_FACES[5]]
+    uvs[-4:, 0] = top[:, 0] / w + 0.5
+    uvs[-4:, 1] = top[:, 1] / d + 0.5
+    uvs[-4:] = uvs[-4:] * uv_scale + uv_offset
+    materials = np.full(6, DEFAULT_MAT)
+    materials[5] = IMAGE_MAT
+    return MeshData("Cube", positions, np.full(6, 4), loops, uvs,
+                    materials, rotation_x(math.pi / 2))
+
+def cylinder_mesh(R, H, segments=64, uv_scale=(1.0, 1.0), uv_offset=(0.0, 0.0)):
+    """
+    Cylinder of radius R and length H along Z, the side faces carrying the
+    image (u around Z, v along the height), caps using the default
+    material — as CylinderWrapper's UV loop.
+
+    u is taken per face from the segment index rather than atan2, so the
+    face across the seam spans [0, 1/n] instead of smearing the whole image.
+    `uv_scale` is the UV range of the image within a padded texture,
+    `uv_offset` shifts it (variants).
+    """
+    n = segments
+    i = np.arange(n)
+    a = 2 * np.pi * i / n
+    ring = np.stack([R * np.cos(a), R * np.sin(a)], axis=1)
+    positions = np.concatenate([
+        np.column_stack([ring, np.full(n, -H / 2)]),      # bottom: 0..n-1
+        np.column_stack([ring, np.full(n,  H / 2)]),      # top:    n..2n-1
+    ])
+    j = (i + 1) % n
+    side = np.stack([i, j, j + n, i + n], axis=1)
+    bottom = i[::-1]
+    top = i + n
+    loops = np.concatenate([side.ravel(), bottom, top])
+    face_sizes = np.concatenate([np.full(n, 4), [n, n]])
+
+    u0 = (i / n + 0.5) % 1.0
+    u1 = u0 + 1.0 / n
+    side_uv = np.stack([
+        np.stack([u0, np.zeros(n)], axis=1),
+        np.stack([u1, np.zeros(n)], axis=1),
+        np.stack([u1, np.ones(n)],  axis=1),
+        np.stack([u0, np.ones(n)],  axis=1),
+    ], axis=1).reshape(-1, 2) * uv_scale + uv_offset
+    cap = lambda idx: ring[idx % n] / (2 * R) + 0.5
+    uvs = np.concatenate([side_uv, cap(bottom), cap(top)])
+
+    materials = np.concatenate([np.full(n, IMAGE_MAT), [DEFAULT_MAT, DEFAULT_MAT]])
+    return MeshData("Cylinder", positions, face_sizes, loops, uvs,
+                    materials, np.eye(4))
@@ -0,0 +1,134 @@
+# primitives/gltf.py
+#
+# Minimal binary glTF 2.0 (GLB) writer for MeshData, materials as in
+# collada.py: DefaultMat (body colour) and ImageMat (textured). The texture
+# is embedded, so the .glb is self-contained. glTF is +Y up: the node
+# matrix carries the Z-up → Y-up turn on top of the object transform.
+
+import json
+import os
+import struct
+
+import numpy as np
+
+from .geometry import DEFAULT_MAT, IMAGE_MAT
+
+_MIME = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+# glTF constants
+_FLOAT, _UINT32 = 5126, 5125
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+_CLAMP_TO_EDGE, _LINEAR = 33071, 9729
+
+# (x, y, z) Z-up → (x, z, -y) Y-up
+_Z_UP_TO_Y_UP = np.array([[1, 0, 0, 0],
+                          [0, 0, 1, 0],
+                          [0, -1, 0, 0],
+                          [0, 0, 0, 1]], dtype=float)
+
+def _triangles(mesh, material):
+    """Corner indices of a fan triangulation of the faces using `material`."""
+    starts = np.cumsum(mesh.face_sizes) - mesh.face_sizes
+    tris = [
+        (s, s + k, s + k + 1)
+        for f in np.flatnonzero(mesh.materials == material)
+        for s in (starts[f],)
+        for k in range(1, mesh.face_sizes[f] - 1)
+    ]
+    return np.array(tris, dtype=np.uint32).reshape(-1)
+
+class _Buffer:
+    """The GLB binary chunk, with its bufferViews and accessors."""
+
+    def __init__(self):
+        self.data, self.views, self.accessors = bytearray(), [], []
+
+    def view(self, payload, target=None):
+        while len(self.data) % 4:
+            self.data.append(0)
+        view = {"buffer": 0, "byteOffset": len(self.data), "byteLength": len(payload)}
+        if target:
+            view["target"] = target
+        self.data += payload
+        self.views.append(view)
+        return len(self.views) - 1
+
+    def accessor(self, arr, kind, target, bounds=False):
+        arr = np.ascontiguousarray(arr, dtype=np.uint32 if kind == "SCALAR" else np.float32)
+        acc = {
+            "bufferView":    self.view(arr.tobytes(), target),
+            "componentType": _UINT32 if kind == "SCALAR" else _FLOAT,
+            "count":         len(arr),
+            "type":          kind,
+        }
+        if bounds:
+            acc["min"] = arr.min(axis=0).tolist()
+            acc["max"] = arr.max(axis=0).tolist()
+        self.accessors.append(acc)
+        return len(self.accessors) - 1
+
+def write_glb(mesh, path, texture_filename=None):
+    """
+    Write `mesh` to `path` as GLB, texturing ImageMat faces with
+    `texture_filename` (embedded when PNG/JPEG, else referenced by name;
+    white without one).
+    """
+    buf = _Buffer()
+    # flat shading: one vertex per face corner
+    normals = np.repeat(mesh.normals, mesh.face_sizes, axis=0)
+    uvs = np.asarray(mesh.uvs, dtype=float) * (1, -1) + (0, 1)   # glTF v points down
+    attributes = {
+        "POSITION":   buf.accessor(mesh.positions[mesh.loops], "VEC3", _ARRAY_BUFFER, True),
+        "NORMAL":     buf.accessor(normals, "VEC3", _ARRAY_BUFFER),
+        "TEXCOORD_0": buf.accessor(uvs, "VEC2", _ARRAY_BUFFER),
+    }
+    materials = [
+        {"name": "DefaultMat", "pbrMetallicRoughness": {
+            "baseColorFactor": [float(c) for c in mesh.body_color],
+            "metallicFactor": 0.0}},
+        {"name": "ImageMat", "pbrMetallicRoughness": {"metallicFactor": 0.0}},
+    ]
+    gltf = {"asset": {"version": "2.0", "generator": "synthetic_blender_3Ddatagen native"}}
+    if texture_filename is not None:
+        mime = _MIME.get(os.path.splitext(texture_filename)[1].lower())
+        if mime:
+            with open(texture_filename, "rb") as f:
+                image = {"bufferView": buf.view(f.read()), "mimeType": mime}
+        else:
+            image = {"uri": os.path.basename(texture_filename)}
+        gltf["images"]   = [image]
+        gltf["samplers"] = [{"magFilter": _LINEAR, "minFilter": _LINEAR,
+                             "wrapS": _CLAMP_TO_EDGE, "wrapT": _CLAMP_TO_EDGE}]
+        gltf["textures"] = [{"source": 0, "sampler": 0}]
+        materials[IMAGE_MAT]["pbrMetallicRoughness"]["baseColorTexture"] = {"index": 0}
+
+    primitives = []
+    for mat in (DEFAULT_MAT, IMAGE_MAT):
+        tris = _triangles(mesh, mat)
+        if len(tris):
+            primitives.append({
+                "attributes": attributes,
+                "indices":    buf.accessor(tris, "SCALAR", _ELEMENT_ARRAY_BUFFER),
+                "material":   mat,
+            })
+    matrix = _Z_UP_TO_Y_UP @ np.asarray(mesh.matrix, dtype=float)
+    gltf.update(
+        scene=0,
+        scenes=[{"nodes": [0]}],
+        nodes=[{"name": mesh.name, "mesh": 0,
+                "matrix": [float(v) + 0.0 for v in matrix.T.ravel()]}],
+        meshes=[{"name": f"{mesh.name}-mesh", "primitives": primitives}],
+        materials=materials,
+        accessors=buf.accessors,
+        bufferViews=buf.views,
+    )
+    while len(buf.data) % 4:
+        buf.data.append(0)
+    gltf["buffers"] = [{"byteLength": len(buf.data)}]
+
+    js = json.dumps(gltf, separators=(",", ":")).encode()
+    js += b" " * (-len(js) % 4)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<III", 0x46546C67, 2, 12 + 8 + len(js) + 8 + len(buf.data)))
+        f.write(struct.pack("<II", len(js), 0x4E4F534A) + js)
+        f.write(struct.pack("<II", len(buf.data), 0x004E4942) + bytes(buf.data))
@@ -0,0 +1,53 @@
+# primitives/imageinfo.py
+#
+# Read PNG/JPEG pixel sizes from the file header, without decoding and
+# without Blender.
+
+import struct
+
+# JPEG start-of-frame markers carrying the image size (not DHT/JPG/DAC)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def _png_size(f):
+    f.seek(8)
+    length, kind = struct.unpack(">I4s", f.read(8))
+    if kind != b"IHDR":
+        raise ValueError("PNG without IHDR chunk")
+    return struct.unpack(">II", f.read(8))
+
+def _jpeg_size(f):
+    f.seek(2)
+    while True:
+        b = f.read(1)
+        while b and b != b"\xff":
+            b = f.read(1)
+        while b == b"\xff":
+            b = f.read(1)
+        if not b:
+            raise ValueError("JPEG without SOF marker")
+        marker = b[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue                     # markers without a payload
+        (length,) = struct.unpack(">H", f.read(2))
+        if marker in _SOF_MARKERS:
+            _, h, w = struct.unpack(">BHH", f.read(5))
+            return w, h
+        f.seek(length - 2, 1)
+
+def image_size(path):
+    """Return (width, height) in pixels. Raises ValueError for bad input."""
+    with open(path, "rb") as f:
+        head = f.read(8)
+        try:
+            if head.startswith(b"\x89PNG\r\n\x1a\n"):
+                w, h = _png_size(f)
+            elif head.startswith(b"\xff\xd8"):
+                w, h = _jpeg_size(f)
+            else:
+                raise ValueError(f"{path}: not a PNG or JPEG file")
+        except struct.error:
+            raise ValueError(f"{path}: truncated image header")
+    if not w or not h:
+        raise ValueError(f"{path}: image has zero size")
+    return w, h
@@ -0,0 +1,25 @@
+# primitives/meshio.py
+#
+# Mesh file formats: the native writers by file extension, and the sidecar
+# files (OBJ's .mtl) that have to travel with a mesh.
+
+import os
+
+from .collada import write_dae
+from .gltf import write_glb
+from .wavefront import mtl_path, write_obj
+
+WRITERS = {".dae": write_dae, ".glb": write_glb, ".obj": write_obj}
+
+def write_mesh(mesh, path, texture_filename=None):
+    """Write `mesh` in the format of `path`'s extension (.dae, .glb or .obj)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"Unsupported mesh format {ext!r} (one of {', '.join(WRITERS)})")
+    WRITERS[ext](mesh, path, texture_filename)
+
+def mesh_files(path):
+    """`path` plus the files it references by name, i.e. an OBJ's .mtl."""
+    if path.lower().endswith(".obj") and os.path.exists(mtl_path(path)):
+        return [path, mtl_path(path)]
+    return [path]
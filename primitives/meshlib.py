@@ -0,0 +1,100 @@
+# primitives/meshlib.py
+#
+# Shared mesh library: one mesh file per unique box/cylinder geometry and
+# format (.dae, .glb or .obj + .mtl), kept in a Gazebo model folder of its
+# own and referenced from many models through model://<library>/meshes/...
+# URIs. No bpy imports here.
+
+import os
+import shutil
+import threading
+
+from .dimensions import DEFAULT_SEGMENTS, MESH_FORMATS
+from .geometry import DEFAULT_MAT, IMAGE_MAT, box_mesh, cylinder_mesh
+from .meshio import mesh_files, write_mesh
+
+# full: the complete mesh (collision); body: DefaultMat faces; image: the
+# ImageMat faces, textured per model by the SDF <material>
+PARTS = ("full", "body", "image")
+
+LIBRARY_CONFIG = """<?xml version="1.0"?>
+<model>
+  <name>{name}</name>
+  <version>1.0</version>
+  <author><name>Generated</name><email>noreply@example.com</email></author>
+  <description>Shared meshes referenced by generated models.</description>
+</model>
+"""
+
+def primitive_mesh(primitive, dims, uv_scale=None, uv_offset=None, body_color=None):
+    """MeshData for wrapper dims in meters, as the native backend builds it."""
+    uv  = tuple(uv_scale or (1.0, 1.0))
+    off = tuple(uv_offset or (0.0, 0.0))
+    if primitive == "box":
+        mesh = box_mesh(dims["width"], dims["depth"], dims["height"], uv, off)
+    elif primitive == "cylinder":
+        mesh = cylinder_mesh(dims["radius"], dims["length"],
+                             segments=dims.get("segments", DEFAULT_SEGMENTS),
+                             uv_scale=uv, uv_offset=off)
+    else:
+        raise ValueError(f"No library mesh for primitive {primitive!r}")
+    if body_color is not None:
+        mesh.body_color = tuple(body_color)
+    return mesh
+
+class MeshLibrary:
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.name = os.path.basename(self.root.rstrip(os.sep))
+
+    def uri(self, filename):
+        return f"model://{self.name}/meshes/{filename}"
+
+    def entry(self, primitive, dims, uv_scale=None, uv_offset=None, body_color=None,
+              mesh_format="dae"):
+        """
+        Resolve the library meshes for one model in `mesh_format`.
+        Returns ({part: uri}, [(MeshData, path)] not yet in the library).
+        """
+        if mesh_format not in MESH_FORMATS:
+            raise ValueError(f"mesh_format must be one of {', '.join(MESH_FORMATS)}: "
+                             f"{mesh_format!r}")
+        mesh = primitive_mesh(primitive, dims, uv_scale, uv_offset, body_color)
+        key  = f"{primitive}_{mesh.digest()[:16]}"
+        meshes = {
+            "full":  mesh,
+            "body":  mesh.subset(DEFAULT_MAT),
+            "image": mesh.subset(IMAGE_MAT),
+        }
+        uris, missing = {}, []
+        for part in PARTS:
+            fn = f"{key}_{part}.{mesh_format}"
+            uris[part] = self.uri(fn)
+            path = os.path.join(self.root, "meshes", fn)
+            if not os.path.exists(path):
+                missing.append((meshes[part], path))
+        return uris, missing
+
+def write_meshes(missing):
+    """Write library meshes that are still absent (atomic, race-safe)."""
+    for mesh, path in missing:
+        if os.path.exists(path):
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        root   = os.path.dirname(os.path.dirname(path))
+        config = os.path.join(root, "model.config")
+        if not os.path.exists(config):
+            with open(config, "w") as f:
+                f.write(LIBRARY_CONFIG.format(name=os.path.basename(root)))
+        # written under the final names in a private folder, then moved in
+        # sidecars first, so the mesh file appearing means it is complete
+        tmp = os.path.join(os.path.dirname(path),
+                           f".tmp-{os.getpid()}-{threading.get_ident()}")
+        os.makedirs(tmp, exist_ok=True)
+        try:
+            staged = os.path.join(tmp, os.path.basename(path))
+            write_mesh(mesh, staged)
+            for src in reversed(mesh_files(staged)):
+                os.replace(src, os.path.join(os.path.dirname(path), os.path.basename(src)))
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,90 @@
+# primitives/native.py
+#
+# Blender-free backend: same dimensions, names and geometry as the bpy
+# wrappers, built with NumPy and written straight to COLLADA.
+
+import os
+
+from .base import PrimitiveWrapper
+from .fileops import place
+from .dimensions import (body_color, cylinder_segments, lod_name, mesh_dims,
+                         model_size, output_names, uv_offset, uv_scale)
+from .geometry import box_mesh, cylinder_mesh
+from .imageinfo import image_size
+from .meshio import write_mesh
+from .timing import StageTimer
+
+class NativeBoxWrapper(PrimitiveWrapper):
+    def run(self, image_path: str, outdir: str, dims: dict = None):
+        dims = dims or {}
+        timer = StageTimer()
+        os.makedirs(outdir, exist_ok=True)
+
+        with timer.stage("probe_image"):
+            w, d, h = model_size("box", dims, lambda: image_size(image_path))
+
+        tex_fn, dae_fn = output_names("box", (w, d, h), os.path.splitext(image_path)[1],
+                                      dims.get("mesh_format"))
+        tex_dest = os.path.join(outdir, tex_fn)
+        dae_dest = os.path.join(outdir, dae_fn)
+        with timer.stage("place_texture"):
+            place(image_path, tex_dest, "reflink")
+        if dims.get("skip_mesh"):
+            dae_dest = None         # the shared mesh library supplies it
+        else:
+            with timer.stage("create_mesh"):
+                mesh = box_mesh(w, d, h, uv_scale(dims), uv_offset(dims))
+                mesh.body_color = body_color(dims)
+            with timer.stage("mesh_export"):
+                write_mesh(mesh, dae_dest, tex_dest)
+
+        print(f"✅ Exported box (native): {dae_dest}")
+        return {
+            "primitive": "box",
+            "texture":   tex_dest,
+            "mesh":      dae_dest,
+            "dims":      {"width": w, "depth": d, "height": h},
+            "seconds":   timer.as_dict(),
+        }
+
+class NativeCylinderWrapper(PrimitiveWrapper):
+    def run(self, image_path: str, outdir: str, dims: dict = None):
+        dims = dims or {}
+        timer = StageTimer()
+        os.makedirs(outdir, exist_ok=True)
+
+        with timer.stage("probe_image"):
+            R, H = model_size("cylinder", dims, lambda: image_size(image_path))
+
+        tex_fn, dae_fn = output_names("cylinder", (R, H), os.path.splitext(image_path)[1],
+                                      dims.get("mesh_format"))
+        tex_dst = os.path.join(outdir, tex_fn)
+        dae_dst = os.path.join(outdir, dae_fn)
+        with timer.stage("place_texture"):
+            place(image_path, tex_dst, "reflink")
+        segments, lod_segments = cylinder_segments(R, dims)
+        levels = [segments] + lod_segments
+        if dims.get("skip_mesh"):
+            dae_dst, levels = None, []      # the shared mesh library supplies it
+        lods = []
+        for level, n in enumerate(levels):
+            path = lod_name(dae_dst, level) if level else dae_dst
+            with timer.stage("create_mesh"):
+                mesh = cylinder_mesh(R, H, segments=n, uv_scale=uv_scale(dims),
+                                     uv_offset=uv_offset(dims))
+                mesh.body_color = body_color(dims)
+            with timer.stage("mesh_export"):
+                write_mesh(mesh, path, tex_dst)
+            if level:
+                lods.append(path)
+
+        print(f"✅ Exported cylinder (native): {dae_dst}"
+              + (f" + {len(lods)} LODs" if lods else ""))
+        return {
+            "primitive": "cylinder",
+            "texture":   tex_dst,
+            "mesh":      dae_dst,
+            "lods":      lods,
+            "dims":      mesh_dims("cylinder", (R, H), dims),
+            "seconds":   timer.as_dict(),
+        }
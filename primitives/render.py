@@ -0,0 +1,193 @@
+# primitives/render.py
+#
+# Optional render stage, run in the wrap job's Blender session right after
+# the mesh export: N views of the object as RGB, an instance mask (the
+# thresholded alpha of a transparent film) and depth (OpenEXR), plus one
+# label record per view in <dir>/labels.jsonl. The camera, light, world and
+# compositor are built once per session and only re-aimed per view.
+
+import json
+import math
+import os
+
+import bpy
+import numpy as np
+
+from .camera import LABELS, bbox_2d, euler_matrix, intrinsics, view_poses
+from .timing import StageTimer
+
+def _set_engine(render, engine):
+    # Eevee's identifier changed between releases (BLENDER_EEVEE_NEXT in 4.2+)
+    names = ("CYCLES",) if engine == "cycles" else ("BLENDER_EEVEE_NEXT", "BLENDER_EEVEE")
+    for name in names:
+        try:
+            render.engine = name
+            return
+        except TypeError:
+            continue
+    raise ValueError(f"render engine {engine!r} not available in this Blender")
+
+def configure(scene, opts):
+    """Apply the render profile in `opts` to `scene` (CPU only)."""
+    r = scene.render
+    _set_engine(r, opts["engine"])
+    r.resolution_x, r.resolution_y = opts["resolution"]
+    r.resolution_percentage = 100
+    r.film_transparent = True           # alpha = coverage, the instance mask
+    r.use_persistent_data = True        # keep the BVH and shaders between views
+    r.image_settings.file_format = "PNG"
+    r.image_settings.color_mode = "RGBA"
+    if opts["engine"] == "cycles":
+        c = scene.cycles
+        c.device = "CPU"
+        c.samples = opts["samples"]
+        c.use_adaptive_sampling = opts["adaptive_threshold"] > 0
+        c.adaptive_threshold = opts["adaptive_threshold"]
+        c.use_denoising = opts["denoise"]
+        c.denoiser = "OPENIMAGEDENOISE"
+        c.max_bounces = opts["max_bounces"]
+        c.use_auto_tile = True
+        c.tile_size = opts["tile"]
+    else:
+        scene.eevee.taa_render_samples = opts["samples"]
+    bpy.context.view_layer.use_pass_z = True
+
+def _compositor(scene):
+    """RGB through the Composite node, mask_####.png and depth_####.exr via File Outputs."""
+    scene.use_nodes = True
+    tree = scene.node_tree
+    tree.nodes.clear()
+    layers = tree.nodes.new("CompositorNodeRLayers")
+    composite = tree.nodes.new("CompositorNodeComposite")
+    tree.links.new(layers.outputs["Image"], composite.inputs["Image"])
+
+    binary = tree.nodes.new("CompositorNodeMath")
+    binary.operation = "GREATER_THAN"
+    binary.inputs[1].default_value = 0.5
+    tree.links.new(layers.outputs["Alpha"], binary.inputs[0])
+    mask = tree.nodes.new("CompositorNodeOutputFile")
+    mask.format.file_format = "PNG"
+    mask.format.color_mode = "BW"
+    mask.file_slots[0].path = "mask_"
+    tree.links.new(binary.outputs["Value"], mask.inputs[0])
+
+    depth = tree.nodes.new("CompositorNodeOutputFile")
+    depth.format.file_format = "OPEN_EXR"
+    depth.format.color_depth = "32"
+    depth.file_slots[0].path = "depth_"
+    tree.links.new(layers.outputs["Depth"], depth.inputs[0])
+    return [mask, depth]
+
+def _rig(session, scene):
+    """Camera, sun, world and compositor outputs; a session builds them once."""
+    rig = session._rig if session is not None else None
+    if rig is None:
+        cam_data = bpy.data.cameras.new("RenderCamera")
+        cam_data.sensor_fit = "AUTO"
+        sun_data = bpy.data.lights.new("RenderSun", type="SUN")
+        sun_data.energy = 3.0
+        world = bpy.data.worlds.new("RenderWorld")
+        world.use_nodes = False
+        world.color = (0.6, 0.6, 0.6)
+        rig = {
+            "camera":  bpy.data.objects.new("RenderCamera", cam_data),
+            "sun":     bpy.data.objects.new("RenderSun", sun_data),
+            "world":   world,
+            "outputs": _compositor(scene),
+        }
+        rig["sun"].rotation_euler = (math.radians(40), math.radians(10), math.radians(30))
+        if session is not None:
+            session._rig = rig
+    return rig
+
+def _world_points(objs):
+    pts = []
+    for obj in objs:
+        m = np.array(obj.matrix_world, dtype=float)
+        co = np.array([tuple(v.co) for v in obj.data.vertices], dtype=float)
+        pts.append(co @ m[:3, :3].T + m[:3, 3])
+    return np.concatenate(pts)
+
+def _rounded(arr):
+    return np.round(np.asarray(arr, dtype=float), 6).tolist()
+
+def render_views(session, opts, result):
+    """
+    Render `opts["views"]` views of the scene's mesh objects into
+    `opts["dir"]` and write their labels; `result` is the wrapper's record
+    (primitive, dims). Returns {render_dir, views, seconds}.
+    """
+    timer = StageTimer("render.")
+    scene = bpy.context.scene
+    outdir = os.path.abspath(opts["dir"])
+    os.makedirs(outdir, exist_ok=True)
+    with timer.stage("setup"):
+        bpy.context.view_layer.update()
+        objs = [o for o in scene.objects if o.type == "MESH"]
+        if not objs:
+            raise RuntimeError("render: no mesh object in the scene")
+        rig = _rig(session, scene)
+        configure(scene, opts)
+        # linked only while rendering, so the next job's export skips them
+        for key in ("camera", "sun"):
+            scene.collection.objects.link(rig[key])
+        scene.camera = rig["camera"]
+        scene.world = rig["world"]
+        for node in rig["outputs"]:
+            node.base_path = outdir
+
+        w, h = opts["resolution"]
+        fov = math.radians(opts["fov"])
+        pts = _world_points(objs)
+        center = (pts.min(axis=0) + pts.max(axis=0)) / 2
+        radius = float(np.linalg.norm(pts - center, axis=1).max())
+        poses = view_poses(opts["views"], radius, fov, w, h, opts.get("seed", 0))
+        cam = rig["camera"]
+        cam.data.angle = fov
+        cam.data.clip_start = max(radius * 1e-3, 1e-4)
+        cam.data.clip_end = math.dist(poses[0][0], (0, 0, 0)) + 4 * radius
+        K = intrinsics(fov, w, h)
+        objects = [{"name": o.name, "instance_id": 1,
+                    "world_from_object": _rounded(np.array(o.matrix_world))} for o in objs]
+
+    labels = []
+    try:
+        for k, (loc, euler) in enumerate(poses):
+            loc = tuple(np.add(loc, center))
+            with timer.stage("views"):
+                cam.location = loc
+                cam.rotation_euler = euler
+                scene.frame_current = k     # numbers the File Output images
+                scene.render.filepath = os.path.join(outdir, f"rgb_{k:04d}.png")
+                bpy.ops.render.render(write_still=True)
+            world_from_camera = euler_matrix(loc, euler)
+            labels.append({
+                "model":  opts["name"],
+                "view":   k,
+                "rgb":    os.path.join(opts["name"], f"rgb_{k:04d}.png"),
+                "mask":   os.path.join(opts["name"], f"mask_{k:04d}.png"),
+                "depth":  os.path.join(opts["name"], f"depth_{k:04d}.exr"),
+                "width":  w,
+                "height": h,
+                "engine": opts["engine"],
+                "samples": opts["samples"],
+                "camera": {
+                    "location":          _rounded(loc),
+                    "rotation_euler":    _rounded(euler),
+                    "fov_deg":           opts["fov"],
+                    "K":                 _rounded(K),
+                    "world_from_camera": _rounded(world_from_camera),
+                },
+                "primitive": result.get("primitive"),
+                "dims":      result.get("dims"),
+                "objects":   objects,
+                "bbox":      bbox_2d(pts, world_from_camera, K, w, h),
+            })
+    finally:
+        for key in ("camera", "sun"):
+            scene.collection.objects.unlink(rig[key])
+
+    with open(os.path.join(outdir, LABELS), "w") as f:
+        for rec in labels:
+            f.write(json.dumps(rec) + "\n")
+    return {"render_dir": outdir, "views": len(labels), "seconds": timer.as_dict()}
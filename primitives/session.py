@@ -0,0 +1,188 @@
+# primitives/session.py
+
+import os
+import time
+import traceback
+import bpy
+
+from .render import render_views
+from .timing import peak_rss_mb
+
+# datablock collections a wrapper may populate, in safe removal order
+# (objects before the meshes/materials they use, images last)
+_COLLECTIONS = (
+    "objects", "cameras", "lights", "meshes", "materials",
+    "node_groups", "textures", "images",
+)
+
+def load_image(session, path):
+    """Image datablock for `path`, loaded once per group of jobs in a session."""
+    if session is None:
+        return bpy.data.images.load(path)
+    img = session._images.get(path)
+    if img is None:
+        img = session._images[path] = bpy.data.images.load(path)
+    return img
+
+def node_material(session, name):
+    """A node material with an empty tree; a session reuses it within a group."""
+    mat = session._materials.get(name) if session else None
+    if mat is None:
+        mat = bpy.data.materials.new(name)
+        if session is not None:
+            session._materials[name] = mat
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    for n in list(nodes):
+        nodes.remove(n)
+    return mat
+
+def unit_shape(session, primitive, add):
+    """
+    Object for shape key `primitive` (e.g. "box", "cylinder64") made by the
+    `add` operator at unit size, plus its unit vertex coordinates; a session
+    reuses it within a group, dropping other shapes so only one is exported.
+    """
+    if session is not None:
+        for other in [k for k in session._shapes if k != primitive]:
+            obj, _ = session._shapes.pop(other)
+            mesh = obj.data
+            bpy.data.objects.remove(obj)
+            bpy.data.meshes.remove(mesh)
+        if primitive in session._shapes:
+            return session._shapes[primitive]
+    add()
+    obj = bpy.context.active_object
+    shape = (obj, [tuple(v.co) for v in obj.data.vertices])
+    if session is not None:
+        session._shapes[primitive] = shape
+    return shape
+
+def export_mesh(path, selected=False):
+    """
+    Export the scene's meshes (or the selected ones) in the format of
+    `path`'s extension: .dae (COLLADA), .glb (texture embedded) or .obj
+    (+ .mtl naming the texture file). OBJ keeps Blender's Z up.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".glb":
+        bpy.ops.export_scene.gltf(
+            filepath=path, export_format="GLB", use_selection=selected,
+            export_apply=True, export_yup=True
+        )
+    elif ext == ".obj":
+        bpy.ops.wm.obj_export(
+            filepath=path, export_selected_objects=selected, apply_modifiers=True,
+            export_materials=True, path_mode="STRIP", forward_axis="Y", up_axis="Z"
+        )
+    else:
+        bpy.ops.wm.collada_export(
+            filepath=path, apply_modifiers=True,
+            export_mesh_type_selection="view", selected=selected
+        )
+
+def resize_shape(obj, unit, scale):
+    """Set the mesh's vertices to the unit coordinates times `scale` (x, y, z)."""
+    sx, sy, sz = scale
+    for v, (x, y, z) in zip(obj.data.vertices, unit):
+        v.co = (x * sx, y * sy, z * sz)
+    obj.data.update()
+
+class BlenderSession:
+    """
+    Run many wrap jobs inside one Blender process.
+
+    Factory settings are loaded once; between jobs only the datablocks
+    created since then are removed, so Blender start-up is paid once
+    per batch instead of once per image. Consecutive jobs on the same
+    image (variants) also share the loaded image, the materials and the
+    mesh, which the wrappers modify in place. The render stage's camera,
+    light and compositor (primitives/render.py) live for the whole session.
+    """
+
+    def __init__(self):
+        t0 = time.perf_counter()
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        self._baseline = self._snapshot()
+        self._images, self._materials, self._shapes = {}, {}, {}
+        self._rig = None
+        self.init_seconds = time.perf_counter() - t0
+
+    def _snapshot(self):
+        return {
+            name: {b.as_pointer() for b in getattr(bpy.data, name)}
+            for name in _COLLECTIONS
+        }
+
+    def _shared(self):
+        blocks = list(self._images.values()) + list(self._materials.values())
+        for obj, _ in self._shapes.values():
+            blocks += [obj, obj.data]
+        if self._rig is not None:
+            for key in ("camera", "sun"):
+                blocks += [self._rig[key], self._rig[key].data]
+        return {b.as_pointer() for b in blocks}
+
+    def reset(self, keep_shared=False):
+        """
+        Drop every datablock created since the session started; with
+        `keep_shared`, keep the image, materials and mesh for the next job.
+        """
+        if bpy.context.object and bpy.context.object.mode != "OBJECT":
+            bpy.ops.object.mode_set(mode="OBJECT")
+        if not keep_shared:
+            self._images, self._materials, self._shapes = {}, {}, {}
+        shared = self._shared()
+        for name in _COLLECTIONS:
+            coll = getattr(bpy.data, name)
+            keep = self._baseline[name] | shared
+            for block in list(coll):
+                if block.as_pointer() not in keep:
+                    coll.remove(block)
+
+    def run_job(self, job: dict, keep_shared=False) -> dict:
+        """
+        Run one manifest job {image, primitive, outdir, dims?, render?};
+        with `render` options the exported object is also rendered.
+        Never raises: failures are reported in the returned record, which
+        also carries the wrapper's stage `seconds` plus the session reset
+        and the process's peak RSS so far. `keep_shared` keeps the image,
+        materials and mesh for a following job on the same image.
+        """
+        # late import: primitives/__init__ imports this package's wrappers
+        from . import get_wrapper
+
+        result = {
+            "image":     job.get("image"),
+            "primitive": job.get("primitive", "box"),
+            "outdir":    job.get("outdir"),
+        }
+        try:
+            wrapper = get_wrapper(result["primitive"], session=self)
+            out = wrapper.run(
+                os.path.abspath(job["image"]), job["outdir"], job.get("dims")
+            )
+            if job.get("render"):
+                rendered = render_views(self, job["render"], out)
+                out["seconds"].update(rendered.pop("seconds"))
+                out.update(rendered)
+            result.update(out or {})
+            result["ok"] = True
+        except Exception as e:
+            traceback.print_exc()
+            result["ok"] = False
+            result["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            t0 = time.perf_counter()
+            self.reset(keep_shared and result["ok"])
+            seconds = result.setdefault("seconds", {})
+            seconds["reset"] = round(time.perf_counter() - t0, 6)
+            result["peak_rss_mb"] = peak_rss_mb()
+        return result
+
+    def run_batch(self, jobs):
+        """Yield one result record per job, in order."""
+        jobs = list(jobs)
+        for n, job in enumerate(jobs):
+            nxt = jobs[n + 1] if n + 1 < len(jobs) else {}
+            yield self.run_job(job, keep_shared=nxt.get("image") == job.get("image"))
@@ -0,0 +1,85 @@
+# primitives/timing.py
+#
+# Per-stage timings and peak memory, shared by the wrappers (inside
+# Blender), main.py and generate_sdf_model.py. No bpy imports here.
+
+import sys
+import time
+from contextlib import contextmanager
+
+def peak_rss_mb(children=False):
+    """High-water resident set size of this process (or its children) in MiB."""
+    try:
+        import resource
+    except ImportError:                     # not on Windows
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    kb = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS, KiB elsewhere
+    return round(kb / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+class StageTimer:
+    """Accumulates wall time per named stage, e.g. timer.stage("export")."""
+
+    def __init__(self, prefix=""):
+        self.prefix  = prefix
+        self.seconds = {}
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name, seconds):
+        key = self.prefix + name
+        self.seconds[key] = self.seconds.get(key, 0.0) + seconds
+
+    def update(self, seconds, prefix=""):
+        """Merge another {stage: seconds} mapping, e.g. from a wrapper result."""
+        for name, secs in (seconds or {}).items():
+            self.add(prefix + name, secs)
+
+    def as_dict(self):
+        return {k: round(v, 6) for k, v in self.seconds.items()}
+
+# --- reporting -----------------------------------------------------------------
+
+def percentile(sorted_vals, q):
+    """Linear-interpolated percentile (0-100) of an ascending list."""
+    if not sorted_vals:
+        return float("nan")
+    pos = (len(sorted_vals) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+def profile_report(records, key="seconds"):
+    """
+    Aggregate the `key` stage mappings of many records into one table:
+    per stage the count, total, mean and p50/p90/p99/max, slowest first.
+    """
+    stages = {}
+    for rec in records:
+        for name, secs in (rec.get(key) or {}).items():
+            stages.setdefault(name, []).append(secs)
+    rows = []
+    for name, vals in stages.items():
+        vals.sort()
+        rows.append((name, len(vals), sum(vals), sum(vals) / len(vals),
+                     percentile(vals, 50), percentile(vals, 90),
+                     percentile(vals, 99), vals[-1]))
+    rows.sort(key=lambda r: -r[2])
+
+    width = max([len("stage")] + [len(r[0]) for r in rows])
+    head = ("stage".ljust(width) + "  count   total s    mean ms     p50 ms"
+            "     p90 ms     p99 ms     max ms")
+    lines = [head, "-" * len(head)]
+    for name, n, total, mean, p50, p90, p99, top in rows:
+        lines.append(
+            f"{name.ljust(width)}  {n:5d} {total:9.2f} "
+            + " ".join(f"{v * 1000:10.1f}" for v in (mean, p50, p90, p99, top))
+        )
+    return "\n".join(lines)
@@ -0,0 +1,60 @@
+# primitives/wavefront.py
+#
+# Minimal Wavefront OBJ writer for MeshData, with a .mtl of the same stem
+# holding DefaultMat (body colour) and ImageMat (textured). OBJ has no
+# transforms, so the object matrix is baked into the vertices; Z stays up.
+
+import os
+
+import numpy as np
+
+from .geometry import DEFAULT_MAT, IMAGE_MAT
+
+def _floats(arr):
+    return " ".join(np.format_float_positional(v, precision=6, trim="-")
+                    for v in np.asarray(arr, dtype=float))
+
+def mtl_path(path):
+    return os.path.splitext(path)[0] + ".mtl"
+
+def write_obj(mesh, path, texture_filename=None, mtl_filename=None):
+    """
+    Write `mesh` to `path` plus its material library (`mtl_filename`, by
+    default next to it), texturing ImageMat faces with `texture_filename`
+    (white like DefaultMat without one).
+    """
+    mtl = mtl_filename or mtl_path(path)
+    m = np.asarray(mesh.matrix, dtype=float)
+    positions = mesh.positions @ m[:3, :3].T + m[:3, 3]
+    normals = mesh.normals @ np.linalg.inv(m[:3, :3])
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+
+    lines = ["# synthetic_blender_3Ddatagen native",
+             f"mtllib {os.path.basename(mtl)}",
+             f"o {mesh.name}"]
+    lines += [f"v {_floats(p)}" for p in positions]
+    lines += [f"vt {_floats(uv)}" for uv in mesh.uvs]
+    lines += [f"vn {_floats(n)}" for n in normals]
+    starts = np.cumsum(mesh.face_sizes) - mesh.face_sizes
+    for mat, name in ((DEFAULT_MAT, "DefaultMat"), (IMAGE_MAT, "ImageMat")):
+        faces = np.flatnonzero(mesh.materials == mat)
+        if not len(faces):
+            continue
+        lines.append(f"usemtl {name}")
+        for f in faces:
+            corners = range(starts[f], starts[f] + mesh.face_sizes[f])
+            # OBJ indices are 1-based: vertex / corner UV / face normal
+            lines.append("f " + " ".join(f"{mesh.loops[c] + 1}/{c + 1}/{f + 1}"
+                                         for c in corners))
+    with open(path, "w") as fh:
+        fh.write("\n".join(lines) + "\n")
+
+    r, g, b = mesh.body_color[:3]
+    materials = [
+        "newmtl DefaultMat", f"Kd {_floats((r, g, b))}", "Ks 0 0 0", "illum 1", "",
+        "newmtl ImageMat", "Kd 1 1 1", "Ks 0 0 0", "illum 1",
+    ]
+    if texture_filename is not None:
+        materials.append(f"map_Kd {os.path.basename(texture_filename)}")
+    with open(mtl, "w") as fh:
+        fh.write("\n".join(materials) + "\n")
@@ -0,0 +1,100 @@
+"""
+Render stage options: N labelled views of every model, rendered on the
+CPU inside the wrap job's Blender session (primitives/render.py).
+
+Each model gets <render dir>/<model>/rgb_####.png, mask_####.png (binary
+instance mask) and depth_####.exr plus a labels.jsonl with the camera pose,
+intrinsics and 2D box of every view; main.py concatenates the labels of
+the models it built into <render dir>/labels.jsonl. The "fast" profile
+trades noise for throughput (few samples, adaptive sampling, denoising,
+small tiles, low bounces); "quality" is for reference renders.
+"""
+import argparse
+import os
+
+from primitives.camera import LABELS
+
+ENGINES    = ("cycles", "eevee")
+RENDER_DIR = "renders"
+PROFILES = {
+    "fast": {"samples": 16, "adaptive_threshold": 0.1, "denoise": True,
+             "tile": 64, "max_bounces": 2, "resolution": 256},
+    "quality": {"samples": 128, "adaptive_threshold": 0.01, "denoise": True,
+                "tile": 256, "max_bounces": 8, "resolution": 512},
+}
+
+def is_active(opts):
+    return bool(opts) and opts.get("views", 0) > 0
+
+def parse_resolution(text):
+    """'256' or '320x240' → (width, height) (an argparse type)."""
+    try:
+        size = [int(v) for v in text.lower().split("x")]
+    except ValueError:
+        size = []
+    if len(size) not in (1, 2) or min(size) < 1:
+        raise argparse.ArgumentTypeError(f"--render-size wants PX or WxH, got {text!r}")
+    return (size[0], size[-1])
+
+def job_opts(opts, model):
+    """The render options of one job: the model's own folder under the render root."""
+    return dict(opts, dir=os.path.join(opts["root"], model), name=model)
+
+def labels_path(opts, shard=None):
+    """<render root>/labels.jsonl; one file per shard, as shards may share the root."""
+    if shard is None:
+        return os.path.join(opts["root"], LABELS)
+    index, count = shard
+    return os.path.join(opts["root"], f"labels.shard-{index:04d}-of-{count:04d}.jsonl")
+
+def write_labels(records, path, mode="w"):
+    """Concatenate the view labels of every model built into `path`; returns the count."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    count = 0
+    with open(path, mode) as f:
+        for rec in records:
+            if not rec["ok"] or not rec.get("render_dir"):
+                continue
+            with open(os.path.join(rec["render_dir"], LABELS)) as views:
+                for line in views:
+                    f.write(line)
+                    count += 1
+    return count
+
+# --- CLI -------------------------------------------------------------------
+
+def add_render_args(p):
+    p.add_argument("--render-views", type=int, default=0, metavar="N",
+        help="Render N labelled views (RGB, mask, depth) of every model (Blender backend)")
+    p.add_argument("--render-dir",
+        help=f"Folder for the renders and labels (default <output>/{RENDER_DIR})")
+    p.add_argument("--render-engine", choices=ENGINES, default="cycles",
+        help="CPU render engine (default cycles)")
+    p.add_argument("--render-profile", choices=sorted(PROFILES), default="fast",
+        help="Samples/denoise/tile/bounce settings: fast (default) or quality")
+    p.add_argument("--render-size", type=parse_resolution, metavar="PX|WxH",
+        help="Render resolution (default: the profile's, 256 fast, 512 quality)")
+    p.add_argument("--render-samples", type=int, metavar="N",
+        help="Samples per pixel (default: the profile's)")
+    p.add_argument("--render-fov", type=float, default=50.0, metavar="DEG",
+        help="Camera field of view across the longer image side (default 50)")
+
+def render_opts_from_args(args, output_root):
+    if not args.render_views:
+        return None
+    profile = PROFILES[args.render_profile]
+    res = args.render_size or (profile["resolution"],) * 2
+    return {
+        "views":      args.render_views,
+        "engine":     args.render_engine,
+        "profile":    args.render_profile,
+        "resolution": list(res),
+        "samples":    args.render_samples or profile["samples"],
+        "adaptive_threshold": profile["adaptive_threshold"],
+        "denoise":    profile["denoise"],
+        "tile":       profile["tile"],
+        "max_bounces": profile["max_bounces"],
+        "fov":        args.render_fov,
+        "seed":       args.seed,
+        "root":       os.path.abspath(args.render_dir or os.path.join(output_root, RENDER_DIR)),
+    }
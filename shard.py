@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Deterministic sharding of a batch over several machines, and the merge
+of what the shards produced.
+
+`main.py --batch-dir DIR --shard i/N` keeps the images whose file name
+hashes to i modulo N. The hash is SHA-256 of the name, not the position
+in a listing, so a shard's slice does not depend on the node, its mount
+point or the other files present. Variants of an image stay in its
+shard. Each shard writes <output>/shards/shard-<i>-of-<N>.json listing
+the images it was assigned and the models it produced; `merge` checks
+that the shards fit together and writes one catalog:
+
+    ./shard.py merge /farm/models                 # shared output root
+    ./shard.py merge node*/models --verify --batch-dir /farm/images
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+
+SCHEMA      = 1
+SHARD_DIR   = "shards"
+CATALOG     = "catalog.jsonl"
+
+def parse_shard(text):
+    """'i/N' → (i, N), 0 <= i < N (an argparse type)."""
+    try:
+        index, count = (int(v) for v in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"--shard wants i/N, got {text!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"--shard {text}: need 0 <= i < N")
+    return index, count
+
+def shard_of(name, count):
+    """Shard of an image file name among `count`."""
+    digest = hashlib.sha256(os.path.basename(name).encode()).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+def select(paths, index, count):
+    """The paths of shard `index` of `count`, in their original order."""
+    return [p for p in paths if shard_of(p, count) == index]
+
+def manifest_path(output_root, index, count):
+    return os.path.join(output_root, SHARD_DIR, f"shard-{index:04d}-of-{count:04d}.json")
+
+def _model_files(model_dir):
+    """{relative path: size} of a model folder."""
+    files = {}
+    for dp, _, fns in os.walk(model_dir):
+        for fn in fns:
+            path = os.path.join(dp, fn)
+            files[os.path.relpath(path, model_dir)] = os.path.getsize(path)
+    return dict(sorted(files.items()))
+
+def write_manifest(records, output_root, index, count, images):
+    """Write the shard manifest (atomically) for the run's `records`; returns its path."""
+    models = []
+    for rec in records:
+        # a failure before the model was known (e.g. a crashed worker) has no model
+        model = rec.get("model")
+        entry = {
+            "image": os.path.basename(rec["image"]),
+            "model": model and os.path.relpath(model, output_root),
+            "ok":    rec["ok"] and model is not None,
+        }
+        for key in ("error", "cached", "variant"):
+            if rec.get(key) is not None:
+                entry[key] = rec[key]
+        if rec["ok"]:
+            entry["files"] = _model_files(rec["model"])
+        models.append(entry)
+    doc = {
+        "schema":   SCHEMA,
+        "shard":    index,
+        "count":    count,
+        "host":     platform.node(),
+        "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "images":   sorted(os.path.basename(p) for p in images),
+        "models":   models,
+    }
+    path = manifest_path(output_root, index, count)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(doc, f, indent=1)
+        f.write("\n")
+    os.replace(tmp, path)
+    return path
+
+# --- merge ---------------------------------------------------------------------
+
+def find_manifests(paths):
+    """Shard manifests among `paths`: manifest files or output roots."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found += sorted(glob.glob(os.path.join(path, SHARD_DIR, "shard-*-of-*.json")))
+        else:
+            found.append(path)
+    return found
+
+def merge(manifests, batch_dir=None, verify=False):
+    """
+    Validate shard manifests against each other and build the catalog.
+    Returns (catalog entries, [error messages], [failed models]).
+    """
+    errors, failed, catalog = [], [], []
+    shards, counts = {}, set()
+    for path in manifests:
+        with open(path) as f:
+            doc = json.load(f)
+        if doc.get("schema") != SCHEMA:
+            errors.append(f"{path}: unknown schema {doc.get('schema')!r}")
+            continue
+        counts.add(doc["count"])
+        if doc["shard"] in shards:
+            errors.append(f"shard {doc['shard']} twice: {shards[doc['shard']][0]} and {path}")
+            continue
+        shards[doc["shard"]] = (path, doc)
+    if len(counts) > 1:
+        errors.append(f"manifests disagree on the shard count: {sorted(counts)}")
+        return catalog, errors, failed
+    if not counts:
+        errors.append("no shard manifests found")
+        return catalog, errors, failed
+    count = counts.pop()
+    missing = sorted(set(range(count)) - set(shards))
+    if missing:
+        errors.append(f"missing shards of {count}: {', '.join(map(str, missing))}")
+
+    owner, models = {}, {}
+    for index, (path, doc) in sorted(shards.items()):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(path)))
+        for name in doc["images"]:
+            if shard_of(name, count) != index:
+                errors.append(f"{name}: in shard {index}, hashes to {shard_of(name, count)}")
+            if name in owner:
+                errors.append(f"{name}: in shards {owner[name]} and {index}")
+            owner[name] = index
+        for entry in doc["models"]:
+            if entry["image"] not in doc["images"]:
+                errors.append(f"{entry['model']}: image {entry['image']} not assigned to shard {index}")
+            if entry["model"] is not None:
+                if entry["model"] in models:
+                    errors.append(f"model {entry['model']} from shards "
+                                  f"{models[entry['model']]} and {index}")
+                models[entry["model"]] = index
+            if not entry["ok"]:
+                failed.append(dict(entry, shard=index))
+                continue
+            model_dir = os.path.join(root, entry["model"])
+            if verify:
+                for rel, size in entry["files"].items():
+                    fp = os.path.join(model_dir, rel)
+                    if not os.path.exists(fp) or os.path.getsize(fp) != size:
+                        errors.append(f"{entry['model']}: {rel} missing or changed")
+            catalog.append(dict(entry, shard=index, path=model_dir))
+
+    if batch_dir is not None:
+        from watch import is_image
+        names = {n for n in os.listdir(batch_dir) if is_image(n)}
+        lost = sorted(names - set(owner))
+        if lost and not missing:
+            errors.append(f"{len(lost)} images of {batch_dir} in no shard, e.g. {lost[0]}")
+    catalog.sort(key=lambda e: e["model"])
+    return catalog, errors, failed
+
+def main():
+    p = argparse.ArgumentParser(description="Combine shard manifests of a sharded batch")
+    sub = p.add_subparsers(dest="command", required=True)
+    m = sub.add_parser("merge", help="Validate shard manifests and write one catalog")
+    m.add_argument("paths", nargs="+",
+        help="Output roots (their shards/*.json) or shard manifest files")
+    m.add_argument("--catalog",
+        help=f"Catalog JSONL to write (default: <first root>/{CATALOG})")
+    m.add_argument("--batch-dir",
+        help="Input folder of the batch: check every image was in some shard")
+    m.add_argument("--verify", action="store_true",
+        help="Check every model file listed by the shards exists with its size")
+    m.add_argument("--allow-failed", action="store_true",
+        help="Exit 0 even when some models failed (they are left out of the catalog)")
+    args = p.parse_args()
+
+    manifests = find_manifests(args.paths)
+    catalog, errors, failed = merge(manifests, args.batch_dir, args.verify)
+    for e in errors:
+        print(f"❌ {e}")
+    for f in failed:
+        print(f"⚠️  shard {f['shard']}: {f['image']} failed: {f.get('error')}")
+    if errors:
+        sys.exit(1)
+    first = args.paths[0]
+    out = args.catalog or os.path.join(
+        first if os.path.isdir(first) else os.path.dirname(os.path.dirname(first)), CATALOG)
+    with open(out, "w") as f:
+        for entry in catalog:
+            f.write(json.dumps(entry) + "\n")
+    print(f"✅ {len(catalog)} models from {len(manifests)} shards → {out}")
+    if failed and not args.allow_failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# tests/conftest.py
+#
+# Runs main.py end to end against the native backend and the stub Blender
+# (benchmarks/stub_blender.py), so no Blender install is needed.
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB_BLENDER = os.path.join(ROOT, "benchmarks", "stub_blender.py")
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import synthetic_pixels, write_png
+
+@pytest.fixture
+def image(tmp_path):
+    """A 200x100 synthetic PNG."""
+    path = tmp_path / "in" / "img.png"
+    path.parent.mkdir()
+    write_png(str(path), synthetic_pixels(200, 100))
+    return str(path)
+
+def main_cmd(*args, backend="blender", blender=STUB_BLENDER):
+    """main.py with `args` on `backend` (Blender: the stub unless `blender`)."""
+    cmd = [sys.executable, os.path.join(ROOT, "main.py"), *map(str, args)]
+    return cmd + (["--backend", "native"] if backend == "native" else ["--blender", blender])
+
+def run_main(*args, backend="blender", blender=STUB_BLENDER, check=True):
+    """Run main_cmd(...) to completion; raises unless it exits 0 (with `check`)."""
+    proc = subprocess.run(main_cmd(*args, backend=backend, blender=blender), cwd=ROOT,
+                          capture_output=True, text=True, stdin=subprocess.DEVNULL)
+    if check and proc.returncode != 0:
+        raise AssertionError(f"main.py failed ({proc.returncode}):\n{proc.stdout}\n{proc.stderr}")
+    return proc
+
+def obj_vertices(path):
+    """Vertex positions of a Wavefront OBJ (the writers bake the object matrix)."""
+    with open(path) as f:
+        return np.array([line.split()[1:4] for line in f if line.startswith("v ")], dtype=float)
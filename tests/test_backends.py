@@ -0,0 +1,38 @@
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from conftest import obj_vertices, run_main
+
+SPECS = {
+    "box":      ["--width-cm", 10, "--depth-cm", 10, "--height-cm", 20, "--aspect", "free"],
+    "cylinder": ["--radius-cm", 5, "--height-cm", 20, "--aspect", "free"],
+}
+
+def _extents(tmp_path, image, primitive, backend):
+    out = tmp_path / backend / "model"
+    run_main("--image", image, "--output", out, "--primitive", primitive,
+             "--mesh-format", "obj", *SPECS[primitive], backend=backend)
+    (mesh,) = glob.glob(os.path.join(out, "meshes", f"{primitive}_*.obj"))
+    pts = obj_vertices(mesh)
+    return pts.min(axis=0), pts.max(axis=0)
+
+@pytest.mark.parametrize("primitive", sorted(SPECS))
+def test_backends_build_the_same_extents(tmp_path, image, primitive):
+    lo_b, hi_b = _extents(tmp_path, image, primitive, "blender")
+    lo_n, hi_n = _extents(tmp_path, image, primitive, "native")
+    np.testing.assert_allclose(lo_b, lo_n, atol=1e-6)
+    np.testing.assert_allclose(hi_b, hi_n, atol=1e-6)
+
+def test_blender_box_has_the_requested_size(tmp_path, image):
+    out = tmp_path / "model"
+    run_main("--image", image, "--output", out, "--primitive", "box", "--mesh-format", "obj",
+             "--width-cm", 10, "--depth-cm", 4, "--height-cm", 20, "--aspect", "free")
+    (mesh,) = glob.glob(os.path.join(out, "meshes", "box_*.obj"))
+    pts = obj_vertices(mesh)
+    # 10 x 4 x 20 cm, centred; the box is turned 90° about X (image face
+    # vertical), so the height runs along Y and the depth along Z
+    np.testing.assert_allclose(pts.min(axis=0), [-0.05, -0.1, -0.02], atol=1e-6)
+    np.testing.assert_allclose(pts.max(axis=0), [0.05, 0.1, 0.02], atol=1e-6)
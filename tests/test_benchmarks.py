@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+
+from benchmarks import corpus, run
+from primitives.imageinfo import image_size
+
+def test_corpus_is_deterministic_and_cycles_aspects(tmp_path):
+    a = corpus.make_corpus(tmp_path / "a", 3, long_px=120, aspects=(1.0, 1.5, 0.75), seed=4)
+    b = corpus.make_corpus(tmp_path / "b", 3, long_px=120, aspects=(1.0, 1.5, 0.75), seed=4)
+    assert [image_size(p) for p in a] == [(120, 120), (120, 80), (90, 120)]
+    for p, q in zip(a, b):
+        with open(p, "rb") as f, open(q, "rb") as g:
+            assert f.read() == g.read()
+    mtime = os.path.getmtime(a[0])
+    assert corpus.make_corpus(tmp_path / "a", 1, long_px=120, seed=4) == a[:1]
+    assert os.path.getmtime(a[0]) == mtime            # reused, not rewritten
+
+def test_compare_flags_throughput_drops(capsys):
+    res = lambda tput: {"throughput_per_s": tput, "latency_ms": {"p50": 10.0}}
+    baseline = {"results": {"box/native": res(10.0), "cyl/native": res(10.0)}}
+    new = {"box/native": res(9.0), "cyl/native": res(5.0), "box/stub": res(1.0)}
+    assert run.compare(new, baseline, tolerance=0.15) == ["cyl/native"]
+    assert "(new)" in capsys.readouterr().out
+
+def test_harness_writes_comparable_results(tmp_path):
+    out = tmp_path / "bench.json"
+    cmd = [sys.executable, os.path.join(ROOT, "benchmarks", "run.py"),
+           "--backends", "native", "stub", "--primitives", "box", "cylinder",
+           "--sizes", 64, "--count", 2, "--repeat", 1, "--workdir", tmp_path / "work"]
+    cmd = [str(c) for c in cmd]
+    subprocess.run(cmd + ["--out", str(out)], cwd=ROOT, check=True, capture_output=True)
+    with open(out) as f:
+        report = json.load(f)
+    assert report["schema"] == run.SCHEMA
+    assert sorted(report["results"]) == [
+        "box/native/j1/png64", "box/stub/j1/png64",
+        "cylinder/native/j1/png64", "cylinder/stub/j1/png64"]
+    for res in report["results"].values():
+        assert (res["images"], res["failed"]) == (2, 0)
+        assert res["throughput_per_s"] > 0 and res["latency_ms"]["p50"] > 0
+
+    proc = subprocess.run(cmd + ["--baseline", str(out), "--tolerance", "100",
+                                 "--fail-on-regression"],
+                          cwd=ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0 and "box/stub/j1/png64" in proc.stdout
@@ -0,0 +1,76 @@
+import glob
+import os
+
+import pytest
+
+from conftest import run_main
+
+from cache import ResultCache
+
+def files(path):
+    return sorted(os.path.relpath(os.path.join(dp, fn), path)
+                  for dp, _, fns in os.walk(path) for fn in fns)
+
+def build(image, out, cache, width, *extra, batch=False):
+    where = (["--batch-dir", os.path.dirname(image), "--output", out] if batch
+             else ["--image", image, "--output", os.path.join(out, "img")])
+    return run_main(*where, "--cache", cache, "--width-cm", width, "--height-cm", 5,
+                    *extra, backend="native").stdout
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_rebuild_and_restore_keep_only_one_runs_files(tmp_path, image, batch):
+    out, cache = tmp_path / "out", tmp_path / "cache"
+    build(image, out, cache, 11, batch=batch)
+    build(image, out, cache, 10, batch=batch)
+    expected = ["meshes/box_0p1x0p05x0p05.dae", "meshes/texture_0p1x0p05x0p05.png",
+                "model.config", "model.sdf"]
+    assert files(out / "img") == expected
+    entries = sorted(glob.glob(os.path.join(cache, "*", "*")))
+    assert len(entries) == 2
+    assert sorted(files(e)[0] for e in entries) == [
+        "meshes/box_0p11x0p055x0p05.dae", "meshes/box_0p1x0p05x0p05.dae"]
+    assert all(len(files(e)) == 4 for e in entries)
+
+    assert "Cached" in build(image, out, cache, 11, batch=batch)
+    assert files(out / "img") == [f.replace("0p1x0p05x", "0p11x0p055x") for f in expected]
+    assert os.listdir(out) == ["img"]            # no build or restore folders left
+
+def test_library_hit_needs_the_library_meshes(tmp_path, image):
+    out, cache, lib = tmp_path / "out", tmp_path / "cache", tmp_path / "lib"
+    build(image, out, cache, 10, "--mesh-library", lib)
+    assert "Cached" in build(image, out, cache, 10, "--mesh-library", lib)
+    for path in glob.glob(os.path.join(lib, "meshes", "*")):
+        os.remove(path)
+    assert "Cached" not in build(image, out, cache, 10, "--mesh-library", lib)
+    assert glob.glob(os.path.join(lib, "meshes", "box_*_full.dae"))
+
+def test_force_rebuilds_and_batch_reruns_hit(tmp_path, image):
+    out, cache = tmp_path / "out", tmp_path / "cache"
+    build(image, out, cache, 10, batch=True)
+    assert "(1 from cache, 0 failed)" in build(image, out, cache, 10, batch=True)
+    assert "(0 from cache, 0 failed)" in build(image, out, cache, 10, "--force", batch=True)
+    assert "(1 from cache, 0 failed)" in build(image, out, cache, 10, batch=True)
+
+def test_key_follows_image_dims_and_options(tmp_path, image):
+    cache = ResultCache(tmp_path / "cache")
+    key = lambda spec, opts=None: cache.key(image, "box", spec, "native", "img", opts)
+    base = key({"width_cm": 10})
+    assert key({"width_cm": 10}) == base
+    assert key({"width_cm": 11}) != base
+    assert key({"width_cm": 10}, {"mass": 2.0}) != base
+    with open(image, "ab") as f:
+        f.write(b"\0")
+    assert key({"width_cm": 10}) != base
+
+def test_evict_drops_least_recently_used_entries(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=2500)
+    for n, key in enumerate(("aa01", "bb02", "cc03")):
+        model = tmp_path / key
+        model.mkdir()
+        (model / "model.sdf").write_bytes(b"x" * 1000)
+        cache.store(key, str(model))
+        os.utime(cache._entry(key), (n, n))
+    assert cache.restore("aa01", str(tmp_path / "restored"))    # now the most recent
+    assert cache.evict() == 1
+    assert not os.path.isdir(cache._entry("bb02"))
+    assert os.path.isdir(cache._entry("aa01")) and os.path.isdir(cache._entry("cc03"))
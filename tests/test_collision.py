@@ -0,0 +1,41 @@
+import glob
+import os
+import re
+
+import numpy as np
+import pytest
+
+from conftest import obj_vertices, run_main
+
+def _model(tmp_path, image, backend, primitive, *dims):
+    out = tmp_path / backend / primitive
+    run_main("--image", image, "--output", out, "--primitive", primitive,
+             "--mesh-format", "obj", "--mass", 2.0, "--aspect", "free", *dims,
+             backend=backend)
+    (mesh,) = glob.glob(os.path.join(out, "meshes", f"{primitive}_*.obj"))
+    pts = obj_vertices(mesh)
+    with open(os.path.join(out, "model.sdf")) as f:
+        return pts.max(axis=0) - pts.min(axis=0), f.read()
+
+def _floats(pattern, sdf):
+    return [float(v) for v in re.search(pattern, sdf).group(1).split()]
+
+@pytest.mark.parametrize("backend", ["blender", "native"])
+def test_box_collision_and_inertia_match_the_visual(tmp_path, image, backend):
+    extent, sdf = _model(tmp_path, image, backend, "box",
+                         "--width-cm", 10, "--depth-cm", 4, "--height-cm", 20)
+    size = _floats(r"<box><size>([^<]+)</size>", sdf)
+    np.testing.assert_allclose(size, extent, rtol=1e-5)
+    a, b, c = extent
+    inertia = [_floats(rf"<{k}>([^<]+)</{k}>", sdf)[0] for k in ("ixx", "iyy", "izz")]
+    np.testing.assert_allclose(inertia, [2.0 / 12 * (b * b + c * c),
+                                         2.0 / 12 * (a * a + c * c),
+                                         2.0 / 12 * (a * a + b * b)], rtol=1e-5)
+
+@pytest.mark.parametrize("backend", ["blender", "native"])
+def test_cylinder_collision_matches_the_visual(tmp_path, image, backend):
+    extent, sdf = _model(tmp_path, image, backend, "cylinder",
+                         "--radius-cm", 5, "--height-cm", 20)
+    radius = _floats(r"<radius>([^<]+)</radius>", sdf)[0]
+    length = _floats(r"<length>([^<]+)</length>", sdf)[0]
+    np.testing.assert_allclose([2 * radius, 2 * radius, length], extent, rtol=1e-5)
@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from conftest import run_main
+
+from primitives import dimensions
+
+@pytest.mark.parametrize("tol", ["0", "-1", "abc"])
+def test_chord_tolerance_must_be_positive(image, tol):
+    proc = run_main("--image", image, "--output", "unused", "--primitive", "cylinder",
+                    "--chord-tol-mm", tol, backend="native", check=False)
+    assert proc.returncode == 2
+    assert "--chord-tol-mm: wants a number > 0" in proc.stderr
+
+def test_chord_segments():
+    assert dimensions.cylinder_segments(0.05, {}) == (dimensions.DEFAULT_SEGMENTS, [])
+    assert dimensions.cylinder_segments(0.05, {"chord_tol_mm": 0.5, "lods": 2}) == (23, [11, 8])
+    with pytest.raises(ValueError, match="chord_tol_mm must be > 0"):
+        dimensions.cylinder_segments(0.05, {"chord_tol_mm": 0})
+
+def test_manifest_rows_override_cli_flags_with_a_warning(tmp_path, image):
+    manifest = tmp_path / "dims.csv"
+    manifest.write_text("image,width_cm\nimg,12\n")
+    out = tmp_path / "model"
+    proc = run_main("--image", image, "--output", out, "--dims-manifest", manifest,
+                    "--width-cm", 10, "--height-cm", 5, backend="native")
+    assert "--width-cm is overridden by the --dims-manifest row of 1 image(s): img" in proc.stdout
+    assert os.path.exists(out / "meshes" / "box_0p12x0p06x0p05.dae")
+
+def test_matching_manifest_rows_do_not_warn(tmp_path, image):
+    manifest = tmp_path / "dims.csv"
+    manifest.write_text("image,width_cm\nimg,10\n")
+    proc = run_main("--image", image, "--output", tmp_path / "model", "--dims-manifest",
+                    manifest, "--width-cm", 10, "--height-cm", 5, backend="native")
+    assert "overridden" not in proc.stdout
@@ -0,0 +1,70 @@
+import glob
+import os
+import shutil
+
+import pytest
+
+from conftest import run_main
+
+from primitives.fileops import dedup, place, replace_tree
+
+@pytest.fixture
+def src(tmp_path):
+    path = tmp_path / "src.bin"
+    path.write_bytes(b"mesh" * 64)
+    return path
+
+def test_link_shares_the_inode(tmp_path, src):
+    dst = place(str(src), str(tmp_path / "dst.bin"), "link")
+    assert os.path.samefile(src, dst) and os.stat(src).st_nlink == 2
+
+@pytest.mark.parametrize("mode", ["copy", "reflink"])
+def test_copies_are_separate_files(tmp_path, src, mode):
+    dst = place(str(src), str(tmp_path / "dst.bin"), mode)
+    assert not os.path.samefile(src, dst)
+    with open(dst, "rb") as f:
+        assert f.read() == src.read_bytes()
+
+def test_move_renames(tmp_path, src):
+    dst = place(str(src), str(tmp_path / "dst.bin"), "move")
+    assert not src.exists() and os.stat(dst).st_nlink == 1
+
+def test_replacing_a_linked_file_leaves_the_other_link_intact(tmp_path, src):
+    dst = tmp_path / "dst.bin"
+    place(str(src), str(dst), "link")
+    new = tmp_path / "new.bin"
+    new.write_bytes(b"other")
+    place(str(new), str(dst), "copy")
+    assert src.read_bytes() == b"mesh" * 64 and dst.read_bytes() == b"other"
+
+def test_replace_tree(tmp_path):
+    old, new = tmp_path / "model", tmp_path / "build"
+    (old / "meshes").mkdir(parents=True)
+    (old / "meshes" / "stale.dae").write_text("old")
+    new.mkdir()
+    (new / "model.sdf").write_text("new")
+    replace_tree(str(new), str(old))
+    assert sorted(os.listdir(tmp_path)) == ["model"]
+    assert os.listdir(old) == ["model.sdf"]
+
+def test_dedup_keeps_one_file_per_content(tmp_path):
+    store = tmp_path / "store"
+    paths = []
+    for name, data in (("a.png", b"same"), ("b.png", b"same"), ("c.png", b"other")):
+        paths.append(tmp_path / name)
+        paths[-1].write_bytes(data)
+        assert dedup(str(paths[-1]), str(store))
+    assert os.path.samefile(paths[0], paths[1])
+    assert not os.path.samefile(paths[0], paths[2])
+    assert len(os.listdir(store)) == 2 and os.stat(paths[0]).st_nlink == 3
+
+def test_texture_store_shares_textures_across_models(tmp_path, image):
+    shutil.copy(image, os.path.join(os.path.dirname(image), "twin.png"))
+    out, store = tmp_path / "out", tmp_path / "textures"
+    run_main("--batch-dir", os.path.dirname(image), "--output", out, "--width-cm", 10,
+             "--height-cm", 5, "--texture-store", store, backend="native")
+    (a,) = glob.glob(os.path.join(out, "img", "meshes", "texture_*"))
+    (b,) = glob.glob(os.path.join(out, "twin", "meshes", "texture_*"))
+    assert os.path.samefile(a, b) and os.stat(a).st_nlink == 3
+    assert len(os.listdir(store)) == 1
+    assert sorted(os.listdir(out)) == ["img", "twin"]      # no build folders left
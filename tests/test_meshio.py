@@ -0,0 +1,94 @@
+import glob
+import json
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from conftest import obj_vertices, run_main
+
+from primitives.geometry import box_mesh, cylinder_mesh
+from primitives.meshio import mesh_files, write_mesh
+
+def read_glb(path):
+    """(glTF JSON, binary chunk) of a GLB file, checking its framing."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, length = struct.unpack_from("<III", data)
+    assert (magic, version, length) == (0x46546C67, 2, len(data))
+    js_len, js_type = struct.unpack_from("<II", data, 12)
+    assert js_type == 0x4E4F534A and js_len % 4 == 0
+    gltf = json.loads(data[20:20 + js_len])
+    bin_len, bin_type = struct.unpack_from("<II", data, 20 + js_len)
+    assert bin_type == 0x004E4942 and bin_len == gltf["buffers"][0]["byteLength"]
+    return gltf, data[28 + js_len:28 + js_len + bin_len]
+
+def view_bytes(gltf, blob, index):
+    view = gltf["bufferViews"][index]
+    return blob[view["byteOffset"]:view["byteOffset"] + view["byteLength"]]
+
+@pytest.mark.parametrize("mesh, corners, default_tris, image_tris", [
+    (box_mesh(0.1, 0.04, 0.2), 24, 10, 2),
+    (cylinder_mesh(0.03, 0.1, segments=16), 16 * 4 + 2 * 16, 2 * 14, 2 * 16),
+])
+def test_glb_accessor_counts(tmp_path, image, mesh, corners, default_tris, image_tris):
+    path = str(tmp_path / "mesh.glb")
+    write_mesh(mesh, path, image)
+    gltf, blob = read_glb(path)
+    (prim_default, prim_image) = gltf["meshes"][0]["primitives"]
+    attrs = prim_default["attributes"]
+    assert attrs == prim_image["attributes"]
+    acc = gltf["accessors"]
+    assert [acc[attrs[k]]["count"] for k in ("POSITION", "NORMAL", "TEXCOORD_0")] == [corners] * 3
+    assert acc[prim_default["indices"]]["count"] == 3 * default_tris
+    assert acc[prim_image["indices"]]["count"] == 3 * image_tris
+    for a in acc:
+        view = gltf["bufferViews"][a["bufferView"]]
+        width = {"SCALAR": 1, "VEC2": 2, "VEC3": 3}[a["type"]]
+        assert view["byteLength"] == 4 * width * a["count"]
+    # the texture is embedded byte for byte
+    (img,) = gltf["images"]
+    with open(image, "rb") as f:
+        assert view_bytes(gltf, blob, img["bufferView"]) == f.read()
+    assert img["mimeType"] == "image/png"
+
+def test_glb_positions_match_the_mesh(tmp_path):
+    mesh = box_mesh(0.1, 0.04, 0.2)
+    path = str(tmp_path / "box.glb")
+    write_mesh(mesh, path)
+    gltf, blob = read_glb(path)
+    pos = gltf["accessors"][gltf["meshes"][0]["primitives"][0]["attributes"]["POSITION"]]
+    pts = np.frombuffer(view_bytes(gltf, blob, pos["bufferView"]), "<f4").reshape(-1, 3)
+    np.testing.assert_allclose(pos["min"], pts.min(axis=0))
+    np.testing.assert_allclose(pts.max(axis=0), [0.05, 0.02, 0.1], atol=1e-7)
+    assert "images" not in gltf
+
+def test_obj_and_mtl(tmp_path, image):
+    mesh = box_mesh(0.1, 0.04, 0.2)
+    path = str(tmp_path / "box.obj")
+    write_mesh(mesh, path, image)
+    assert mesh_files(path) == [path, str(tmp_path / "box.mtl")]
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert "mtllib box.mtl" in lines
+    assert sum(line.startswith("f ") for line in lines) == 6
+    with open(tmp_path / "box.mtl") as f:
+        assert f"map_Kd {os.path.basename(image)}" in f.read()
+    pts = obj_vertices(path)
+    np.testing.assert_allclose(pts.max(axis=0) - pts.min(axis=0), [0.1, 0.2, 0.04], atol=1e-6)
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported mesh format"):
+        write_mesh(box_mesh(1, 1, 1), str(tmp_path / "box.stl"))
+
+@pytest.mark.parametrize("backend", ["blender", "native"])
+@pytest.mark.parametrize("fmt", ["glb", "obj"])
+def test_models_reference_the_chosen_format(tmp_path, image, backend, fmt):
+    out = tmp_path / "model"
+    run_main("--image", image, "--output", out, "--width-cm", 10, "--height-cm", 5,
+             "--mesh-format", fmt, backend=backend)
+    (mesh,) = glob.glob(os.path.join(out, "meshes", f"box_*.{fmt}"))
+    assert not glob.glob(os.path.join(out, "meshes", "*.dae"))
+    with open(out / "model.sdf") as f:
+        assert f"model://model/meshes/{os.path.basename(mesh)}" in f.read()
@@ -0,0 +1,30 @@
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from conftest import obj_vertices, run_main
+
+BOX = ["--primitive", "box", "--width-cm", 10, "--depth-cm", 4, "--height-cm", 20,
+       "--aspect", "free", "--mesh-format", "obj"]
+
+@pytest.mark.parametrize("backend", ["blender", "native"])
+def test_library_meshes_follow_the_format_and_the_visual_size(tmp_path, image, backend):
+    plain = tmp_path / "plain"
+    run_main("--image", image, "--output", plain, *BOX, backend=backend)
+    (visual,) = glob.glob(os.path.join(plain, "meshes", "box_*.obj"))
+
+    lib, model = tmp_path / "lib", tmp_path / "models" / "img"
+    run_main("--image", image, "--output", model, "--mesh-library", lib, *BOX,
+             backend=backend)
+    (full,) = glob.glob(os.path.join(lib, "meshes", "box_*_full.obj"))
+    assert os.path.exists(full[:-4] + ".mtl")
+    # the wrapper exported no mesh of its own
+    assert not glob.glob(os.path.join(model, "**", "*.obj"), recursive=True)
+    with open(os.path.join(model, "model.sdf")) as f:
+        assert os.path.basename(full).replace("_full", "_body") in f.read()
+
+    a, b = obj_vertices(visual), obj_vertices(full)
+    np.testing.assert_allclose(a.max(axis=0) - a.min(axis=0),
+                               b.max(axis=0) - b.min(axis=0), atol=1e-6)
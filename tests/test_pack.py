@@ -0,0 +1,49 @@
+import os
+import tarfile
+
+import numpy as np
+from conftest import run_main
+
+import pack
+
+def test_digest_keeps_trailing_nul_bytes(tmp_path):
+    digest = bytes(range(1, 31)) + b"\0\0"
+    rec = (pack.name_key("m"), 0, 0, b"m", 1, b"\0" * 3, 1, (1, 1, 1), 1.0,
+           np.frombuffer(digest, "u1"))
+    archive = str(tmp_path / "set.tar")
+    pack.write_index(pack.index_path(archive), [rec], 0)
+    (stored,) = pack.PackIndex(archive).records
+    assert bytes(stored["digest"]) == digest
+    assert pack.describe(stored)["sha256"] == digest.hex()
+
+def test_build_and_verified_extract(tmp_path, image):
+    model = tmp_path / "models" / "img"
+    run_main("--image", image, "--output", model, "--width-cm", 10, "--height-cm", 5,
+             backend="native")
+    archive = str(tmp_path / "set.tar")
+    assert pack.build(str(model.parent), archive) == 1
+    (rec,) = pack.PackIndex(archive).records
+    assert len(pack.describe(rec)["sha256"]) == 64
+    (path,) = pack.extract(archive, ["img"], str(tmp_path / "x"), verify=True)
+    assert sorted(os.listdir(path)) == sorted(os.listdir(model))
+
+def test_hard_linked_files_stay_in_each_models_range(tmp_path):
+    root = tmp_path / "models"
+    for name in ("a", "b"):
+        (root / name / "meshes").mkdir(parents=True)
+        (root / name / "model.config").write_text(f"<model><name>{name}</name></model>")
+    (root / "a" / "meshes" / "t.png").write_bytes(b"texture" * 100)
+    os.link(root / "a" / "meshes" / "t.png", root / "b" / "meshes" / "t.png")
+    archive, small = str(tmp_path / "s.tar"), str(tmp_path / "small.tar")
+    pack.build(str(root), archive)
+
+    (path,) = pack.extract(archive, ["b"], str(tmp_path / "x"), verify=True)
+    with open(os.path.join(path, "meshes", "t.png"), "rb") as f:
+        assert f.read() == b"texture" * 100
+
+    pack.subset(archive, ["b"], small)
+    with tarfile.open(small) as tar:
+        members = tar.getmembers()
+        assert all(m.isreg() for m in members)
+        tar.extractall(tmp_path / "y")
+    assert (tmp_path / "y" / "b" / "meshes" / "t.png").read_bytes() == b"texture" * 100
@@ -0,0 +1,73 @@
+import json
+import math
+import os
+
+import numpy as np
+import pytest
+
+from conftest import run_main
+
+import rendering
+from primitives import camera
+
+def test_poses_look_at_the_origin_and_fit_the_object():
+    fov, radius = math.radians(50), 0.2
+    poses = camera.view_poses(6, radius, fov, 320, 240, seed=3)
+    assert len(poses) == 6
+    K = camera.intrinsics(fov, 320, 240)
+    for loc, euler in poses:
+        m = camera.euler_matrix(loc, euler)
+        forward = m[:3, :3] @ [0, 0, -1]
+        np.testing.assert_allclose(forward, -np.array(loc) / np.linalg.norm(loc), atol=1e-9)
+        np.testing.assert_allclose(camera.project([[0, 0, 0]], m, K), [[160, 120]], atol=1e-9)
+        # the bounding sphere stays inside the image
+        sphere = radius * np.array([[1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0],
+                                    [0, 0, 1], [0, 0, -1]])
+        x0, y0, x1, y1 = camera.bbox_2d(sphere, m, K, 320, 240)
+        assert 0 < x0 < x1 < 320 and 0 < y0 < y1 < 240
+
+def test_points_behind_the_camera_have_no_box():
+    m = camera.euler_matrix((0, 0, 1), (0, 0, 0))        # looking down -Z from z = 1
+    assert camera.bbox_2d([[0, 0, 2]], m, camera.intrinsics(1.0, 64, 64), 64, 64) is None
+
+@pytest.mark.parametrize("text, size", [("256", (256, 256)), ("320x240", (320, 240))])
+def test_parse_resolution(text, size):
+    assert rendering.parse_resolution(text) == size
+
+def test_render_labels(tmp_path, image):
+    out = tmp_path / "out"
+    run_main("--image", image, "--output", out, "--width-cm", 20, "--height-cm", 10,
+             "--depth-cm", 4, "--aspect", "free", "--render-views", 3,
+             "--render-size", "320x240", "--seed", 5)
+    root = out / rendering.RENDER_DIR
+    with open(root / rendering.LABELS) as f:
+        labels = [json.loads(line) for line in f]
+    with open(root / "img" / rendering.LABELS) as f:
+        assert [json.loads(line) for line in f] == labels
+    assert [rec["view"] for rec in labels] == [0, 1, 2]
+
+    fov = math.radians(labels[0]["camera"]["fov_deg"])
+    K = camera.intrinsics(fov, 320, 240)
+    w, d, h = (labels[0]["dims"][k] for k in ("width", "depth", "height"))
+    corners = np.array(np.meshgrid([-w / 2, w / 2], [-d / 2, d / 2], [-h / 2, h / 2],
+                                   indexing="ij")).reshape(3, -1).T
+    for rec in labels:
+        assert (rec["width"], rec["height"], rec["samples"]) == (320, 240, 16)
+        for key in ("rgb", "mask", "depth"):
+            assert os.path.exists(root / rec[key])
+        cam = rec["camera"]
+        np.testing.assert_allclose(cam["K"], K, atol=1e-5)
+        world_from_camera = camera.euler_matrix(cam["location"], cam["rotation_euler"])
+        np.testing.assert_allclose(cam["world_from_camera"], world_from_camera, atol=1e-5)
+        # the label box is the projection of the object's corners
+        (obj,) = rec["objects"]
+        m = np.array(obj["world_from_object"])
+        pts = corners @ m[:3, :3].T + m[:3, 3]
+        np.testing.assert_allclose(
+            rec["bbox"], camera.bbox_2d(pts, world_from_camera, K, 320, 240), atol=0.05)
+
+def test_renders_cannot_use_the_cache(tmp_path, image):
+    proc = run_main("--image", image, "--output", tmp_path / "out", "--width-cm", 10,
+                    "--height-cm", 5, "--render-views", 1, "--cache", tmp_path / "cache",
+                    check=False)
+    assert proc.returncode == 2 and "cannot be combined with --cache" in proc.stderr
@@ -0,0 +1,37 @@
+import json
+import os
+
+import pytest
+
+from conftest import run_main
+
+import shard
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_failing_shard_records_every_expected_model(tmp_path, image, jobs):
+    other = os.path.join(os.path.dirname(image), "other.png")
+    with open(image, "rb") as src, open(other, "wb") as dst:
+        dst.write(src.read())
+    out = tmp_path / "out"
+    proc = run_main("--batch-dir", os.path.dirname(image), "--output", out,
+                    "--shard", "0/1", "-j", jobs, "--variants", 2, "--width-cm", 10, "--height-cm", 5,
+                    blender=str(tmp_path / "no-such-blender"), check=False)
+    assert proc.returncode == 1
+
+    with open(shard.manifest_path(str(out), 0, 1)) as f:
+        doc = json.load(f)
+    assert sorted(m["model"] for m in doc["models"]) == [
+        "img_v000", "img_v001", "other_v000", "other_v001"]
+    assert not any(m["ok"] for m in doc["models"])
+    assert all("FileNotFoundError" in m["error"] for m in doc["models"])
+    assert all(m["variant"]["index"] in (0, 1) for m in doc["models"])
+
+    catalog, errors, failed = shard.merge(shard.find_manifests([str(out)]))
+    assert (catalog, errors, len(failed)) == ([], [], 4)
+
+def test_manifest_accepts_records_without_a_model(tmp_path):
+    records = [{"image": str(tmp_path / "a.png"), "ok": False, "error": "boom"}]
+    path = shard.write_manifest(records, str(tmp_path), 0, 1, [records[0]["image"]])
+    with open(path) as f:
+        (entry,) = json.load(f)["models"]
+    assert entry == {"image": "a.png", "model": None, "ok": False, "error": "boom"}
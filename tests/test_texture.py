@@ -0,0 +1,66 @@
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from conftest import run_main
+
+import texture
+
+Image = pytest.importorskip("PIL.Image")     # the texture stage needs Pillow
+
+@pytest.mark.parametrize("size, max_px, pot, plan", [
+    ((200, 100), None, "none", ((200, 100), (200, 100))),
+    ((200, 100), 128,  "none", ((128, 64), (128, 64))),
+    ((200, 100), None, "pad",  ((200, 100), (256, 128))),
+    ((200, 100), None, "scale", ((256, 128), (256, 128))),
+    ((200, 100), 100,  "pad",  ((64, 32), (64, 32))),
+    ((3000, 1000), 1024, "scale", ((1024, 256), (1024, 256))),
+])
+def test_plan_size(size, max_px, pot, plan):
+    assert texture.plan_size(*size, max_px, pot) == plan
+
+def image_uvs(path):
+    """(min, max) texture coordinates of the OBJ faces using ImageMat."""
+    uvs, used, mat = [], set(), None
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if parts[:1] == ["vt"]:
+                uvs.append([float(v) for v in parts[1:3]])
+            elif parts[:1] == ["usemtl"]:
+                mat = parts[1]
+            elif parts[:1] == ["f"] and mat == "ImageMat":
+                used.update(int(c.split("/")[1]) - 1 for c in parts[1:])
+    uv = np.array(uvs)[sorted(used)]
+    return uv.min(axis=0), uv.max(axis=0)
+
+@pytest.mark.parametrize("backend", ["blender", "native"])
+def test_padded_texture_mipmaps_and_uvs(tmp_path, image, backend):
+    out = tmp_path / "model"
+    run_main("--image", image, "--output", out, "--width-cm", 10, "--height-cm", 5,
+             "--pot", "pad", "--mipmaps", "--mesh-format", "obj", backend=backend)
+    meshes = out / "meshes"
+    (tex,) = [p for p in glob.glob(os.path.join(meshes, "texture_*.png"))
+              if "_mip" not in os.path.basename(p)]
+    with Image.open(tex) as im:
+        assert im.size == (256, 128)
+    mips = sorted(glob.glob(os.path.join(meshes, "texture_*_mip*.png")),
+                  key=lambda p: int(p.rsplit("mip", 1)[1][:-4]))
+    sizes = [Image.open(p).size for p in mips]
+    assert sizes == [(128 >> k or 1, 64 >> k or 1) for k in range(8)]
+
+    # the 200 x 100 image covers the bottom-left of the padded canvas
+    (mesh,) = glob.glob(os.path.join(meshes, "box_*.obj"))
+    lo, hi = image_uvs(mesh)
+    np.testing.assert_allclose(lo, [0, 0], atol=1e-6)
+    np.testing.assert_allclose(hi, [200 / 256, 100 / 128], atol=1e-6)
+
+def test_reencoded_jpeg_texture(tmp_path, image):
+    out = tmp_path / "model"
+    run_main("--image", image, "--output", out, "--width-cm", 10, "--height-cm", 5,
+             "--max-texture", 64, "--texture-format", "jpeg", backend="native")
+    (tex,) = glob.glob(os.path.join(out, "meshes", "texture_*"))
+    with Image.open(tex) as im:
+        assert (im.format, im.size) == ("JPEG", (64, 32))
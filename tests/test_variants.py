@@ -0,0 +1,60 @@
+import filecmp
+import json
+import os
+import shutil
+
+from conftest import run_main
+
+import variants
+
+VARIANTS = ["--variants", 3, "--variant-primitives", "box", "cylinder", "--width-cm", 10,
+            "--height-cm", 5, "--radius-cm", 3, "--mesh-format", "obj"]
+
+def build(image, out, seed, *extra):
+    run_main("--batch-dir", os.path.dirname(image), "--output", out, "--seed", seed,
+             *VARIANTS, *extra)
+    with open(out / variants.MANIFEST) as f:
+        rows = [json.loads(line) for line in f]
+    for row in rows:
+        row["model"] = os.path.basename(row["model"])
+    return rows
+
+def same_tree(a, b):
+    cmp = filecmp.dircmp(a, b, ignore=[variants.MANIFEST])
+    def walk(c):
+        assert not (c.left_only or c.right_only or c.diff_files or c.funny_files), c.report()
+        for sub in c.subdirs.values():
+            walk(sub)
+    walk(cmp)
+
+def test_same_seed_gives_the_same_models(tmp_path, image):
+    shutil.copy(image, os.path.join(os.path.dirname(image), "other.png"))
+    a = build(image, tmp_path / "a", 7)
+    b = build(image, tmp_path / "b", 7, "-j", 2)       # worker count does not matter
+    assert a == b and len(a) == 6 and all(r["ok"] for r in a)
+    # OBJ carries no timestamps (COLLADA does), so the files compare byte for byte
+    same_tree(tmp_path / "a", tmp_path / "b")
+    assert build(image, tmp_path / "c", 8) != a
+
+def test_variant_params_are_reproducible_and_in_range():
+    for k in range(20):
+        p = variants.variant_params(3, "img", k, ["box", "cylinder"], 0.1, 0.2)
+        assert p == variants.variant_params(3, "img", k, ["box", "cylinder"], 0.1, 0.2)
+        assert p["primitive"] in ("box", "cylinder")
+        assert all(0.9 <= j <= 1.1 for j in p["jitter"])
+        assert all(0.8 <= t <= 1.2 for t in p["uv_tile"])
+        assert all(-0.1 <= o <= 0.1 for o in p["uv_offset"])
+        assert 0.2 <= p["roughness"] <= 0.9
+    assert variants.variant_params(3, "img", 0, ["box"]) != variants.variant_params(
+        3, "img", 1, ["box"])
+
+def test_variant_models_carry_their_parameters(tmp_path, image):
+    (row, *_) = build(image, tmp_path / "out", 7)
+    model = tmp_path / "out" / row["model"]
+    with open(model / "model.sdf") as f:
+        sdf = f.read()
+    assert f"<{row['variant']['primitive']}>" in sdf      # analytic collision shape
+    (mtl,) = [fn for fn in os.listdir(model / "meshes") if fn.endswith(".mtl")]
+    with open(model / "meshes" / mtl) as f:
+        kd = f.read().split("newmtl DefaultMat")[1].split("Kd ")[1].split()[:3]
+    assert [float(v) for v in kd] == row["variant"]["body_color"][:3]
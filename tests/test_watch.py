@@ -0,0 +1,80 @@
+import os
+import signal
+import subprocess
+import time
+
+import pytest
+
+from conftest import ROOT, main_cmd
+
+import watch
+from benchmarks.corpus import synthetic_pixels, write_png
+
+def wait_for(cond, timeout=20.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if cond():
+            return True
+        time.sleep(0.05)
+    return False
+
+@pytest.mark.parametrize("inotify", [True, False])
+def test_watcher_waits_for_files_to_settle(tmp_path, inotify):
+    watcher = watch.DirectoryWatcher(tmp_path, settle=0.3, poll=0.05, inotify=inotify)
+    try:
+        (tmp_path / ".partial.png").write_bytes(b"x")
+        (tmp_path / "notes.txt").write_bytes(b"x")
+        growing = tmp_path / "a.png"
+        growing.write_bytes(b"x")
+        t0, ready = time.monotonic(), []
+        while not ready and time.monotonic() - t0 < 5:
+            if time.monotonic() - t0 < 0.5:
+                with open(growing, "ab") as f:       # still being written
+                    f.write(b"x")
+            ready = watcher.wait(0.05)
+        assert ready == [str(growing)]
+        assert time.monotonic() - t0 >= 0.5 + 0.3 - 0.1
+        assert watcher.wait(0.4) == []                # handed out once
+    finally:
+        watcher.close()
+
+def test_finish_input_moves_or_tags(tmp_path):
+    ok, bad, tagged = (tmp_path / n for n in ("ok.png", "bad.png", "tag.png"))
+    for path in (ok, bad, tagged):
+        path.write_bytes(b"x")
+    watch.finish_input(str(ok), {"ok": True})
+    watch.finish_input(str(bad), {"ok": False, "error": "boom"})
+    watch.finish_input(str(tagged), {"ok": True}, mode="tag")
+    assert (tmp_path / "processed" / "ok.png").exists()
+    assert (tmp_path / "failed" / "bad.png").exists()
+    assert tagged.exists() and watch.is_tagged(str(tagged))
+
+def test_image_record_fails_if_any_variant_fails(tmp_path):
+    img = str(tmp_path / "a.png")
+    records = [{"image": img, "model": "a_v000", "ok": True},
+               {"image": img, "model": "a_v001", "ok": False, "error": "boom"}]
+    rec = watch.image_record(img, records)
+    assert (rec["ok"], rec["error"], rec["models"]) == (False, "boom", ["a_v000", "a_v001"])
+    assert watch.image_record(str(tmp_path / "b.png"), records)["error"] == "no result"
+
+def test_watch_mode_builds_models_as_images_land(tmp_path):
+    inbox, out = tmp_path / "inbox", tmp_path / "out"
+    inbox.mkdir()
+    proc = subprocess.Popen(
+        main_cmd("--watch", inbox, "--output", out, "--settle", 0.2, "--poll", 0.05,
+                 "--width-cm", 10, "--height-cm", 5, backend="native"),
+        cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        for name in ("a", "b"):
+            # written next to the inbox and renamed in, as capture tools do
+            tmp = str(tmp_path / f"{name}.png")
+            write_png(tmp, synthetic_pixels(200, 100))
+            os.replace(tmp, inbox / f"{name}.png")
+        done = lambda: all((inbox / "processed" / f"{n}.png").exists() for n in "ab")
+        assert wait_for(done)
+    finally:
+        proc.send_signal(signal.SIGINT)
+        stdout, _ = proc.communicate(timeout=30)
+    assert proc.returncode == 0, stdout
+    assert all((out / n / "model.sdf").exists() for n in "ab")
+    assert sorted(os.listdir(inbox)) == ["processed"]
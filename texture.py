@@ -0,0 +1,141 @@
+"""
+Texture optimisation stage, run on the source image before wrapping.
+
+Limits the resolution, optionally sizes the texture to powers of two
+(by scaling, or by padding with the UV range shrunk to match), re-encodes
+as JPEG/PNG and can pre-generate a mipmap chain next to the final
+texture. Needs Pillow only when an option is actually used.
+"""
+import os
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+POT_MODES = ("none", "scale", "pad")
+FORMATS   = {"jpeg": (".jpg", "JPEG"), "png": (".png", "PNG")}
+
+def _require_pillow():
+    if Image is None:
+        raise RuntimeError("Texture optimisation needs Pillow: pip install Pillow")
+
+def _pot_ceil(n):
+    return 1 << max(0, (int(n) - 1).bit_length())
+
+def _pot_floor(n):
+    return 1 << (max(1, int(n)).bit_length() - 1)
+
+def _pot_nearest(n):
+    lo = _pot_floor(n)
+    return lo * 2 if n - lo > lo * 2 - n else lo
+
+def is_active(opts):
+    """True when the options change the texture at all."""
+    return bool(opts) and bool(
+        opts.get("max_px") or opts.get("pot", "none") != "none"
+        or opts.get("format") or opts.get("mipmaps")
+    )
+
+def plan_size(w, h, max_px=None, pot="none"):
+    """
+    Return ((content_w, content_h), (canvas_w, canvas_h)) for a w×h image.
+    Content keeps the aspect ratio except with pot="scale"; with
+    pot="pad" the canvas is the next power of two around the content.
+    """
+    limit = max_px
+    if pot != "none" and max_px:
+        limit = _pot_floor(max_px)
+    s = min(1.0, limit / max(w, h)) if limit else 1.0
+    cw, ch = max(1, round(w * s)), max(1, round(h * s))
+    if pot == "scale":
+        cw, ch = _pot_nearest(cw), _pot_nearest(ch)
+        if limit:
+            cw, ch = min(cw, limit), min(ch, limit)
+        return (cw, ch), (cw, ch)
+    if pot == "pad":
+        return (cw, ch), (_pot_ceil(cw), _pot_ceil(ch))
+    return (cw, ch), (cw, ch)
+
+def process(src, dst_dir, opts):
+    """
+    Optimise `src` into `dst_dir`. Returns {path, source_px, uv_scale};
+    `uv_scale` is the (u, v) range the wrappers must map the image onto.
+    Without active options the source is returned untouched.
+    """
+    if not is_active(opts):
+        return {"path": src, "source_px": None, "uv_scale": None}
+    _require_pillow()
+
+    with Image.open(src) as im:
+        im.load()
+        w, h = im.size
+        (cw, ch), (W, H) = plan_size(w, h, opts.get("max_px"), opts.get("pot", "none"))
+
+        fmt = opts.get("format")
+        if fmt:
+            ext, pil_fmt = FORMATS[fmt]
+        else:
+            ext = os.path.splitext(src)[1]
+            pil_fmt = im.format
+        if pil_fmt == "JPEG" and im.mode not in ("RGB", "L"):
+            im = im.convert("RGB")
+
+        out = im.resize((cw, ch), Image.LANCZOS) if (cw, ch) != (w, h) else im
+        if (W, H) != (cw, ch):
+            # stretched copy underneath keeps filtering at the content edge
+            # from bleeding in a flat border colour
+            canvas = out.resize((W, H), Image.BILINEAR)
+            # UV (0, 0) is the bottom-left corner of the image
+            canvas.paste(out, (0, H - ch))
+            out = canvas
+
+        os.makedirs(dst_dir, exist_ok=True)
+        dst = os.path.join(dst_dir, os.path.splitext(os.path.basename(src))[0] + ext)
+        save = {"quality": opts.get("quality", 90)} if pil_fmt == "JPEG" else {"optimize": True}
+        out.save(dst, pil_fmt, **save)
+
+    return {"path": dst, "source_px": [w, h], "uv_scale": [cw / W, ch / H]}
+
+def write_mipmaps(path):
+    """Write <name>_mip1.<ext> … down to 1×1 next to `path`; returns the paths."""
+    _require_pillow()
+    stem, ext = os.path.splitext(path)
+    written = []
+    with Image.open(path) as im:
+        fmt = im.format
+        level = im
+        n = 0
+        while level.size != (1, 1):
+            n += 1
+            level = level.resize(
+                (max(1, level.size[0] // 2), max(1, level.size[1] // 2)), Image.BOX
+            )
+            dst = f"{stem}_mip{n}{ext}"
+            if os.path.lexists(dst):
+                os.remove(dst)          # may be hard-linked to a cache entry
+            level.save(dst, fmt)
+            written.append(dst)
+    return written
+
+def add_texture_args(p):
+    """Add the texture stage flags to an argparse parser."""
+    p.add_argument("--max-texture", type=int, metavar="PX",
+        help="Limit the longest texture side to PX pixels")
+    p.add_argument("--pot", choices=POT_MODES, default="none",
+        help="Power-of-two textures: scale to fit, or pad (UVs shrink to match)")
+    p.add_argument("--texture-format", choices=sorted(FORMATS),
+        help="Re-encode textures as JPEG or PNG")
+    p.add_argument("--texture-quality", type=int, default=90,
+        help="JPEG quality for re-encoded textures")
+    p.add_argument("--mipmaps", action="store_true",
+        help="Pre-generate a mipmap chain next to each texture")
+
+def texture_opts_from_args(args):
+    return {
+        "max_px":  args.max_texture,
+        "pot":     args.pot,
+        "format":  args.texture_format,
+        "quality": args.texture_quality,
+        "mipmaps": args.mipmaps,
+    }
@@ -0,0 +1,92 @@
+"""
+Domain randomization: N seeded variants of every image.
+
+Each variant jitters the dimensions, may switch primitive, colours the
+faces without the image (base colour and roughness), and scales and
+offsets the texture. Its parameters depend only on (seed, image name,
+variant index), so a rerun gives the same models whatever the batch order
+or worker count. main.py records them in <output>/variants.jsonl.
+"""
+import colorsys
+import json
+import random
+
+from primitives import dimensions
+
+MANIFEST = "variants.jsonl"
+
+def variant_name(name, index):
+    return f"{name}_v{index:03d}"
+
+def variant_params(seed, name, index, primitives, dim_jitter=0.1, uv_jitter=0.1):
+    """Parameters of variant `index` of image `name` (spec keys + primitive)."""
+    rng = random.Random(f"{seed}:{name}:{index}")
+    factor = lambda spread: round(rng.uniform(1 - spread, 1 + spread), 4)
+    r, g, b = colorsys.hsv_to_rgb(rng.random(), rng.uniform(0.0, 0.6),
+                                  rng.uniform(0.4, 1.0))
+    tile = factor(uv_jitter)
+    return {
+        "primitive":  rng.choice(list(primitives)),
+        "jitter":     [factor(dim_jitter) for _ in range(3)],
+        "body_color": [round(r, 4), round(g, 4), round(b, 4), 1.0],
+        "roughness":  round(rng.uniform(0.2, 0.9), 4),
+        "uv_tile":    [tile, tile],
+        "uv_offset":  [round(rng.uniform(-uv_jitter / 2, uv_jitter / 2), 4)
+                       for _ in range(2)],
+    }
+
+def expand(image_path, name, primitive, spec, opts, cli_spec=None, manifest=None):
+    """
+    One (model name, primitive, spec, variant record) per model to build
+    from an image: the image itself without variants, else `opts["count"]`
+    variants, with the spec re-resolved when a variant switches primitive.
+    """
+    if not is_active(opts):
+        return [(name, primitive, spec, None)]
+    out = []
+    for k in range(opts["count"]):
+        params = variant_params(opts["seed"], name, k,
+                                opts.get("primitives") or [primitive],
+                                opts["dim_jitter"], opts["uv_jitter"])
+        prim = params["primitive"]
+        base = spec
+        if prim != primitive:
+            _, base = dimensions.resolve(image_path, prim, cli_spec, manifest)
+        vspec = dict(base, **{key: params[key] for key in dimensions.VARIANT_KEYS})
+        out.append((variant_name(name, k), prim, vspec,
+                    dict(params, index=k, seed=opts["seed"])))
+    return out
+
+def is_active(opts):
+    return bool(opts) and opts.get("count", 0) > 0
+
+def write_manifest(records, path, mode="w"):
+    """Write {image, model, ok, variant} for every variant record."""
+    with open(path, mode) as f:
+        for rec in records:
+            if rec.get("variant") is not None:
+                f.write(json.dumps({k: rec.get(k) for k in
+                                    ("image", "model", "ok", "variant")}) + "\n")
+
+# --- CLI -------------------------------------------------------------------
+
+def add_variant_args(p):
+    p.add_argument("--variants", type=int, default=0, metavar="N",
+        help="Build N randomized variants of every image (<name>_v000, ...)")
+    p.add_argument("--seed", type=int, default=0,
+        help="Random seed for --variants and the --render-views azimuths (same seed, same output)")
+    p.add_argument("--variant-primitives", nargs="+", choices=["box", "cylinder"],
+        help="Primitives variants pick from (default: the image's primitive)")
+    p.add_argument("--dim-jitter", type=float, default=0.1,
+        help="Variant size factors are drawn from 1 ± this (default 0.1)")
+    p.add_argument("--uv-jitter", type=float, default=0.1,
+        help="Variant texture scale 1 ± this, offset ± half of it (default 0.1)")
+
+def variant_opts_from_args(args):
+    return {
+        "count":      args.variants,
+        "seed":       args.seed,
+        "primitives": args.variant_primitives,
+        "dim_jitter": args.dim_jitter,
+        "uv_jitter":  args.uv_jitter,
+    }
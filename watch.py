@@ -0,0 +1,268 @@
+"""
+Watch mode: turn images into models as they land in a directory.
+
+New files are noticed through inotify (Linux, via ctypes) or by polling
+the directory, and are only queued once their size and mtime have stopped
+changing for `settle` seconds. Queued images go through the pipeline in
+small batches on at most `jobs` worker processes; when all workers are
+busy and the queue is full, new files simply wait in the directory. Each
+finished input is moved to processed/ or failed/, or tagged with a
+<image>.done / <image>.failed JSON sidecar and left in place.
+"""
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import signal
+import struct
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+IMAGE_EXTS  = (".png", ".jpg", ".jpeg")
+DONE_DIR    = "processed"
+FAILED_DIR  = "failed"
+FINISH_MODES = ("move", "tag")
+
+# <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO    = 0x00000080
+_IN_Q_OVERFLOW  = 0x00004000
+_EVENT          = struct.Struct("iIII")
+
+def is_image(name):
+    # skip hidden/partial files written by copy tools (".x.png.part", "~x.png")
+    return (name.lower().endswith(IMAGE_EXTS)
+            and not name.startswith((".", "~")))
+
+class _Inotify:
+    """Close-write / moved-in events for one directory."""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory),
+                                    _IN_CLOSE_WRITE | _IN_MOVED_TO)
+        if wd < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed on {directory}")
+
+    def read(self, timeout):
+        """
+        Names touched within `timeout` seconds; None means the kernel queue
+        overflowed and the caller should rescan.
+        """
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        names, overflow = [], False
+        while True:
+            try:
+                buf = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(buf):
+                _, mask, _, size = _EVENT.unpack_from(buf, pos)
+                pos += _EVENT.size
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                name = buf[pos:pos + size].rstrip(b"\0")
+                pos += size
+                if name:
+                    names.append(os.fsdecode(name))
+        return None if overflow else names
+
+    def close(self):
+        os.close(self.fd)
+
+class DirectoryWatcher:
+    """
+    Yields image paths in `directory` once they are fully written.
+    Uses inotify when available (and `inotify` is set), polling otherwise.
+    """
+
+    def __init__(self, directory, settle=1.0, poll=1.0, inotify=True, skip=None):
+        self.directory = os.path.abspath(directory)
+        self.settle    = settle
+        self.poll      = poll
+        self.skip      = skip or (lambda path: False)
+        self.pending   = {}         # name -> (size, mtime, unchanged since)
+        self.seen      = set()      # names already handed out
+        self.backend   = "poll"
+        self._inotify  = None
+        if inotify:
+            try:
+                self._inotify = _Inotify(self.directory)
+                self.backend  = "inotify"
+            except (OSError, AttributeError, TypeError):
+                pass
+        self._rescan = True         # pick up files that were there before us
+
+    def _scan(self):
+        return [e.name for e in os.scandir(self.directory) if e.is_file()]
+
+    def _touch(self, names):
+        for name in names:
+            if name not in self.seen and is_image(name):
+                self.pending.setdefault(name, None)
+
+    def wait(self, timeout=None):
+        """Block up to `timeout` seconds; return newly settled image paths."""
+        timeout = self.poll if timeout is None else timeout
+        if self._inotify is not None:
+            names = self._inotify.read(min(timeout, self.settle) if self.pending else timeout)
+            if names is None:
+                self._rescan = True
+            else:
+                self._touch(names)
+        else:
+            time.sleep(timeout)
+            self._rescan = True
+        if self._rescan:
+            self._rescan = False
+            self._touch(self._scan())
+
+        ready, now = [], time.monotonic()
+        for name in list(self.pending):
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                del self.pending[name]          # moved away or deleted again
+                continue
+            state = self.pending[name]
+            if state is None or state[:2] != (st.st_size, st.st_mtime_ns):
+                self.pending[name] = (st.st_size, st.st_mtime_ns, now)
+            elif st.st_size > 0 and now - state[2] >= self.settle:
+                del self.pending[name]
+                self.seen.add(name)
+                if not self.skip(path):
+                    ready.append(path)
+        return sorted(ready)
+
+    def forget(self, path):
+        """Allow `path` to be picked up again (e.g. after it was moved away)."""
+        self.seen.discard(os.path.basename(path))
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+
+def is_tagged(path):
+    return os.path.exists(path + ".done") or os.path.exists(path + ".failed")
+
+def finish_input(path, record, mode="move"):
+    """Move the processed image to processed/ or failed/, or tag it."""
+    ok = record.get("ok")
+    if mode == "tag":
+        with open(path + (".done" if ok else ".failed"), "w") as f:
+            json.dump(record, f)
+            f.write("\n")
+        return path
+    dest_dir = os.path.join(os.path.dirname(path), DONE_DIR if ok else FAILED_DIR)
+    os.makedirs(dest_dir, exist_ok=True)
+    dest = os.path.join(dest_dir, os.path.basename(path))
+    os.replace(path, dest)
+    return dest
+
+def image_record(path, records):
+    """
+    The outcome for one input image: its record, or, when it produced
+    several models (variants), ok only if all of them are.
+    """
+    image = os.path.abspath(path)
+    mine = [r for r in records if r.get("image") == image]
+    if len(mine) == 1:
+        return mine[0]
+    failed = [r for r in mine if not r["ok"]]
+    rec = {"image": image, "ok": bool(mine) and not failed,
+           "models": [r.get("model") for r in mine]}
+    if failed:
+        rec["error"] = failed[0].get("error")
+    elif not mine:
+        rec["error"] = "no result"
+    return rec
+
+def _ignore_sigint():
+    # workers (and the Blender processes they start) finish their batch on
+    # Ctrl-C; the watch loop decides when to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def run_watch(directory, process, jobs=1, batch=8, max_queue=64, settle=1.0,
+              poll=1.0, finish="move", inotify=True, after_batch=None):
+    """
+    Watch `directory` until interrupted, calling `process(paths)` (which
+    returns {image, ok, error?} records, one or more per path) in a pool of `jobs`
+    worker processes, at most `batch` images per call. At most `max_queue`
+    settled images wait for a free worker; further files stay in the
+    directory until there is room. Ctrl-C/SIGTERM stop watching and wait
+    for the batches in progress.
+    """
+    watcher = DirectoryWatcher(
+        directory, settle, poll, inotify,
+        skip=is_tagged if finish == "tag" else None,
+    )
+    stop = []
+    def _stop(signum, frame):
+        if not stop:
+            print("\nStopping: finishing images already in progress…")
+        stop.append(signum)
+    handlers = {sig: signal.signal(sig, _stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+
+    print(f"👀 Watching {watcher.directory} ({watcher.backend}, {jobs} worker(s)); Ctrl-C to stop")
+    queue, in_flight = deque(), {}
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_ignore_sigint) as pool:
+            while not stop or in_flight:
+                # backpressure: settled files stay unclaimed while the queue is full
+                if stop:
+                    time.sleep(0.2)
+                elif len(queue) < max_queue:
+                    queue.extend(watcher.wait(poll))
+                else:
+                    time.sleep(poll)
+
+                while queue and not stop and len(in_flight) < jobs:
+                    chunk = [queue.popleft() for _ in range(min(batch, len(queue)))]
+                    # landing times now: the inputs may be gone when the batch ends
+                    landed = {}
+                    for path in chunk:
+                        try:
+                            landed[path] = os.stat(path).st_mtime
+                        except OSError:
+                            pass
+                    in_flight[pool.submit(process, chunk)] = (chunk, landed)
+
+                for fut in [f for f in in_flight if f.done()]:
+                    chunk, landed = in_flight.pop(fut)
+                    try:
+                        records = fut.result()
+                    except Exception as e:
+                        # left in place (and not retried until restart)
+                        print(f"❌ worker failed on {len(chunk)} image(s): {type(e).__name__}: {e}")
+                        continue
+                    for path in chunk:
+                        rec = image_record(path, records)
+                        name = os.path.basename(path)
+                        try:
+                            finish_input(path, rec, finish)
+                        except OSError as e:
+                            # removed or moved away while it was processed
+                            print(f"⚠️  {name}: could not finish the input: {e}")
+                        if finish == "move":
+                            watcher.forget(path)
+                        if rec["ok"]:
+                            latency = (f" ({time.time() - landed[path]:.1f}s after landing)"
+                                       if path in landed else "")
+                            print(f"✅ {name}{latency}")
+                        else:
+                            print(f"❌ {name}: {rec.get('error')}")
+                    if after_batch:
+                        after_batch(records)
+    finally:
+        watcher.close()
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
@@ -8,7 +8,9 @@ if root not in sys.path:
     sys.path.insert(0, root)
 
 import argparse
+import json
 from primitives import get_wrapper
+from primitives.dimensions import add_dim_args, dims_from_args
 
 def parse_args():
     argv = sys.argv
@@ -27,21 +29,81 @@ def parse_args():
         "-p","--primitive",
         choices=['box','cylinder'],
         default='box',
-        help="Which primitive to wrap"
+        help="Which primitive to wrap (default for manifest jobs)"
     )
-    p.add_argument(
-        "-i","--image", required=True,
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument(
+        "-i","--image",
         help="Path to image file"
     )
+    src.add_argument(
+        "-m","--manifest",
+        help="JSONL of {image, primitive, outdir, dims} jobs to run in one session"
+    )
     p.add_argument(
-        "-o","--outdir", required=True,
-        help="Output directory"
+        "-o","--outdir",
+        help="Output directory (single image mode)"
     )
-    return p.parse_args(cli_args)
+    p.add_argument(
+        "-r","--results",
+        help="Write one JSON result per manifest job to this file"
+    )
+    p.add_argument(
+        "--cprofile",
+        help="Dump cProfile stats of the whole Blender-side run to this file"
+    )
+    add_dim_args(p, texture_hints=True)
+    args = p.parse_args(cli_args)
+    if args.image and not args.outdir:
+        p.error("--outdir is required with --image")
+    return args
+
+def load_manifest(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def run_batch(manifest, results_path=None, primitive="box"):
+    """Run every manifest job inside one Blender session."""
+    from primitives.session import BlenderSession
+
+    jobs = load_manifest(manifest)
+    for job in jobs:
+        job.setdefault("primitive", primitive)
+    session = BlenderSession()
+    out = open(results_path, "w") if results_path else None
+    failed = 0
+    try:
+        for n, result in enumerate(session.run_batch(jobs), 1):
+            if n == 1:
+                # one-off cost of the session, reported with the first job
+                result["seconds"]["session_init"] = round(session.init_seconds, 6)
+            status = "ok" if result["ok"] else f"FAILED ({result['error']})"
+            print(f"[{n}/{len(jobs)}] {result['image']}: {status}")
+            failed += not result["ok"]
+            if out:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    finally:
+        if out:
+            out.close()
+    print(f"\nBatch finished: {len(jobs) - failed} ok, {failed} failed")
 
 def main():
     args = parse_args()
-    get_wrapper(args.primitive).run(args.image, args.outdir)
+    prof = None
+    if args.cprofile:
+        import cProfile
+        prof = cProfile.Profile()
+        prof.enable()
+    try:
+        if args.manifest:
+            run_batch(args.manifest, args.results, args.primitive)
+        else:
+            get_wrapper(args.primitive).run(args.image, args.outdir, dims_from_args(args))
+    finally:
+        if prof:
+            prof.disable()
+            prof.dump_stats(args.cprofile)
 
 if __name__=="__main__":
     main()